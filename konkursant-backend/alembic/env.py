@@ -13,6 +13,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from src.modules.auth.models import User
 from src.modules.projects.models import Project
 from src.modules.review.models import Review
+from src.modules.statistics.models import ProjectStatusCount
 
 # Файлы основного приложения
 from src.database import Base, metadata
@@ -54,8 +55,7 @@ async def run_migrations_online() -> None:
     Выполняет миграции в онлайн-режиме с использованием асинхронного подключения.
     """
     # Создание асинхронного движка подключения к базе данных
-    connectable = create_async_engine(async_database_url, poolclass=pool.NullPool,
-                                      connect_args={"check_same_thread": False})
+    connectable = create_async_engine(async_database_url, poolclass=pool.NullPool)
 
     # Установка соединения и выполнение миграций
     async with connectable.connect() as connection:
@@ -0,0 +1,67 @@
+import io
+import os
+import tempfile
+import zipfile
+from typing import Set
+
+from src.modules.downloader.archive import ArchiveSnapshot, ResourceArchive
+
+FILE_SIZE = 200 * 1024
+
+
+def _data_paths(snapshot: ArchiveSnapshot) -> Set[str]:
+    return {segment[0] for segment in snapshot.segments if not isinstance(segment, bytes)}
+
+
+def check_refresh_during_download():
+    """
+    Обновление кэша во время отдачи снимка не ломает отдачу: замененный или удаленный
+    файл кэша остается на диске, пока жив снимок, и удаляется после его освобождения.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        resource_folder = os.path.join(directory, "resources")
+        os.makedirs(resource_folder)
+        for name in ("a.txt", "b.txt"):
+            with open(os.path.join(resource_folder, name), "wb") as file:
+                file.write(os.urandom(FILE_SIZE))
+
+        archive = ResourceArchive(resource_folder, os.path.join(directory, "cache"))
+        snapshot = archive.refresh()
+        old_paths = _data_paths(snapshot)
+        stream = snapshot.iter_range()
+        received = [next(stream)]  # Отдача началась, следующие файлы кэша еще не открыты
+
+        with open(os.path.join(resource_folder, "b.txt"), "ab") as file:
+            file.write(b"x")
+        fresh = archive.refresh()
+        received.extend(stream)
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(received))) as package:
+            assert package.testzip() is None
+            assert package.getinfo("b.txt").file_size == FILE_SIZE
+        with zipfile.ZipFile(io.BytesIO(b"".join(fresh.iter_range()))) as package:
+            assert package.testzip() is None
+            assert package.getinfo("b.txt").file_size == FILE_SIZE + 1
+
+        # Старая версия b.txt удаляется только после освобождения старого снимка
+        fresh_paths = _data_paths(fresh)
+        replaced = old_paths - fresh_paths
+        assert len(replaced) == 1 and all(os.path.exists(path) for path in replaced)
+        del stream, snapshot
+        assert not any(os.path.exists(path) for path in replaced)
+        assert all(os.path.exists(path) for path in fresh_paths)
+
+        # Файл, удаленный из папки, тоже ждет освобождения последнего снимка, который его читает
+        os.remove(os.path.join(resource_folder, "a.txt"))
+        archive.refresh()
+        removed = fresh_paths & old_paths
+        assert all(os.path.exists(path) for path in removed)
+        del fresh
+        assert not any(os.path.exists(path) for path in removed)
+        assert all(os.path.exists(path) for path in fresh_paths - removed)
+
+
+if __name__ == "__main__":
+    # python -m scripts.archive_check
+    check_refresh_during_download()
+    print("Кэш архива ресурсов: обновление во время отдачи снимка — OK")
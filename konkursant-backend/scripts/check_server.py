@@ -0,0 +1,135 @@
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Iterable, Optional, Set
+
+import httpx
+
+from src.modules.auth.utils import create_access_token
+
+# Каталог бэкенда: из него запускаются uvicorn и alembic
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UPLOAD_FILES_DIR = os.path.join(BACKEND_DIR, "src", "_resources", "upload_files")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _upload_files() -> Set[str]:
+    return {os.path.join(root, file) for root, _, files in os.walk(UPLOAD_FILES_DIR) for file in files}
+
+
+class CheckServer:
+    """
+    Приложение в отдельном процессе uvicorn на временной базе SQLite — для нагрузочных замеров
+    и проверок конкурентного поведения (python -m scripts.<проверка>).
+
+    База создается миграциями с нуля и удаляется при выходе; файлы, загруженные в upload_files
+    за время работы, тоже удаляются. Пользователи добавляются напрямую в базу, а токен
+    подписывается тем же ключом, что и у приложения, — без bcrypt на вход.
+    """
+
+    def __init__(self, env: Optional[Dict[str, str]] = None, startup_timeout: float = 60):
+        self.env = env or {}
+        self.startup_timeout = startup_timeout
+        self.base_url = ""
+        self.directory = ""  # Временный каталог: база и файлы, которые нужны проверке
+        self.database_path = ""
+        self._directory: Optional[tempfile.TemporaryDirectory] = None
+        self._process: Optional[subprocess.Popen] = None
+        self._uploads_before: Set[str] = set()
+
+    def __enter__(self) -> "CheckServer":
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        self.database_path = os.path.join(self.directory, "check.db")
+        env = dict(os.environ, DATABASE_URL=f"sqlite+aiosqlite:///{self.database_path}", **self.env)
+        subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND_DIR, env=env,
+                       check=True, capture_output=True)
+
+        self._uploads_before = _upload_files()
+        port = _free_port()
+        self.base_url = f"http://127.0.0.1:{port}"
+        self._process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.main:app", "--port", str(port), "--log-level", "warning"],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                httpx.get(f"{self.base_url}/docs", timeout=1)
+                break
+            except httpx.TransportError:
+                if self._process.poll() is not None or time.monotonic() > deadline:
+                    self.__exit__(None, None, None)
+                    raise RuntimeError("Приложение не запустилось.")
+                time.sleep(0.2)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+            self._process = None
+        for path in _upload_files() - self._uploads_before:
+            os.remove(path)
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+
+    def execute(self, sql: str, rows: Iterable[tuple] = ((),)) -> Optional[int]:
+        """Выполняет SQL в базе приложения для каждой строки параметров; возвращает последний rowid."""
+        connection = sqlite3.connect(self.database_path, timeout=30)
+        try:
+            cursor = None
+            for row in rows:
+                cursor = connection.execute(sql, row)
+            connection.commit()
+            return cursor.lastrowid if cursor is not None else None
+        finally:
+            connection.close()
+
+    def query(self, sql: str, params: tuple = ()) -> list:
+        connection = sqlite3.connect(self.database_path, timeout=30)
+        try:
+            return connection.execute(sql, params).fetchall()
+        finally:
+            connection.close()
+
+    def add_user(self, email: str, role: str = "user") -> int:
+        return self.execute(
+            "INSERT INTO users (email, full_name, password_hash, is_active, role) VALUES (?, ?, ?, 1, ?)",
+            [(email, email.split("@")[0], "-", role)]
+        )
+
+    def client(self, email: str, **kwargs) -> httpx.AsyncClient:
+        """Клиент, авторизованный как пользователь email."""
+        client = httpx.AsyncClient(base_url=self.base_url, **kwargs)
+        client.cookies.set("access_token", create_access_token({"sub": email}))
+        return client
+
+    def reset_peak_rss(self):
+        """Сбрасывает пик RSS процесса приложения, чтобы замерить его для одного сценария (только Linux)."""
+        try:
+            with open(f"/proc/{self._process.pid}/clear_refs", "w") as clear_refs:
+                clear_refs.write("5")
+        except OSError:
+            pass
+
+    def peak_rss_kib(self) -> Optional[int]:
+        """Пик RSS процесса приложения, КиБ (только Linux)."""
+        try:
+            with open(f"/proc/{self._process.pid}/status") as status:
+                for line in status:
+                    if line.startswith("VmHWM:"):
+                        return int(line.split()[1])
+        except OSError:
+            pass
+        return None
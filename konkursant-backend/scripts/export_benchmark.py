@@ -0,0 +1,119 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Any, Dict, List
+
+import orjson
+
+from scripts.check_server import CheckServer
+from scripts.parser_benchmark import ApplicationSize, generate_docx
+from src.modules.projects.projects import extract_docx_data
+
+REGIONS = ["Санкт-Петербург город", "Москва город", "Ленинградская область", "Новосибирская область"]
+STATUSES = ["Ожидает проверки", "Проверено"]
+ADMIN_EMAIL = "export-admin@example.com"
+
+# Сценарии выгрузки: параметры запроса /api/downloader/export
+SCENARIOS = {
+    "csv": {"format": "csv"},
+    "json": {"format": "json"},
+    "json_region": {"format": "json", "region": REGIONS[1]},
+    "docx": {"format": "docx"},
+    "docx_json_csv": {"format": ["docx", "json", "csv"]},
+}
+
+
+def generate_corpus(server: CheckServer, projects: int, size: ApplicationSize, seed: int = 0) -> int:
+    """
+    Заполняет базу приложения projects проектами с данными заявок и DOCX на диске; возвращает размер DOCX.
+
+    Все проекты ссылаются на одну синтетическую заявку (жесткие ссылки, если файловая система
+    их поддерживает): для выгрузки важен объем, а не различие файлов.
+    """
+    content = generate_docx(size)
+    json_data = extract_docx_data(content)
+    owner_id = server.add_user(ADMIN_EMAIL, "admin")
+
+    corpus_folder = os.path.join(server.directory, "corpus")
+    os.makedirs(corpus_folder)
+    source = os.path.join(corpus_folder, "application.docx")
+    with open(source, "wb") as file:
+        file.write(content)
+
+    generator = random.Random(seed)
+    projects_rows, data_rows = [], []
+    for number in range(1, projects + 1):
+        docx_path = os.path.join(corpus_folder, f"{number}.docx")
+        try:
+            os.link(source, docx_path)
+        except OSError:
+            with open(docx_path, "wb") as file:
+                file.write(content)
+        region = generator.choice(REGIONS)
+        projects_rows.append((number, f"Проект {number}", owner_id, generator.choice(STATUSES), docx_path,
+                              os.path.join(corpus_folder, f"{number}.json"), region))
+        data_rows.append((number, orjson.dumps(dict(json_data, **{"Регион проекта": region})).decode()))
+
+    server.execute("INSERT INTO projects (id_project, title, owner_id, status, docs_file_path, json_file_path, "
+                   "region) VALUES (?, ?, ?, ?, ?, ?, ?)", projects_rows)
+    server.execute("INSERT INTO project_data (project_id, json_data) VALUES (?, ?)", data_rows)
+    return len(content)
+
+
+async def measure_export(server: CheckServer, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Скачивает выгрузку потоком, не сохраняя ее, и замеряет время, объем и пик RSS приложения."""
+    server.reset_peak_rss()
+    received, tail = 0, b""
+    async with server.client(ADMIN_EMAIL, timeout=None) as client:
+        started = time.perf_counter()
+        async with client.stream("GET", "/api/downloader/export", params=params) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_raw():
+                received += len(chunk)
+                tail = chunk[-22:]
+        seconds = time.perf_counter() - started
+    # Архив дописан до конца: последняя запись — конец центрального каталога
+    assert tail.startswith(b"PK\x05\x06"), "Выгрузка оборвалась"
+
+    peak_rss = server.peak_rss_kib()
+    return {
+        "seconds": round(seconds, 2),
+        "archive_mib": round(received / 2 ** 20, 1),
+        "mib_per_second": round(received / 2 ** 20 / seconds, 1),
+        "peak_rss_mib": round(peak_rss / 1024, 1) if peak_rss is not None else None,
+    }
+
+
+def run_benchmark(projects: int, size: ApplicationSize, scenarios: List[str], seed: int = 0) -> Dict[str, Any]:
+    with CheckServer() as server:
+        docx_bytes = generate_corpus(server, projects, size, seed)
+        results = {}
+        for name in scenarios:
+            results[name] = asyncio.run(measure_export(server, SCENARIOS[name]))
+            results[name]["projects_per_second"] = round(projects / results[name]["seconds"])
+            print(f"{name:>14}: {results[name]['seconds']:7.2f} с, {results[name]['archive_mib']:8.1f} МиБ, "
+                  f"{results[name]['mib_per_second']:7.1f} МиБ/с, {results[name]['projects_per_second']:6} проектов/с, "
+                  f"пик RSS {results[name]['peak_rss_mib']} МиБ")
+    return {"projects": projects, "docx_bytes": docx_bytes, "size": size._asdict(), "results": results}
+
+
+if __name__ == "__main__":
+    # python -m scripts.export_benchmark --projects 10000
+    # python -m scripts.export_benchmark --projects 200 --images 64 --scenario docx
+    parser = argparse.ArgumentParser(description="Замеры скорости и памяти выгрузки проектов на синтетической базе")
+    parser.add_argument("--projects", type=int, default=10000)
+    parser.add_argument("--images", type=int, default=2, help="Изображений в заявке (размер DOCX)")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="Сценарий выгрузки (параметр можно повторять; по умолчанию все)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Файл для JSON-отчета")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.projects, ApplicationSize(images=args.images), args.scenario or list(SCENARIOS),
+                           args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=4)
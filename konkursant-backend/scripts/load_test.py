@@ -0,0 +1,105 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from typing import Dict, List
+
+from scripts.check_server import CheckServer
+from scripts.parser_benchmark import ApplicationSize, generate_docx
+
+USER_EMAIL = "load-test@example.com"
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(int(len(ordered) * fraction) - 1, 0)]
+
+
+def summary(samples: List[float]) -> Dict[str, float]:
+    return {
+        "requests": len(samples),
+        "p50_ms": round(percentile(samples, 0.5) * 1000, 1),
+        "p99_ms": round(percentile(samples, 0.99) * 1000, 1),
+        "max_ms": round(max(samples) * 1000, 1),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 1),
+    }
+
+
+async def run_load_test(server: CheckServer, uploads: int, size: ApplicationSize, idle_requests: int,
+                        interval: float, timeout: float) -> Dict[str, Dict[str, float]]:
+    """
+    Задержка /api/projects/all_access_projects/ без нагрузки и во время разбора uploads заявок.
+
+    Заявки различаются числом расходов, чтобы каждая разбиралась в пуле процессов, а не бралась
+    из кэша разбора. Замер под нагрузкой идет, пока все заявки не разобраны.
+    """
+    documents = [generate_docx(size._replace(expenses=size.expenses + number)) for number in range(uploads)]
+
+    async with server.client(USER_EMAIL, timeout=timeout) as client:
+        async def probe() -> float:
+            started = time.perf_counter()
+            response = await client.get("/api/projects/all_access_projects/")
+            response.raise_for_status()
+            return time.perf_counter() - started
+
+        idle = []
+        for _ in range(idle_requests):
+            idle.append(await probe())
+            await asyncio.sleep(interval)
+
+        async def upload(number: int) -> int:
+            response = await client.post("/api/projects/create/", data={"title": f"Нагрузка {number}"},
+                                         files={"docs_file": (f"load_{number}.docx", documents[number])})
+            response.raise_for_status()
+            return response.json()["id_project"]
+
+        uploading = asyncio.gather(*(upload(number) for number in range(uploads)))
+        busy, project_ids, started = [], None, time.perf_counter()
+        while True:
+            busy.append(await probe())
+            if project_ids is None and uploading.done():
+                project_ids = uploading.result()
+            if project_ids is not None and len(busy) % 10 == 0:
+                statuses = [(await client.get(f"/api/projects/{project_id}/ingest-status")).json()["status"]
+                            for project_id in project_ids]
+                if all(status in ("done", "failed") for status in statuses):
+                    assert all(status == "done" for status in statuses), f"Не все заявки разобраны: {statuses}"
+                    break
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError("Заявки не разобраны за отведенное время.")
+            await asyncio.sleep(interval)
+
+    return {"idle": summary(idle), "parsing": summary(busy)}
+
+
+if __name__ == "__main__":
+    # python -m scripts.load_test --uploads 20 --workers 2
+    # python -m scripts.load_test --uploads 20 --max-p99-ms 200
+    parser = argparse.ArgumentParser(description="Задержка списка проектов во время параллельного разбора заявок")
+    parser.add_argument("--uploads", type=int, default=20, help="Одновременных загрузок заявок")
+    parser.add_argument("--workers", type=int, default=2, help="Процессов разбора (INGEST_MAX_WORKERS)")
+    parser.add_argument("--projects", type=int, default=200, help="Проектов пользователя в базе до начала замера")
+    parser.add_argument("--tasks", type=int, default=50)
+    parser.add_argument("--expenses", type=int, default=500)
+    parser.add_argument("--idle-requests", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=0.01, help="Пауза между запросами списка, с")
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--max-p99-ms", type=float, help="Завершиться с кодом 1, если p99 под нагрузкой больше")
+    args = parser.parse_args()
+
+    with CheckServer(env={"INGEST_MAX_WORKERS": str(args.workers)}) as check_server:
+        owner_id = check_server.add_user(USER_EMAIL)
+        check_server.execute("INSERT INTO projects (title, owner_id, status) VALUES (?, ?, 'Ожидает проверки')",
+                             [(f"Проект {number}", owner_id) for number in range(args.projects)])
+        result = asyncio.run(run_load_test(
+            check_server, args.uploads, ApplicationSize(tasks=args.tasks, expenses=args.expenses),
+            args.idle_requests, args.interval, args.timeout
+        ))
+
+    for name, stats in result.items():
+        print(f"{name:>8}: {stats['requests']} запросов, p50 {stats['p50_ms']} мс, p99 {stats['p99_ms']} мс, "
+              f"макс. {stats['max_ms']} мс")
+    if args.max_p99_ms is not None and result["parsing"]["p99_ms"] > args.max_p99_ms:
+        print(f"p99 под нагрузкой больше {args.max_p99_ms} мс")
+        sys.exit(1)
@@ -0,0 +1,496 @@
+import argparse
+import ctypes
+import ctypes.util
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
+
+from docx import Document
+
+from src.modules.projects.docx_reader import Table
+from src.modules.projects.parser import DocumentIndex
+from src.modules.projects.projects import (
+    PARSER_VERSION, DataExtractor, DocxConverter, convert_docx_to_json, extract_docx_data
+)
+
+# Формат отчета; меняется при несовместимом изменении структуры JSON
+REPORT_VERSION = 1
+
+# Записей расходов в одной категории синтетической заявки
+RECORDS_PER_CATEGORY = 10
+EXPENSE_CATEGORIES = ("Канцелярия и расходные материалы", "Полиграфическая продукция", "Аренда оборудования",
+                      "Транспортные расходы", "Проживание и питание")
+SUPPORT_TYPES = ("Информационная", "Организационная", "Финансовая", "Другая")
+
+# Сторона изображения-шума: около 1 МБ несжимаемых данных на изображение
+IMAGE_SIDE = 600
+
+# Наполнитель многострочных полей: длина абзацев близка к реальным заявкам
+FILLER = ("Проект направлен на вовлечение студентов в общественную жизнь региона через серию "
+          "интерактивных мероприятий, публикаций и встреч с экспертами. ")
+
+
+class ApplicationSize(NamedTuple):
+    """Размер синтетической заявки."""
+    tasks: int = 10  # Задач календарного плана
+    events_per_task: int = 3  # Мероприятий в каждой задаче
+    expenses: int = 50  # Записей расходов
+    team: int = 10  # Наставников
+    partners: int = 10  # Партнеров софинансирования
+    images: int = 0  # Встроенных изображений (сканы, логотипы)
+    tabular: bool = False  # Расходы и команда — таблицами, а не абзацами
+
+
+def generate_blocks(size: ApplicationSize) -> List[Union[str, List[List[str]]]]:
+    """
+    Абзацы (str) и таблицы (строки ячеек) синтетической заявки в том же порядке и формате,
+    что и выгрузка реальной заявки.
+
+    Содержимое детерминировано: одинаковый размер дает одинаковый документ, поэтому отчеты
+    разных коммитов сравнимы.
+    """
+    blocks = [
+        "ФИО: Иванов Иван Иванович",
+        f"Название проекта: Синтетическая заявка ({size.tasks} задач, {size.expenses} расходов)",
+        "Регион проекта: Санкт-Петербург город",
+        "Логотип проекта: отсутствует",
+        "Контакты: +7 (900) 000-00-00, applicant@example.com",
+        'Вкладка "Общее"',
+        'Блок "Общая информация"',
+        "Масштаб реализации проекта: ",
+        "Региональный",
+        "Дата начала и окончания проекта: ",
+        "08.2025 - 01.2026",
+        'Блок "Дополнительная информация об авторе проекта"',
+        "Опыт автора проекта: ",
+        FILLER * 4,
+        "Описание функционала автора проекта: ",
+        FILLER * 2,
+        "Адрес регистрации автора проекта: ",
+        "Санкт-Петербург, ул. Примерная, д. 1",
+        "Добавить резюме: ",
+        "",
+        "Видео-визитка (ссылка на ролик на любом видеохостинге): ",
+        "",
+        'Вкладка "О проекте"',
+        'Блок "Информация о проекте"',
+        "Краткая информация о проекте: ",
+        FILLER * 3,
+        "Описание проблемы, решению/снижению которой посвящен проект: ",
+        FILLER * 5,
+        "Основные целевые группы, на которые направлен проект: ",
+        FILLER,
+        "Основная цель проекта: ",
+        FILLER,
+        "Опыт успешной реализации проекта: ",
+        FILLER * 2,
+        "Перспектива развития и потенциал проекта: ",
+        FILLER * 2,
+        'Блок "Задачи"',
+        "Добавить задачу: ",
+        "",
+    ]
+    blocks += [f"Поставленная задача: Задача {task}" for task in range(1, size.tasks + 1)]
+    blocks += [
+        'Блок "География проекта"',
+        "Добавить: ",
+        "",
+        "Выберите регион или федеральный округ: Санкт-Петербург город",
+        "Адрес: г. Санкт-Петербург, ул. Примерная, д. 1",
+        "",
+        'Вкладка "Команда"',
+        'Блок "Команда"',
+        'Блок "Наставники"',
+        "Добавить: ",
+        "",
+    ]
+    if size.tabular:
+        blocks.append([["ФИО наставника", "E-mail наставника", "Роль в проекте", "Добавить резюме", "Компетенции"]] + [
+            [f"Наставник {member}", f"mentor{member}@example.com", f"Координатор направления {member}", "", FILLER]
+            for member in range(1, size.team + 1)
+        ])
+    else:
+        for member in range(1, size.team + 1):
+            blocks += [
+                f"ФИО наставника: Наставник {member}",
+                f"E-mail наставника: mentor{member}@example.com",
+                f"Роль в проекте: Координатор направления {member}",
+                "Добавить резюме: ",
+                "Компетенции, опыт, подтверждающие возможность участника выполнять роль в команде: " + FILLER,
+            ]
+    blocks += [
+        "",
+        'Вкладка "Результаты"',
+        'Блок "Дата плановых значений результатов"',
+        "Дата плановых значений результатов Проекта: ",
+        "31.12.2025",
+        'Блок "Количество мероприятий, проведенных в рамках проекта"',
+        "Плановое количество: ",
+        str(size.tasks * size.events_per_task),
+        "Ед. измерения: ",
+        "Ед.",
+        "Крайняя дата проведения: ",
+        "31.12.2025",
+        'Блок "Количество участников мероприятий"',
+        "Плановое количество: ",
+        "200",
+        "Ед. измерения: ",
+        "Чел.",
+        'Блок "Количество публикаций о мероприятиях проекта"',
+        "Плановое количество: ",
+        "19",
+        "Ед. измерения: ",
+        "Ед.",
+        'Блок "Количество просмотров публикаций о мероприятиях проекта"',
+        "Плановое количество: ",
+        "19000",
+        "Ед. измерения: ",
+        "Ед.",
+        "Социальный эффект: ",
+        FILLER * 2,
+        "",
+        'Вкладка "Календарный план"',
+        'Блок "Задачи"',
+        "Добавить задачу: ",
+        "",
+    ]
+    for task in range(1, size.tasks + 1):
+        blocks.append(f"Поставленная задача: Задача {task}")
+        for event in range(1, size.events_per_task + 1):
+            blocks += [
+                f"Название мероприятия: Мероприятие {task}.{event}",
+                f"Крайняя дата выполнения: {event % 28 + 1:02d}.{task % 12 + 1:02d}.2025",
+                "Описание мероприятия: " + FILLER,
+                f"Количество уникальных участников: {10 * event}",
+                f"Количество повторяющихся участников: {5 * event}",
+                f"Количество публикаций: {event}",
+                f"Количество просмотров: {1000 * event}",
+                "Дополнительная информация: ",
+            ]
+        blocks.append("Добавить мероприятие: ")
+    blocks += [
+        "",
+        'Вкладка "Медиа"',
+        'Блок "Ресурсы"',
+        "Добавить ресурс: ",
+        "",
+        "Вид ресурса: Социальные сети",
+        "Месяц публикации: 10.2025",
+        "Планируемое количество просмотров: 5000",
+        "Ссылки на ресурсы: https://example.com/media",
+        "Почему выбран такой формат медиа: " + FILLER,
+        "Файл с подробным медиа-планом: ",
+        "",
+        'Вкладка "Расходы"',
+        "Общая сумма расходов: ",
+        f"{size.expenses * 1000} руб.",
+        "",
+    ]
+    for record in range(size.expenses):
+        number = record % RECORDS_PER_CATEGORY + 1
+        if number == 1:
+            category = EXPENSE_CATEGORIES[record // RECORDS_PER_CATEGORY % len(EXPENSE_CATEGORIES)]
+            blocks += [f'Категория "{category}"', "", 'Тип "Товар"', ""]
+            if size.tabular:
+                blocks.append([["№", "Название", "Описание", "Количество", "Цена", "Сумма"]])
+        if size.tabular:
+            blocks[-1].append([str(number), f"Позиция {record + 1}", "Расходные материалы для мероприятий",
+                               "10", "100,00 руб.", "1 000,00 руб."])
+        else:
+            blocks += [
+                f"Запись № {number}",
+                f"Название: Позиция {record + 1}",
+                "Описание: Расходные материалы для мероприятий",
+                "Количество: 10",
+                "Цена: 100,00 руб.",
+                "Сумма: 1 000,00 руб.",
+                "",
+            ]
+    blocks += [
+        'Вкладка "Софинансирование"',
+        'Блок "Собственные средства"',
+        "Перечень расходов: ",
+        "Помещение для проведения мероприятий",
+        "Добавить: ",
+        "",
+        "Сумма, руб.: 200000",
+        "Файл: ",
+        'Блок "Партнер"',
+        "Перечень расходов: ",
+        "",
+    ]
+    for partner in range(1, size.partners + 1):
+        blocks += [
+            f"Название партнера: Партнер {partner}",
+            f"Тип поддержки: {SUPPORT_TYPES[partner % len(SUPPORT_TYPES)]}",
+            "Перечень расходов: Информационная и организационная поддержка",
+            f"Сумма, руб.: {10000 * partner}",
+            "Файл: ",
+        ]
+    blocks += [
+        "",
+        'Вкладка "Доп. Файлы"',
+        'Блок "Файл"',
+        "Добавить: ",
+        "Описание файла: Смета проекта",
+        "Выберете файл: 1",
+    ]
+    return blocks
+
+
+def noise_png(side: int, seed: int) -> bytes:
+    """Несжимаемое изображение PNG side x side (RGB) — как фотография или скан в заявке."""
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    rows = random.Random(seed).randbytes(side * (side * 3 + 1))
+    # Первый байт каждой строки — тип фильтра; 0 — без фильтра
+    raw = b"".join(b"\0" + rows[i * (side * 3 + 1) + 1:(i + 1) * (side * 3 + 1)] for i in range(side))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", side, side, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b""))
+
+
+def generate_docx(size: ApplicationSize) -> bytes:
+    """Синтетическая заявка в формате DOCX."""
+    document = Document()
+    for block in generate_blocks(size):
+        if isinstance(block, str):
+            document.add_paragraph(block)
+            continue
+        table = document.add_table(rows=len(block), cols=len(block[0]))
+        for row, values in zip(table.rows, block):
+            for cell, value in zip(row.cells, values):
+                cell.text = value
+    # Изображения — в конце документа: на абзацы заявки они не влияют
+    for image in range(size.images):
+        document.add_picture(io.BytesIO(noise_png(IMAGE_SIDE, image)))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def _reset_peak_rss() -> Optional[int]:
+    """Сбрасывает пик RSS процесса и возвращает текущий RSS, КиБ (только Linux)."""
+    try:
+        # Освобожденная память кучи возвращается системе, иначе повторный запуск этапа
+        # переиспользует ее и не увеличивает RSS
+        ctypes.CDLL(ctypes.util.find_library("c")).malloc_trim(0)
+    except (OSError, AttributeError, TypeError):
+        pass
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return _read_status("VmRSS")
+    except OSError:
+        return None
+
+
+def _read_status(field: str) -> Optional[int]:
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return None
+
+
+def measure(function: Callable, setup: Optional[Callable[[], tuple]] = None,
+            rounds: int = 5, warmup: int = 1) -> Dict[str, Any]:
+    """
+    Время и память одного этапа.
+
+    setup готовит аргументы function перед каждым запуском и в замер не входит. Время —
+    статистика по rounds запусков после warmup прогревочных. Память замеряется отдельным
+    запуском, так как tracemalloc замедляет выполнение: peak_traced_kib — пик памяти,
+    выделенной Python-кодом, peak_rss_kib — прирост пика RSS процесса (учитывает и память
+    lxml/libxml2, которую tracemalloc не видит; только Linux).
+    """
+    def arguments() -> tuple:
+        return setup() if setup is not None else ()
+
+    with redirect_stdout(io.StringIO()):  # Извлекатели печатают ошибки и ход работы в stdout
+        for _ in range(warmup):
+            function(*arguments())
+
+        timings = []
+        for _ in range(rounds):
+            args = arguments()
+            started = time.perf_counter()
+            function(*args)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        args = arguments()
+        rss_before = _reset_peak_rss()
+        tracemalloc.start()
+        try:
+            function(*args)
+            _, peak_traced = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_rss = _read_status("VmHWM") - rss_before if rss_before is not None else None
+
+    return {
+        "rounds": rounds,
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "stddev_ms": round(statistics.stdev(timings), 3) if rounds > 1 else 0.0,
+        "peak_traced_kib": peak_traced // 1024,
+        "peak_rss_kib": peak_rss,
+    }
+
+
+def _stage_setup(lines: List[str], tables: List[Table]) -> Callable[[], tuple]:
+    # Каждый этап получает свежий индекс, чтобы кэш вхождений, заполненный прошлым запуском,
+    # не занижал время
+    def setup():
+        return DataExtractor(lines=lines, tables=tables), DocumentIndex(lines)
+    return setup
+
+
+def run_benchmarks(content: bytes, rounds: int = 5, warmup: int = 1) -> Dict[str, Dict[str, Any]]:
+    """Замеры чтения DOCX, каждого этапа DataExtractor и полного разбора заявки."""
+    lines, tables = DocxConverter.read_document(content)
+    results = {"read_lines": measure(DocxConverter.read_lines, lambda: (content,), rounds, warmup)}
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Раскладка каталогов та же, что у загруженных заявок: projects_docx, projects_txt, projects_json
+        for folder in ("projects_docx", "projects_txt", "projects_json"):
+            os.makedirs(os.path.join(directory, folder))
+        docx_filepath = os.path.join(directory, "projects_docx", "benchmark.docx")
+        with open(docx_filepath, "wb") as docx_file:
+            docx_file.write(content)
+        txt_filepath = os.path.join(directory, "projects_txt", "benchmark.txt")
+
+        results["convert_to_txt"] = measure(
+            lambda: DocxConverter(docx_filepath, txt_filepath).convert_to_txt(), rounds=rounds, warmup=warmup)
+        results["index"] = measure(DocumentIndex, lambda: (lines,), rounds, warmup)
+        for stage, method, _ in DataExtractor.STAGES:
+            results[stage] = measure(
+                lambda extractor, index, method=method: getattr(extractor, method)(index),
+                _stage_setup(lines, tables), rounds, warmup
+            )
+        results["extract_data"] = measure(
+            lambda: DataExtractor(lines=lines, tables=tables).extract_data(), rounds=rounds, warmup=warmup)
+        results["extract_docx_data"] = measure(
+            lambda: extract_docx_data(content, raise_errors=True), rounds=rounds, warmup=warmup)
+        results["convert_docx_to_json"] = measure(
+            lambda: convert_docx_to_json(docx_filepath), rounds=rounds, warmup=warmup)
+
+    return results
+
+
+def _commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(size: ApplicationSize, rounds: int = 5, warmup: int = 1) -> Dict[str, Any]:
+    content = generate_docx(size)
+    blocks = generate_blocks(size)
+    paragraphs = sum(isinstance(block, str) for block in blocks)
+    return {
+        "report_version": REPORT_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "parser_version": PARSER_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "size": size._asdict(),
+        "document": {
+            "paragraphs": paragraphs,
+            "tables": len(blocks) - paragraphs,
+            "docx_bytes": len(content),
+        },
+        "benchmarks": run_benchmarks(content, rounds, warmup),
+    }
+
+
+def compare_reports(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """
+    Этапы, медианное время которых выросло больше чем в threshold раз относительно baseline.
+
+    Отчеты сравнимы, только если получены на заявке одного размера.
+    """
+    # Отчеты, созданные до появления параметра размера, получены с его значением по умолчанию
+    if {**ApplicationSize()._asdict(), **baseline.get("size", {})} != current.get("size"):
+        raise ValueError(f"Отчеты получены на заявках разного размера: {baseline.get('size')} и {current.get('size')}")
+
+    regressions = []
+    for stage, stats in current["benchmarks"].items():
+        base = baseline["benchmarks"].get(stage)
+        if base is None or not base["median_ms"]:
+            continue
+        ratio = stats["median_ms"] / base["median_ms"]
+        print(f"{stage:24} {base['median_ms']:10.2f} -> {stats['median_ms']:10.2f} мс  x{ratio:.2f}")
+        if ratio > threshold:
+            regressions.append(stage)
+    return regressions
+
+
+def print_report(report: Dict[str, Any]):
+    document = report["document"]
+    print(f"Заявка: {document['paragraphs']} абзацев, {document['docx_bytes'] // 1024} КиБ DOCX, "
+          f"размер {report['size']}")
+    print(f"{'этап':24} {'медиана, мс':>12} {'мин, мс':>10} {'±, мс':>8} {'Python, КиБ':>12} {'RSS, КиБ':>10}")
+    for stage, stats in report["benchmarks"].items():
+        rss = stats["peak_rss_kib"] if stats["peak_rss_kib"] is not None else "-"
+        print(f"{stage:24} {stats['median_ms']:12.2f} {stats['min_ms']:10.2f} {stats['stddev_ms']:8.2f} "
+              f"{stats['peak_traced_kib']:12} {rss:>10}")
+
+
+if __name__ == "__main__":
+    # python -m scripts.parser_benchmark --tasks 50 --expenses 500 --output report.json
+    # python -m scripts.parser_benchmark --tasks 50 --expenses 500 --compare baseline.json
+    defaults = ApplicationSize()
+    parser = argparse.ArgumentParser(description="Замеры скорости и памяти разбора заявок на синтетическом DOCX")
+    parser.add_argument("--tasks", type=int, default=defaults.tasks)
+    parser.add_argument("--events-per-task", type=int, default=defaults.events_per_task)
+    parser.add_argument("--expenses", type=int, default=defaults.expenses)
+    parser.add_argument("--team", type=int, default=defaults.team)
+    parser.add_argument("--partners", type=int, default=defaults.partners)
+    parser.add_argument("--images", type=int, default=defaults.images)
+    parser.add_argument("--tabular", action="store_true", help="Расходы и команда — таблицами")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--output", help="Файл для JSON-отчета")
+    parser.add_argument("--compare", help="JSON-отчет прошлого запуска для сравнения")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Допустимый рост медианного времени этапа относительно --compare")
+    parser.add_argument("--save-docx", help="Сохранить сгенерированную заявку в файл")
+    args = parser.parse_args()
+
+    application_size = ApplicationSize(args.tasks, args.events_per_task, args.expenses, args.team, args.partners,
+                                       args.images, args.tabular)
+    if args.save_docx:
+        with open(args.save_docx, "wb") as file:
+            file.write(generate_docx(application_size))
+
+    result = build_report(application_size, rounds=args.rounds, warmup=args.warmup)
+    print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(result, file, ensure_ascii=False, indent=4)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            slower = compare_reports(json.load(file), result, args.threshold)
+        if slower:
+            print(f"Замедление больше x{args.threshold}: {', '.join(slower)}")
+            sys.exit(1)
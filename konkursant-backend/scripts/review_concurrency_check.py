@@ -0,0 +1,59 @@
+import asyncio
+from collections import Counter
+from typing import List
+
+from scripts.check_server import CheckServer
+from src.modules.review.assignment import MAX_REVIEWS_PER_PROJECT
+from src.modules.statistics.rollups import REVIEW_CRITERIA
+
+REVIEWERS = 20
+DUPLICATE_SUBMISSIONS = 10
+
+
+def review_body() -> dict:
+    # reviewer_id и project_id берутся сервером из пользователя и пути запроса
+    return dict(reviewer_id=0, project_id=0, project_title="-", author_name="-", feedback="-", status="-",
+                **{criterion: 3 for criterion in REVIEW_CRITERIA})
+
+
+async def submit_concurrently(server: CheckServer, emails: List[str], project_id: int) -> Counter:
+    """Отправляет отзывы на проект одновременно от каждого e-mail списка; возвращает счетчик кодов ответа."""
+    clients = [server.client(email, timeout=60) for email in emails]
+    try:
+        responses = await asyncio.gather(*(
+            client.post(f"/api/reviews/create_review/{project_id}", json=review_body()) for client in clients
+        ))
+    finally:
+        await asyncio.gather(*(client.aclose() for client in clients))
+    return Counter(response.status_code for response in responses)
+
+
+def check_review_concurrency():
+    """
+    Параллельные отзывы не обходят ограничения: на проект принимается не больше
+    MAX_REVIEWS_PER_PROJECT отзывов, а повторные отправки одного рецензента дают один отзыв.
+    """
+    with CheckServer() as server:
+        owner_id = server.add_user("owner@example.com")
+        reviewers = [f"reviewer{number}@example.com" for number in range(REVIEWERS)]
+        for email in reviewers:
+            server.add_user(email, "reviewer")
+        server.execute("INSERT INTO projects (title, owner_id, status) VALUES (?, ?, 'Ожидает проверки')",
+                       [("Проект для рецензентов", owner_id), ("Проект для повторных отправок", owner_id)])
+
+        codes = asyncio.run(submit_concurrently(server, reviewers, 1))
+        print(f"{REVIEWERS} рецензентов на один проект: {dict(codes)}")
+        assert codes == {200: MAX_REVIEWS_PER_PROJECT, 400: REVIEWERS - MAX_REVIEWS_PER_PROJECT}, codes
+
+        codes = asyncio.run(submit_concurrently(server, reviewers[:1] * DUPLICATE_SUBMISSIONS, 2))
+        print(f"{DUPLICATE_SUBMISSIONS} одновременных отправок одного рецензента: {dict(codes)}")
+        assert codes == {200: 1, 400: DUPLICATE_SUBMISSIONS - 1}, codes
+
+        reviews = dict(server.query("SELECT project_id, COUNT(*) FROM reviews GROUP BY project_id"))
+        assert reviews == {1: MAX_REVIEWS_PER_PROJECT, 2: 1}, reviews
+
+
+if __name__ == "__main__":
+    # python -m scripts.review_concurrency_check
+    check_review_concurrency()
+    print("Параллельные отзывы: лимит на проект и защита от повторов — OK")
@@ -1,3 +1,7 @@
+import os
+import tempfile
+from typing import Optional
+
 from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     database_url: str
@@ -5,6 +9,67 @@ class Settings(BaseSettings):
     jwt_algorithm: str
     access_token_expire_minutes: int
 
+    # Движок базы данных: SQLite (sqlite+aiosqlite://...) или PostgreSQL (postgresql+asyncpg://...).
+    # Вывод SQL-запросов в лог (только для отладки) и размер кэша скомпилированных запросов SQLAlchemy
+    database_echo: bool = False
+    database_query_cache_size: int = 500
+    # Пул соединений: постоянные и дополнительные соединения, ожидание свободного соединения,
+    # пересоздание соединений старше N секунд (-1 — никогда) и проверка соединения перед выдачей
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0
+    database_pool_recycle: int = -1
+    database_pool_pre_ping: bool = False
+    # Кэш подготовленных выражений на соединение (sqlite3 cached_statements / asyncpg)
+    database_statement_cache_size: int = 256
+    # SQLite: ожидание блокировки базы, режим журнала (wal, delete, ...; пусто — не менять),
+    # режим синхронизации (normal, full, ...; пусто — по умолчанию) и кэш страниц в КиБ (0 — по умолчанию).
+    # В режиме WAL чтение не блокируется записью, а synchronous=normal синхронизирует диск только
+    # при переносе журнала в базу (последние транзакции могут потеряться при сбое питания, но не ОС)
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_journal_mode: Optional[str] = "wal"
+    sqlite_synchronous: Optional[str] = "normal"
+    sqlite_cache_size_kib: int = 0
+    # SQLite: запись отзывов и результатов разбора заявок через одну задачу с групповой фиксацией:
+    # наибольший размер пакета и время ожидания следующих операций перед фиксацией (мс, 0 — не ждать)
+    sqlite_write_queue: bool = True
+    write_batch_max_size: int = 64
+    write_batch_window_ms: float = 0.0
+
+    # Сохранять промежуточные TXT/JSON файлы разбора заявок (для отладки и архива)
+    keep_parse_artifacts: bool = False
+
+    # Пул процессов для разбора заявок и размер очереди ожидающих разбора загрузок
+    ingest_max_workers: int = 2
+    ingest_queue_size: int = 100
+    # Повторные попытки разбора: число попыток, базовая задержка (удваивается) и период опроса очереди
+    ingest_max_attempts: int = 5
+    ingest_retry_backoff_seconds: float = 5.0
+    ingest_poll_interval_seconds: float = 2.0
+    # Объем кэша результатов разбора по содержимому файла (в байтах сериализованных данных)
+    parse_cache_max_bytes: int = 64 * 1024 * 1024
+    # Объем кэша сериализованных ответов /json-data (в байтах)
+    json_data_cache_max_bytes: int = 64 * 1024 * 1024
+
+    # Кэш аутентифицированных пользователей: число записей и время жизни записи (0 — кэш отключен)
+    user_cache_max_size: int = 1024
+    user_cache_ttl_seconds: float = 60.0
+
+    # Стоимость bcrypt (log2 числа раундов) и число одновременных операций хэширования паролей
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+
+    # Наибольшее число незавершенных назначений проектов на одного рецензента
+    reviewer_assignment_capacity: int = 50
+
+    # Наибольший размер загружаемого файла заявки (в байтах)
+    upload_max_bytes: int = 64 * 1024 * 1024
+    # Наибольший общий размер файлов пакетной загрузки после распаковки ZIP-архивов (в байтах)
+    bulk_upload_max_bytes: int = 512 * 1024 * 1024
+
+    # Каталог кэша сжатых файлов для архива /api/downloader/resources (вне папки ресурсов)
+    resources_archive_cache_dir: str = os.path.join(tempfile.gettempdir(), "konkursant-resources-zip")
+
     class Config:
         env_file = ".env"
 
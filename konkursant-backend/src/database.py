@@ -1,15 +1,69 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy import MetaData
-from databases import Database
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
+from sqlalchemy import MetaData, event
 from .config import settings
 
 DATABASE_URL = settings.database_url
 
-database = Database(DATABASE_URL)
 
-# Изменение подключения к созданию асинхронного двигателя
-async_engine = create_async_engine(DATABASE_URL, future=True, echo=True, connect_args={"check_same_thread": False})
+def engine_options(database_url: str) -> dict:
+    """
+    Параметры create_async_engine из настроек. Поддерживаются SQLite (aiosqlite)
+    и PostgreSQL (asyncpg) — рекомендуемая база для промышленной эксплуатации.
+    """
+    url = make_url(database_url)
+    options = {
+        "echo": settings.database_echo,  # Вывод всех SQL-запросов в лог — только для отладки
+        "query_cache_size": settings.database_query_cache_size,  # Кэш скомпилированных запросов SQLAlchemy
+    }
+
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # База в памяти существует только в рамках одного соединения
+        options["poolclass"] = StaticPool
+        return options
+
+    options.update(
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        pool_pre_ping=settings.database_pool_pre_ping,
+    )
+    if url.get_backend_name() == "sqlite":
+        # aiosqlite по умолчанию открывает соединение на каждый запрос (NullPool)
+        options["poolclass"] = AsyncAdaptedQueuePool
+        # Кэш подготовленных выражений модуля sqlite3 на соединение
+        options["connect_args"] = {"cached_statements": settings.database_statement_cache_size}
+    elif url.get_driver_name() == "asyncpg":
+        # Кэш подготовленных выражений asyncpg на соединение
+        options["connect_args"] = {"prepared_statement_cache_size": settings.database_statement_cache_size}
+    return options
+
+
+def sqlite_pragmas() -> list:
+    """PRAGMA, выполняемые при открытии каждого соединения с SQLite."""
+    pragmas = [f"PRAGMA busy_timeout = {settings.sqlite_busy_timeout_ms}"]
+    if settings.sqlite_journal_mode:
+        pragmas.append(f"PRAGMA journal_mode = {settings.sqlite_journal_mode}")
+    if settings.sqlite_synchronous:
+        pragmas.append(f"PRAGMA synchronous = {settings.sqlite_synchronous}")
+    if settings.sqlite_cache_size_kib:
+        # Отрицательное значение — размер кэша страниц в КиБ
+        pragmas.append(f"PRAGMA cache_size = -{settings.sqlite_cache_size_kib}")
+    return pragmas
+
+
+async_engine = create_async_engine(DATABASE_URL, **engine_options(DATABASE_URL))
+
+if async_engine.dialect.name == "sqlite":
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in sqlite_pragmas():
+            cursor.execute(pragma)
+        cursor.close()
 
 async_session = sessionmaker(bind=async_engine, expire_on_commit=False, class_=AsyncSession)
 
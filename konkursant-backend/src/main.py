@@ -5,8 +5,11 @@ from src.modules.auth.router import auth_router
 from src.modules.projects.router import project_router
 from src.modules.review.router import review_router
 from src.modules.downloader.router import downloader_router
+from src.modules.statistics.router import statistics_router
+from src.modules.projects.ingestion import ingestion_worker
+from src.write_queue import write_queue
 
-from src.database import database
+from src.database import async_engine
 
 app = FastAPI(
     title="Конкурсант API"
@@ -17,14 +20,19 @@ app.include_router(auth_router, prefix="/api/auth")
 app.include_router(project_router, prefix="/api/projects")
 app.include_router(review_router, prefix="/api/reviews")
 app.include_router(downloader_router, prefix="/api/downloader", tags=["Загрузка файлов"])
+app.include_router(statistics_router, prefix="/api/statistics")
 
 @app.on_event("startup")
 async def startup():
-    await database.connect()
+    write_queue.start()
+    ingestion_worker.start()
+    await ingestion_worker.recover()
 
 @app.on_event("shutdown")
 async def shutdown():
-    await database.disconnect()
+    await ingestion_worker.stop()
+    await write_queue.stop()
+    await async_engine.dispose()
 
 # Настройка CORS
 app.add_middleware(
@@ -1,15 +1,15 @@
 # Стандартные импорты
 import logging
-from fastapi import Request, Response, Depends, HTTPException, status
+from fastapi import Request, Response, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from starlette.status import HTTP_403_FORBIDDEN
-import bcrypt
 
 # Файлы модуля Авторизации
 from src.modules.auth import models, schemas, utils
+from src.modules.auth.cache import user_cache
 
 # Файлы основного приложения
 from src.database import async_session
@@ -74,7 +74,7 @@ async def authenticate_user(db: AsyncSession, email: str, password: str):
         logger.error(f"Пользователь с электронной почтой {email} не найден.")
         return False
 
-    if not verify_password(password, user.password_hash):
+    if not await verify_password(db, user, password):
         logger.error(f"Не удалось проверить пароль для пользователя {email}.")
         return False
 
@@ -82,13 +82,14 @@ async def authenticate_user(db: AsyncSession, email: str, password: str):
     return user
 
 
-async def get_current_user(request: Request, db: AsyncSession = Depends(get_db)):
+async def get_current_user(request: Request):
     """
     Извлечение текущего аутентифицированного пользователя из запроса.
 
-    Проверяет наличие токена доступа в куках и декодирует его.
+    Проверяет наличие токена доступа в куках и декодирует его. Пользователь берется
+    из кэша (user_cache), к базе данных обращаемся только при промахе — в отдельной
+    короткой сессии, чтобы запрос не держал второе соединение пула до своего завершения.
     """
-    logger.info(f"Куки в запросе: {request.cookies}")
     token = request.cookies.get("access_token")
 
     if not token:
@@ -99,7 +100,7 @@ async def get_current_user(request: Request, db: AsyncSession = Depends(get_db))
         )
 
     try:
-        logger.info("Попытка декодирования JWT...")
+        logger.debug("Попытка декодирования JWT...")
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
         email: str = payload.get("sub")
 
@@ -112,30 +113,42 @@ async def get_current_user(request: Request, db: AsyncSession = Depends(get_db))
         logger.error(f"Ошибка проверки JWT: {str(e)}")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Не аутентифицирован")
 
-    user = await get_user_by_email(db, email=token_data.email)
+    user = user_cache.get(token_data.email)
+    if user is not None:
+        return user
+
+    async with async_session() as db:
+        user = await get_user_by_email(db, email=token_data.email)
     if not user:
         logger.error("Пользователь не найден после декодирования токена.")
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Не аутентифицирован")
 
-    logger.info(f"Пользователь {user.email} аутентифицирован успешно.")
+    user_cache.put(user)
+    logger.debug(f"Пользователь {user.email} аутентифицирован успешно.")
     return user
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(db: AsyncSession, user: models.User, plain_password: str) -> bool:
     """
-    Проверка пароля.
+    Проверка пароля пользователя (выполняется вне цикла событий).
+    Если хэш пароля посчитан с устаревшей стоимостью bcrypt, он прозрачно пересчитывается и сохраняется.
 
+    - user: Пользователь, чей пароль проверяется.
     - plain_password: Обычный (незашифрованный) пароль.
-    - hashed_password: Зашифрованный пароль.
 
     Возвращает True, если пароль верен, иначе - False.
     """
     logger.info("Проверка пароля...")
-    is_valid = bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    is_valid, new_hash = await utils.verify_and_update_password(plain_password, user.password_hash)
 
-    if is_valid:
-        logger.info("Пароль корректен.")
-    else:
+    if not is_valid:
         logger.error("Пароль некорректен.")
+        return False
+
+    logger.info("Пароль корректен.")
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+        logger.info(f"Хэш пароля пользователя {user.email} пересчитан с новой стоимостью.")
 
-    return is_valid
+    return True
@@ -0,0 +1,62 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from src.config import settings
+from src.modules.auth import models
+
+
+class UserCache:
+    """
+    Кэш аутентифицированных пользователей по субъекту токена (электронной почте).
+
+    Хранит значения столбцов записи пользователя не дольше ttl секунд и не более
+    max_size записей (вытесняются давно не использованные). При попадании возвращается
+    новый объект User, не привязанный к сессии, поэтому запросы не делят между собой
+    один изменяемый объект. Изменения пользователя (например, смена роли) должны
+    сопровождаться вызовом invalidate.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        # email -> (момент истечения по time.monotonic(), значения столбцов пользователя)
+        self._entries: OrderedDict = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    def get(self, email: str) -> Optional[models.User]:
+        entry = self._entries.get(email)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[email]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(email)
+        self.hits += 1
+        return models.User(**entry[1])
+
+    def put(self, user: models.User):
+        if not self.enabled:
+            return
+        columns = {attr.key: getattr(user, attr.key) for attr in models.User.__mapper__.column_attrs}
+        self._entries[user.email] = (time.monotonic() + self.ttl_seconds, columns)
+        self._entries.move_to_end(user.email)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, email: str):
+        self._entries.pop(email, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+user_cache = UserCache(max_size=settings.user_cache_max_size, ttl_seconds=settings.user_cache_ttl_seconds)
@@ -7,6 +7,7 @@ import logging
 # Файлы модуля Авторизации
 from src.modules.auth import schemas, auth, utils, models
 from src.modules.auth.schemas import UserLogin
+from src.modules.auth.cache import user_cache
 
 # Файлы основного приложения
 from src.config import settings
@@ -36,7 +37,7 @@ async def register_user(user_in: schemas.UserCreate, db: AsyncSession = Depends(
     # Хэширование пароля перед сохранением
     user_data = user_in.dict()
     user_data.pop("password")  # Удаляем пароль из user_data
-    user_in_db = models.User(**user_data, password_hash=utils.get_password_hash(user_in.password))
+    user_in_db = models.User(**user_data, password_hash=await utils.get_password_hash_async(user_in.password))
     db.add(user_in_db)
     await db.commit()
     await db.refresh(user_in_db)
@@ -112,5 +113,6 @@ async def assign_role(email: str, role: str, current_user: schemas.User = Depend
 
     user.role = role
     await db.commit()  # Сохраняем изменения
+    user_cache.invalidate(email)  # Новая роль действует со следующего запроса
     logger.info("Роль %s назначена пользователю %s", role, email)
     return {"message": f"Роль {role} назначена пользователю {email}"}
@@ -1,9 +1,25 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from jose import jwt
 from datetime import datetime, timedelta
+from typing import Optional, Tuple
 from src.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Хэши с другой стоимостью считаются устаревшими и пересчитываются при входе (verify_and_update)
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.bcrypt_rounds)
+
+# bcrypt занимает сотни миллисекунд процессора, поэтому выполняется вне цикла событий,
+# в отдельном ограниченном пуле потоков. Семафор пропускает в пул не больше операций, чем в нем
+# потоков: остальные ждут в цикле событий и отменяются, если клиент успел отключиться
+_hash_executor = ThreadPoolExecutor(max_workers=settings.password_hash_workers, thread_name_prefix="password-hash")
+_hash_semaphore = asyncio.Semaphore(settings.password_hash_workers)
+
+
+async def _run_in_hash_executor(func, *args):
+    async with _hash_semaphore:
+        return await asyncio.get_running_loop().run_in_executor(_hash_executor, func, *args)
+
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -11,6 +27,18 @@ def get_password_hash(password: str) -> str:
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_hash_executor(pwd_context.hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Проверка пароля вне цикла событий.
+
+    Возвращает (пароль верен, новый хэш). Новый хэш возвращается, если сохраненный
+    посчитан с устаревшими параметрами и его нужно заменить.
+    """
+    return await _run_in_hash_executor(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     if expires_delta:
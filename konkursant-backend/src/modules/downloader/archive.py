@@ -0,0 +1,222 @@
+import hashlib
+import os
+import struct
+import threading
+import time
+import weakref
+import zlib
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+# Размер блока чтения и сжатия: память на один запрос не зависит от размера папки
+CHUNK_SIZE = 64 * 1024
+ZIP_MAX_SIZE = 0xFFFFFFFF  # Без Zip64: ограничение на размер файла и архива
+
+UTF8_FLAG = 0x0800
+DEFLATED = 8
+
+
+class CachedEntry(NamedTuple):
+    """Файл папки ресурсов, сжатый в кэш архива."""
+    arcname: str
+    mtime_ns: int
+    size: int
+    mode: int
+    crc: int
+    compressed_size: int
+    data_path: str
+
+
+# Часть архива: либо байты заголовков в памяти, либо (путь к сжатым данным, длина)
+Segment = Union[bytes, Tuple[str, int]]
+
+
+def _dos_datetime(mtime_ns: int) -> Tuple[int, int]:
+    t = time.localtime(mtime_ns / 1e9)
+    if t.tm_year < 1980:
+        return 0, (1 << 5) | 1
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+class ArchiveSnapshot:
+    """
+    Неизменяемый снимок ZIP-архива папки ресурсов.
+
+    Архив описан последовательностью сегментов: заголовки хранятся в памяти, сжатые данные
+    файлов — в кэше на диске. Поэтому размер архива известен заранее, любой диапазон байтов
+    читается без сборки архива целиком, а память на отдачу ограничена размером блока.
+    """
+
+    def __init__(self, entries: List[CachedEntry]):
+        self.segments: List[Segment] = []
+        central_directory = []
+        offset = 0
+
+        for entry in entries:
+            name = entry.arcname.encode("utf-8")
+            dos_time, dos_date = _dos_datetime(entry.mtime_ns)
+            local_header = struct.pack(
+                "<IHHHHHIIIHH", 0x04034B50, 20, UTF8_FLAG, DEFLATED, dos_time, dos_date,
+                entry.crc, entry.compressed_size, entry.size, len(name), 0
+            ) + name
+            central_directory.append(struct.pack(
+                "<IHHHHHHIIIHHHHHII", 0x02014B50, (3 << 8) | 20, 20, UTF8_FLAG, DEFLATED, dos_time, dos_date,
+                entry.crc, entry.compressed_size, entry.size, len(name), 0, 0, 0, 0,
+                (entry.mode & 0xFFFF) << 16, offset
+            ) + name)
+            self.segments.append(local_header)
+            self.segments.append((entry.data_path, entry.compressed_size))
+            offset += len(local_header) + entry.compressed_size
+
+        central_directory = b"".join(central_directory)
+        end_of_directory = struct.pack(
+            "<IHHHHIIH", 0x06054B50, 0, 0, len(entries), len(entries), len(central_directory), offset, 0
+        )
+        self.segments.append(central_directory + end_of_directory)
+        self.size = offset + len(central_directory) + len(end_of_directory)
+        if self.size > ZIP_MAX_SIZE or len(entries) > 0xFFFF:
+            raise ValueError("Папка ресурсов слишком велика для ZIP-архива без Zip64.")
+
+        # ETag архива зависит только от состава и версий файлов
+        manifest = "\n".join(f"{e.arcname}\0{e.mtime_ns}\0{e.size}" for e in entries)
+        self.etag = hashlib.sha1(manifest.encode("utf-8")).hexdigest()
+
+    def iter_range(self, start: int = 0, end: Optional[int] = None) -> Iterator[bytes]:
+        """Байты архива в диапазоне [start, end] (включительно), блоками не больше CHUNK_SIZE."""
+        end = self.size - 1 if end is None else end
+        position = 0
+        for segment in self.segments:
+            length = len(segment) if isinstance(segment, bytes) else segment[1]
+            segment_start, segment_end = position, position + length
+            position = segment_end
+            if segment_end <= start:
+                continue
+            if segment_start > end:
+                break
+
+            skip = max(start - segment_start, 0)
+            remaining = min(end + 1, segment_end) - segment_start - skip
+            if isinstance(segment, bytes):
+                yield segment[skip:skip + remaining]
+                continue
+
+            with open(segment[0], "rb") as data:
+                data.seek(skip)
+                while remaining > 0:
+                    chunk = data.read(min(CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise IOError(f"Кэш архива поврежден: {segment[0]}")
+                    remaining -= len(chunk)
+                    yield chunk
+
+
+class ResourceArchive:
+    """
+    Инкрементальный кэш ZIP-архива папки ресурсов.
+
+    Каждый файл сжимается (DEFLATE) в отдельный файл кэша; при следующем обновлении
+    пересжимаются только файлы с изменившимися mtime или размером, удаленные файлы
+    убираются из кэша. Файлы кэша именуются по версии исходного файла.
+
+    Снимок читает файлы кэша по мере отдачи, поэтому на каждый файл кэша ведется счетчик
+    живых снимков, которые на него ссылаются. Замененный или удаленный файл кэша удаляется
+    с диска только после того, как последний такой снимок освобожден: отдача уже начатого
+    снимка не ломается при параллельном обновлении.
+    """
+
+    def __init__(self, resource_folder: str, cache_dir: str):
+        self.resource_folder = resource_folder
+        self.cache_dir = cache_dir
+        self._entries: Dict[str, CachedEntry] = {}
+        # Файл кэша -> число живых снимков, которые его читают
+        self._references: Dict[str, int] = {}
+        # Файлы кэша, вышедшие из текущей версии, но еще нужные живым снимкам
+        self._retired: Set[str] = set()
+        # Снимок освобождается финализатором, который может сработать при сборке мусора внутри refresh
+        self._lock = threading.RLock()
+
+    def refresh(self) -> ArchiveSnapshot:
+        """Обновляет кэш по текущему состоянию папки и возвращает снимок архива (блокирующий вызов)."""
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            entries = []
+            for root, _, files in os.walk(self.resource_folder):
+                for file in files:
+                    file_path = os.path.join(root, file)
+                    arcname = os.path.relpath(file_path, self.resource_folder).replace(os.sep, "/")
+                    stat = os.stat(file_path)
+                    entry = self._entries.get(arcname)
+                    if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+                        if entry is not None:
+                            self._remove(entry)
+                        entry = self._compress(file_path, arcname, stat)
+                        # Файл вернулся к версии, которая еще ждала удаления, — он снова текущий
+                        self._retired.discard(entry.data_path)
+                        self._entries[arcname] = entry
+                    entries.append(entry)
+
+            current = {entry.arcname for entry in entries}
+            for arcname in [arcname for arcname in self._entries if arcname not in current]:
+                self._remove(self._entries.pop(arcname))
+
+            snapshot = ArchiveSnapshot(entries)
+            data_paths = [entry.data_path for entry in entries]
+            for data_path in data_paths:
+                self._references[data_path] = self._references.get(data_path, 0) + 1
+            weakref.finalize(snapshot, self._release, data_paths)
+            return snapshot
+
+    def _compress(self, file_path: str, arcname: str, stat: os.stat_result) -> CachedEntry:
+        key = hashlib.sha1(arcname.encode("utf-8")).hexdigest()
+        data_path = os.path.join(self.cache_dir, f"{key}-{stat.st_mtime_ns}-{stat.st_size}.deflate")
+        compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+        crc, size, compressed_size = 0, 0, 0
+
+        with open(file_path, "rb") as source, open(data_path, "wb") as target:
+            while True:
+                chunk = source.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                compressed = compressor.compress(chunk)
+                compressed_size += len(compressed)
+                target.write(compressed)
+            compressed = compressor.flush()
+            compressed_size += len(compressed)
+            target.write(compressed)
+
+        if size > ZIP_MAX_SIZE or compressed_size > ZIP_MAX_SIZE:
+            os.remove(data_path)
+            raise ValueError(f"Файл {arcname} слишком велик для ZIP-архива без Zip64.")
+
+        # В архив попадает фактически прочитанная версия; если файл дописывался во время чтения,
+        # размер не совпадет с stat и файл будет пересжат при следующем обновлении
+        return CachedEntry(arcname, stat.st_mtime_ns, size, stat.st_mode, crc, compressed_size, data_path)
+
+    def _remove(self, entry: CachedEntry):
+        """Убирает файл кэша; если его читают живые снимки — откладывает до их освобождения."""
+        if self._references.get(entry.data_path):
+            self._retired.add(entry.data_path)
+        else:
+            self._delete(entry.data_path)
+
+    def _release(self, data_paths: List[str]):
+        with self._lock:
+            for data_path in data_paths:
+                count = self._references[data_path] - 1
+                if count:
+                    self._references[data_path] = count
+                    continue
+                del self._references[data_path]
+                if data_path in self._retired:
+                    self._retired.discard(data_path)
+                    self._delete(data_path)
+
+    @staticmethod
+    def _delete(data_path: str):
+        try:
+            os.remove(data_path)
+        except FileNotFoundError:
+            pass
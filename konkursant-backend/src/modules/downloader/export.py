@@ -0,0 +1,199 @@
+import asyncio
+import csv
+import io
+import logging
+import os
+import re
+import zipfile
+from typing import AsyncIterator, List, Optional, Sequence
+
+import orjson
+from sqlalchemy import Select, Text, type_coerce
+from sqlalchemy.future import select
+from starlette.concurrency import run_in_threadpool
+
+from src.database import async_session
+from src.modules.projects.models import Project, ProjectData
+
+logger = logging.getLogger(__name__)
+
+# Строк проектов на одну порцию: данные заявок читаются из базы потоком, а не целиком
+EXPORT_BATCH_SIZE = 200
+# Размер части архива и число частей в очереди между пулом потоков и ответом
+EXPORT_CHUNK_SIZE = 1024 * 1024
+EXPORT_QUEUE_SIZE = 4
+
+CSV_COLUMNS = (
+    "id_project", "title", "status", "owner_id", "created_at",
+    "ФИО", "Название проекта", "Регион проекта", "Общая сумма расходов",
+)
+
+
+class ZipSink(io.RawIOBase):
+    """
+    Неперематываемый приемник для zipfile, передающий архив по частям в очередь asyncio.
+    zipfile в этом случае пишет дескрипторы данных после каждого файла, поэтому архив
+    можно отдавать по мере создания.
+
+    Запись идет в пуле потоков: накопив EXPORT_CHUNK_SIZE байт, приемник кладет часть
+    в ограниченную очередь и ждет, пока в ней освободится место. В памяти поэтому не больше
+    EXPORT_QUEUE_SIZE + 1 частей, каким бы большим ни был записываемый файл.
+    """
+
+    def __init__(self, queue: asyncio.Queue, loop: asyncio.AbstractEventLoop):
+        super().__init__()
+        self._queue = queue
+        self._loop = loop
+        self._buffer = bytearray()
+        self._discarding = False
+        self._interrupt = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if self._discarding:
+            if self._interrupt:
+                self._interrupt = False
+                raise ConnectionAbortedError("Выгрузка прервана: клиент отключился.")
+            return len(data)
+        self._buffer += data
+        if len(self._buffer) >= EXPORT_CHUNK_SIZE:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        """Передает накопленные байты в очередь (вызывается только из пула потоков)."""
+        if self._buffer and not self._discarding:
+            chunk = bytes(self._buffer)
+            self._buffer.clear()
+            asyncio.run_coroutine_threadsafe(self._queue.put(chunk), self._loop).result()
+
+    def discard(self, interrupt: bool = False):
+        """
+        Прекращает передачу: дальнейшие байты отбрасываются (в том числе при закрытии архива
+        сборщиком мусора). При interrupt следующая запись прерывает поток записи исключением.
+        """
+        self._interrupt = self._interrupt or interrupt
+        self._discarding = True
+
+
+def _basename(path: str) -> str:
+    # Пути старых проектов сохранены в формате Windows
+    return re.split(r"[\\/]", path)[-1]
+
+
+def build_export_query(formats: Sequence[str], project_ids: Optional[List[int]] = None,
+                       status: Optional[str] = None, region: Optional[str] = None) -> Select:
+    """Один запрос, возвращающий пути файлов (и данные заявок, если они нужны) отобранных проектов."""
+    columns = [Project.id_project, Project.title, Project.status, Project.owner_id, Project.created_at,
+               Project.docs_file_path, Project.json_file_path]
+    if "json" in formats or "csv" in formats:
+        # Сырой текст JSON: разбирается orjson, без промежуточного разбора драйвером
+        columns.append(type_coerce(ProjectData.json_data, Text).label("json_raw"))
+
+    query = select(*columns).outerjoin(ProjectData, ProjectData.project_id == Project.id_project)
+    if project_ids:
+        query = query.where(Project.id_project.in_(project_ids))
+    if status is not None:
+        query = query.where(Project.status == status)
+    if region is not None:
+        query = query.where(Project.region == region)
+    return query.order_by(Project.id_project)
+
+
+def _write_batch(archive: zipfile.ZipFile, rows, formats: Sequence[str], csv_writer, missing: List[str]):
+    """Добавляет в архив файлы порции проектов (выполняется в пуле потоков)."""
+    for row in rows:
+        json_raw = row.json_raw if "json_raw" in row._fields else None
+        json_data = orjson.loads(json_raw) if json_raw is not None else None
+
+        if "docx" in formats:
+            if row.docs_file_path and os.path.isfile(row.docs_file_path):
+                # DOCX уже сжат, повторное сжатие только тратит процессор
+                archive.write(row.docs_file_path, f"docx/{row.id_project}_{_basename(row.docs_file_path)}",
+                              compress_type=zipfile.ZIP_STORED)
+            else:
+                missing.append(f"{row.id_project}: DOCX {row.docs_file_path or '-'}")
+
+        if "json" in formats:
+            if json_data is not None:
+                json_name = _basename(row.json_file_path) if row.json_file_path else "data.json"
+                archive.writestr(f"json/{row.id_project}_{json_name}",
+                                 orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
+            else:
+                missing.append(f"{row.id_project}: данные JSON")
+
+        if csv_writer is not None:
+            json_data = json_data or {}
+            csv_writer.writerow([
+                row.id_project, row.title, row.status, row.owner_id, row.created_at,
+                json_data.get("ФИО", ""), json_data.get("Название проекта", ""), json_data.get("Регион проекта", ""),
+                json_data.get("Вкладка Расходы", {}).get("Общая сумма расходов:", ""),
+            ])
+    # Отдаем остаток порции, не дожидаясь заполнения части
+    archive.fp.flush()
+
+
+def _finish(archive: zipfile.ZipFile, csv_buffer: Optional[io.StringIO], missing: List[str]):
+    if csv_buffer is not None:
+        # utf-8-sig — чтобы Excel правильно открыл кириллицу
+        archive.writestr("projects.csv", csv_buffer.getvalue().encode("utf-8-sig"))
+    if missing:
+        archive.writestr("missing.txt", "\n".join(missing))
+    archive.close()
+
+
+async def iter_export_archive(query: Select, formats: Sequence[str]) -> AsyncIterator[bytes]:
+    """
+    ZIP-архив выгрузки, отдаваемый по частям.
+
+    Строки проектов читаются из базы порциями по EXPORT_BATCH_SIZE, файлы каждой порции
+    добавляются в архив в пуле потоков, а части архива через ограниченную очередь (ZipSink)
+    отдаются клиенту по мере записи: формирование архива не опережает отдачу больше
+    чем на EXPORT_QUEUE_SIZE частей.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=EXPORT_QUEUE_SIZE)
+    sink = ZipSink(queue, asyncio.get_running_loop())
+
+    async def write_archive():
+        archive = zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED)
+        csv_buffer = io.StringIO() if "csv" in formats else None
+        csv_writer = csv.writer(csv_buffer) if csv_buffer is not None else None
+        if csv_writer is not None:
+            csv_writer.writerow(CSV_COLUMNS)
+        missing: List[str] = []
+        exported = 0
+
+        # Собственная сессия: зависимости запроса закрываются до окончания отдачи ответа
+        async with async_session() as db:
+            result = await db.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for rows in result.partitions():
+                await run_in_threadpool(_write_batch, archive, rows, formats, csv_writer, missing)
+                exported += len(rows)
+
+        await run_in_threadpool(_finish, archive, csv_buffer, missing)
+        logger.info(f"Выгрузка проектов: {exported} проектов, форматы {', '.join(formats)}, пропущено {len(missing)}.")
+
+    async def write_and_close():
+        try:
+            await write_archive()
+        except BaseException:
+            sink.discard()  # Недописанный архив не должен ничего отдавать при закрытии
+            raise
+        finally:
+            await queue.put(None)
+
+    writer = asyncio.create_task(write_and_close())
+    try:
+        while (chunk := await queue.get()) is not None:
+            yield chunk
+        await writer  # Ошибка формирования архива прерывает ответ
+    finally:
+        if not writer.done():
+            # Клиент отключился: поток записи прерывается на следующей записи, а очередь
+            # освобождается, чтобы он не остался ждать места в ней
+            sink.discard(interrupt=True)
+            while not queue.empty():
+                queue.get_nowait()
+            writer.cancel()
@@ -1,45 +1,127 @@
 # Импортируем необходимые библиотеки
-from fastapi import FastAPI, APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 import os
-import zipfile
-from io import BytesIO
+import re
+from typing import List, Literal, Optional, Tuple
+
+from src.config import settings
+from src.modules.auth.auth import get_current_user
+from src.modules.auth.models import User
+from src.modules.downloader.archive import ArchiveSnapshot, ResourceArchive
+from src.modules.downloader.export import build_export_query, iter_export_archive
 
 # Определяем путь к папке для архивирования
 RESOURCE_FOLDER = "src/_resources"
 
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
 downloader_router = APIRouter()
 
+# Сжатые файлы хранятся между запросами: пересжимаются только изменившиеся
+resource_archive = ResourceArchive(RESOURCE_FOLDER, settings.resources_archive_cache_dir)
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Разбирает заголовок Range (поддерживается один диапазон байтов).
+    Возвращает (start, end) включительно или None, если нужно отдать архив целиком.
+    Неудовлетворимый диапазон — ошибка 416.
+    """
+    if not range_header:
+        return None
+    match = RANGE_PATTERN.match(range_header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+
+    first, last = match.groups()
+    if first == "":
+        # Последние N байтов
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+
+    if start >= size or start > end:
+        raise HTTPException(status_code=416, detail="Запрошенный диапазон недоступен",
+                            headers={"Content-Range": f"bytes */{size}"})
+    return start, end
+
+
 # Эндпоинт для скачивания информации в виде ZIP-архива
 @downloader_router.get("/resources", response_class=StreamingResponse)
-async def download_resources():
+async def download_resources(request: Request):
+    """
+    Скачивание папки ресурсов ZIP-архивом.
+
+    Архив отдается потоком блоками по 64 КБ из кэша сжатых файлов, сжатие и чтение
+    выполняются вне цикла событий. Поддерживаются докачка (Range, If-Range) и ETag.
+    """
     # Проверяем, существует ли папка с ресурсами
     if not os.path.exists(RESOURCE_FOLDER):
         raise HTTPException(status_code=404, detail="Папка ресурсов не найдена")
 
-    # Создаем буфер для хранения архива
-    zip_buffer = BytesIO()
-
-    # Создаем ZIP-архив
     try:
-        with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            # Проходим по всем файлам в папке ресурсов
-            for root, _, files in os.walk(RESOURCE_FOLDER):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    arcname = os.path.relpath(file_path, RESOURCE_FOLDER)  # Упрощаем путь к файлу в архиве
-                    zip_file.write(file_path, arcname)
+        snapshot: ArchiveSnapshot = await run_in_threadpool(resource_archive.refresh)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка создания ZIP-архива: {str(e)}")
 
-    # Перемещаем указатель в начало буфера
-    zip_buffer.seek(0)
+    etag = f'"{snapshot.etag}"'
+    headers = {
+        "Content-Disposition": "attachment; filename=resources.zip",
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+    }
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    # Докачка возможна, только если архив не изменился (If-Range совпадает с ETag)
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range == etag:
+        byte_range = parse_range(request.headers.get("range"), snapshot.size)
+
+    # Синхронный генератор StreamingResponse обходит в пуле потоков, чтение файлов не блокирует цикл
+    if byte_range is None:
+        headers["Content-Length"] = str(snapshot.size)
+        return StreamingResponse(snapshot.iter_range(), media_type="application/zip", headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{snapshot.size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(snapshot.iter_range(start, end), status_code=206,
+                             media_type="application/zip", headers=headers)
+
+
+# Эндпоинт для выгрузки отобранных проектов
+@downloader_router.get("/export", response_class=StreamingResponse)
+async def export_projects(
+        project_ids: Optional[List[int]] = Query(None),
+        project_status: Optional[str] = Query(None, alias="status"),
+        region: Optional[str] = None,
+        formats: List[Literal["docx", "json", "csv"]] = Query(["json"], alias="format"),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Выгрузка файлов отобранных проектов ZIP-архивом. Доступно только администраторам.
+
+    - **project_ids**: ID проектов (параметр можно повторять).
+    - **status**: Статус проекта.
+    - **region**: Регион проекта из данных заявки («Регион проекта»).
+    - **format**: docx — загруженные файлы, json — данные заявок, csv — сводная таблица
+      (параметр можно повторять; по умолчанию json).
+
+    Архив формируется и отдается по частям; файлы, которых нет на диске, перечисляются в missing.txt.
+    """
+    if current_user.role != 'admin':
+        raise HTTPException(status_code=403, detail="Выгрузка доступна только администраторам.")
 
-    # Возвращаем StreamingResponse с заголовками для скачивания
+    formats = list(dict.fromkeys(formats))
+    query = build_export_query(formats, project_ids, project_status, region)
     return StreamingResponse(
-        zip_buffer,
-        media_type="application/zip",  # Используем правильный медиаплейт
-        headers={
-            "Content-Disposition": "attachment; filename=resources.zip"
-        }
+        iter_export_archive(query, formats),
+        media_type="application/zip",
+        headers={"Content-Disposition": "attachment; filename=export.zip"}
     )
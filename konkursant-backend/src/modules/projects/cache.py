@@ -0,0 +1,128 @@
+import hashlib
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+import orjson
+
+from src.config import settings
+from src.modules.projects.projects import PARSER_VERSION
+
+
+def content_digest(content: bytes) -> str:
+    """SHA-256 содержимого загруженного файла."""
+    return hashlib.sha256(content).hexdigest()
+
+
+class ParseCache:
+    """
+    Кэш результатов разбора заявок, адресуемый содержимым файла.
+
+    Ключ — SHA-256 файла и версия разборщика, значение — сериализованный результат
+    DataExtractor, поэтому повторная загрузка того же документа не требует разбора DOCX,
+    а каждый читатель получает собственную копию данных. Объем ограничен суммарным размером
+    записей, при переполнении вытесняются давно не использованные.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    @staticmethod
+    def key(content: bytes) -> str:
+        return f"{PARSER_VERSION}:{content_digest(content)}"
+
+    def get(self, key: str) -> Optional[dict]:
+        payload = self._entries.get(key)
+        if payload is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return orjson.loads(payload)
+
+    def put(self, key: str, data: dict):
+        payload = orjson.dumps(data)
+        if len(payload) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._entries[key] = payload
+        self.size += len(payload)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "size": self.size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+parse_cache = ParseCache(max_bytes=settings.parse_cache_max_bytes)
+
+
+def serialize_json_data(json_data: dict) -> Tuple[bytes, str]:
+    """Сериализованные данные проекта и их SHA-256 (хранится в ProjectData.content_hash)."""
+    payload = orjson.dumps(json_data)
+    return payload, content_digest(payload)
+
+
+class JSONDataCache:
+    """
+    Кэш готовых к отдаче ответов /json-data: сериализованные данные проекта по ID проекта.
+
+    Запись действительна, только пока ее хэш совпадает с ProjectData.content_hash в базе,
+    поэтому устаревшие данные не отдаются даже без явной инвалидации (например, при
+    нескольких процессах сервера). Объем ограничен суммарным размером записей (LRU).
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, Tuple[str, bytes]]" = OrderedDict()
+
+    def get(self, project_id: int, content_hash: str) -> Optional[bytes]:
+        entry = self._entries.get(project_id)
+        if entry is None or entry[0] != content_hash:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(project_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, project_id: int, content_hash: str, payload: bytes):
+        self.invalidate(project_id)
+        if len(payload) > self.max_bytes:
+            return
+        self._entries[project_id] = (content_hash, payload)
+        self.size += len(payload)
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def invalidate(self, project_id: int):
+        entry = self._entries.pop(project_id, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "size": self.size, "hits": self.hits, "misses": self.misses}
+
+
+json_data_cache = JSONDataCache(max_bytes=settings.json_data_cache_max_bytes)
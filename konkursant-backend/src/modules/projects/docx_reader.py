@@ -0,0 +1,118 @@
+import io
+import posixpath
+import zipfile
+from typing import BinaryIO, Iterator, List, NamedTuple, Union
+
+from lxml import etree
+
+# Пространства имен WordprocessingML и связей пакета OPC
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+RELATIONSHIPS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+OFFICE_DOCUMENT = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"
+DEFAULT_DOCUMENT_PART = "word/document.xml"
+
+W_BODY, W_P, W_TBL, W_SDT = W + "body", W + "p", W + "tbl", W + "sdt"
+W_TR, W_TC = W + "tr", W + "tc"
+W_R, W_HYPERLINK = W + "r", W + "hyperlink"
+W_T, W_TAB, W_PTAB, W_BR, W_CR, W_NO_BREAK_HYPHEN = (
+    W + "t", W + "tab", W + "ptab", W + "br", W + "cr", W + "noBreakHyphen"
+)
+W_TYPE = W + "type"
+
+# Текстовые эквиваленты элементов содержимого run (как в python-docx)
+RUN_CHARACTERS = {W_TAB: "\t", W_PTAB: "\t", W_CR: "\n", W_NO_BREAK_HYPHEN: "-"}
+
+
+class Table(NamedTuple):
+    """Таблица верхнего уровня документа."""
+    rows: List[List[str]]  # Текст ячеек по строкам; абзацы ячейки разделены "\n", как в _Cell.text
+    line: int = 0  # Номер строки текста документа, перед которой стоит таблица
+
+
+def document_part_name(package: zipfile.ZipFile) -> str:
+    """Имя основной части документа по связи officeDocument из _rels/.rels."""
+    try:
+        relationships = etree.fromstring(package.read("_rels/.rels"))
+    except KeyError:
+        return DEFAULT_DOCUMENT_PART
+    for relationship in relationships.iter(RELATIONSHIPS + "Relationship"):
+        if relationship.get("Type") == OFFICE_DOCUMENT:
+            return posixpath.normpath(relationship.get("Target", DEFAULT_DOCUMENT_PART).lstrip("/"))
+    return DEFAULT_DOCUMENT_PART
+
+
+def _append_run_text(run, parts: list):
+    for element in run:
+        tag = element.tag
+        if tag == W_T:
+            parts.append(element.text or "")
+        elif tag == W_BR:
+            # Разрыв строки — перевод строки, разрывы страницы и колонки текста не дают
+            if element.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        else:
+            character = RUN_CHARACTERS.get(tag)
+            if character is not None:
+                parts.append(character)
+
+
+def paragraph_text(paragraph) -> str:
+    """Текст элемента w:p по тем же правилам, что и Paragraph.text в python-docx."""
+    parts = []
+    for child in paragraph:
+        if child.tag == W_R:
+            _append_run_text(child, parts)
+        elif child.tag == W_HYPERLINK:
+            for run in child:
+                if run.tag == W_R:
+                    _append_run_text(run, parts)
+    return "".join(parts)
+
+
+def table_rows(table) -> List[List[str]]:
+    """Текст ячеек элемента w:tbl (вложенные таблицы в текст ячейки не входят)."""
+    return [
+        ["\n".join(paragraph_text(paragraph) for paragraph in cell.iterchildren(W_P))
+         for cell in row.iterchildren(W_TC)]
+        for row in table.iterchildren(W_TR)
+    ]
+
+
+def iter_blocks(source: Union[str, bytes, BinaryIO]) -> Iterator[Union[str, Table]]:
+    """
+    Содержимое тела DOCX в порядке документа: текст абзаца (str) или таблица (Table).
+
+    Абзацы — те же, что и Document(source).paragraphs.
+
+    python-docx строит дерево всего документа и загружает в память все части пакета,
+    включая изображения. Здесь из архива читается только основная часть документа,
+    потоково (iterparse): абзацы и таблицы верхнего уровня отдаются по мере разбора,
+    а разобранные элементы тела сразу удаляются из дерева, поэтому память не растет
+    с размером документа. Абзацы ячеек входят только в текст таблицы; абзацы внутри
+    элементов управления (w:sdt), как и у document.paragraphs, пропускаются.
+
+    - source: путь к файлу, содержимое файла (bytes) или файловый объект.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    with zipfile.ZipFile(source) as package:
+        with package.open(document_part_name(package)) as document:
+            # Те же параметры разбора, что у python-docx
+            events = etree.iterparse(document, events=("end",), tag=(W_P, W_TBL, W_SDT),
+                                     remove_blank_text=True, resolve_entities=False)
+            for _, element in events:
+                body = element.getparent()
+                if body is None or body.tag != W_BODY:
+                    continue  # Вложенный элемент освобождается вместе с элементом тела
+                if element.tag == W_P:
+                    yield paragraph_text(element)
+                elif element.tag == W_TBL:
+                    yield Table(table_rows(element))
+                element.clear()
+                while element.getprevious() is not None:
+                    del body[0]
+
+
+def iter_paragraphs(source: Union[str, bytes, BinaryIO]) -> Iterator[str]:
+    """Текст абзацев DOCX в той же последовательности, что и Document(source).paragraphs."""
+    return (block for block in iter_blocks(source) if isinstance(block, str))
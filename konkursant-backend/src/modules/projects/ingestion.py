@@ -0,0 +1,319 @@
+import asyncio
+import logging
+import os
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional
+
+from sqlalchemy import update, func, exists
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from src.config import settings
+from src.database import async_session
+from src.modules.projects.cache import parse_cache, json_data_cache, serialize_json_data
+from src.modules.projects.models import Project, ProjectData, IngestionJob
+from src.modules.projects.normalized import store_normalized_data
+from src.modules.projects.projects import extract_docx_data
+from src.write_queue import write_queue
+
+logger = logging.getLogger(__name__)
+
+# Статусы задания на разбор заявки
+JOB_PENDING = 'pending'
+JOB_PROCESSING = 'processing'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+
+class ClaimedJob(NamedTuple):
+    id_job: int
+    project_id: int
+    attempts: int
+    docs_file_path: Optional[str]
+
+
+async def update_project_data(db: AsyncSession, project_id: int, json_data: dict):
+    """
+    Функция для обновления или создания данных проекта в базе данных.
+    Транзакцией управляет вызывающая сторона.
+    """
+    _, content_hash = serialize_json_data(json_data)
+
+    # Получаем проект по ID
+    project = (await db.execute(
+        select(Project).filter(Project.id_project == project_id)
+    )).scalar_one_or_none()
+
+    if project is None:
+        logger.warning(f"Проект с ID {project_id} не найден.")
+        return
+
+    # Получаем или создаем проектные данные
+    project_data = (await db.execute(
+        select(ProjectData).filter(ProjectData.project_id == project_id)
+    )).scalar_one_or_none()
+
+    if project_data is None:
+        project_data = ProjectData(project_id=project_id, json_data=json_data,
+                                   content_hash=content_hash, updated_at=datetime.utcnow())
+        db.add(project_data)
+        logger.info("Новые данные проекта добавлены.")
+    else:
+        project_data.json_data = json_data
+        project_data.content_hash = content_hash
+        project_data.updated_at = datetime.utcnow()
+        # Увеличение версии выполняется в UPDATE, поэтому параллельная правка ссылок на файлы
+        # со старой версией будет отклонена
+        project_data.version = ProjectData.version + 1
+        logger.info("Данные проекта обновлены.")
+    json_data_cache.invalidate(project_id)
+
+    # Разделы заявки дублируются в нормализованные таблицы для SQL-запросов
+    await store_normalized_data(db, [project_id], [json_data])
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def _init_worker_process():
+    # Разбор заявок не должен отнимать процессор у обработки API-запросов
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+
+class IngestionWorker:
+    """
+    Разбор загруженных заявок вне цикла событий.
+
+    Задания хранятся в таблице ingestion_jobs и создаются в одной транзакции с проектом,
+    поэтому переживают перезапуск. Обработчики забирают задания условным UPDATE
+    (pending -> processing), CPU-ёмкая часть выполняется в ограниченном пуле процессов
+    с пониженным приоритетом, а данные проекта и статус задания записываются одной транзакцией.
+    Неудачные попытки повторяются с экспоненциальной задержкой.
+    """
+
+    def __init__(self, max_workers: int, queue_size: int, max_attempts: int,
+                 retry_backoff_seconds: float, poll_interval_seconds: float):
+        self.max_workers = max_workers
+        self.queue_size = queue_size
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._consumers: List[asyncio.Task] = []
+
+    @property
+    def started(self) -> bool:
+        return self._wakeup is not None
+
+    def start(self):
+        """Запускает пул процессов и обработчиков заданий (вызывается внутри работающего цикла событий)."""
+        if self.started:
+            return
+        self._executor = self._create_executor()
+        self._executor_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        # Обработчиков столько же, сколько процессов: в пуле никогда не ждет больше заданий, чем он выполняет
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.max_workers)]
+        logger.info(f"Обработчик заявок запущен: процессов {self.max_workers}, очередь {self.queue_size}.")
+
+    async def stop(self):
+        """Останавливает обработчики и пул процессов. Незавершенные задания будут подхвачены при запуске."""
+        if not self.started:
+            return
+        for consumer in self._consumers:
+            consumer.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor, self._executor_lock, self._wakeup, self._consumers = None, None, None, []
+
+    async def recover(self):
+        """
+        Восстановление после сбоя: задания, прерванные на этапе обработки, возвращаются в очередь,
+        а для проектов без данных и без задания создаются новые задания.
+        """
+        now = datetime.utcnow()
+        async with async_session() as db:
+            async with db.begin():
+                interrupted = await db.execute(
+                    update(IngestionJob)
+                    .where(IngestionJob.status == JOB_PROCESSING)
+                    .values(status=JOB_PENDING, next_attempt_at=now, updated_at=now)
+                )
+                orphaned = (await db.execute(
+                    select(Project.id_project).where(
+                        ~exists().where(ProjectData.project_id == Project.id_project),
+                        ~exists().where(IngestionJob.project_id == Project.id_project)
+                    )
+                )).scalars().all()
+                db.add_all([
+                    IngestionJob(project_id=project_id, status=JOB_PENDING, next_attempt_at=now)
+                    for project_id in orphaned
+                ])
+
+        if interrupted.rowcount or orphaned:
+            logger.info(f"Восстановление очереди разбора: прерванных заданий {interrupted.rowcount}, "
+                        f"проектов без данных {len(orphaned)}.")
+            self._notify()
+
+    async def remaining_capacity(self, db: AsyncSession) -> int:
+        """Сколько заданий еще помещается в очередь разбора (ingest_queue_size минус незавершенные)."""
+        unfinished = (await db.execute(
+            select(func.count()).select_from(IngestionJob).where(
+                IngestionJob.status.in_([JOB_PENDING, JOB_PROCESSING])
+            )
+        )).scalar()
+        return max(self.queue_size - unfinished, 0)
+
+    async def has_capacity(self, db: AsyncSession) -> bool:
+        """Есть ли место в очереди разбора (незавершенных заданий меньше ingest_queue_size)."""
+        return await self.remaining_capacity(db) > 0
+
+    def submit(self, project_id: int):
+        """
+        Сообщает обработчикам о новом задании (само задание уже сохранено в базе).
+        Файл заявки обработчик читает с диска: содержимое загрузок в памяти не удерживается.
+        """
+        self.start()
+        self._notify()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker_process)
+
+    async def _replace_executor(self, failed: ProcessPoolExecutor):
+        """
+        Заменяет сломанный пул процессов (BrokenProcessPool) новым.
+
+        Ошибку получают все обработчики, задания которых были в пуле, но пул заменяется один раз:
+        только тот, кто первым увидел сломанный экземпляр, создает новый и останавливает старый.
+        """
+        async with self._executor_lock:
+            if self._executor is not failed:
+                return
+            self._executor = self._create_executor()
+        logger.warning("Пул процессов разбора заявок сломан и заменен новым.")
+        failed.shutdown(wait=False, cancel_futures=True)
+
+    def _notify(self):
+        if self.started:
+            self._wakeup.set()
+
+    async def _claim(self) -> Optional[ClaimedJob]:
+        """Атомарно забирает ближайшее готовое к обработке задание."""
+        now = datetime.utcnow()
+        async with async_session() as db:
+            while True:
+                candidate = (await db.execute(
+                    select(IngestionJob.id_job, IngestionJob.project_id, IngestionJob.attempts,
+                           Project.docs_file_path)
+                    .join(Project, Project.id_project == IngestionJob.project_id)
+                    .where(IngestionJob.status == JOB_PENDING, IngestionJob.next_attempt_at <= now)
+                    .order_by(IngestionJob.next_attempt_at, IngestionJob.id_job)
+                    .limit(1)
+                )).first()
+                if candidate is None:
+                    return None
+
+                # Условный UPDATE: если задание уже забрал другой обработчик, пробуем следующее
+                claimed = await db.execute(
+                    update(IngestionJob)
+                    .where(IngestionJob.id_job == candidate.id_job, IngestionJob.status == JOB_PENDING)
+                    .values(status=JOB_PROCESSING, attempts=IngestionJob.attempts + 1, updated_at=now)
+                )
+                await db.commit()
+                if claimed.rowcount == 1:
+                    return ClaimedJob(candidate.id_job, candidate.project_id, candidate.attempts + 1,
+                                      candidate.docs_file_path)
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logger.error(f"Ошибка получения задания на разбор заявки: {e}")
+                job = None
+
+            if job is None:
+                # Ждем нового задания или наступления времени повторной попытки
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            try:
+                if job.docs_file_path is None:
+                    raise FileNotFoundError("У проекта нет загруженного файла.")
+                content = await loop.run_in_executor(None, _read_file, job.docs_file_path)
+
+                # Повторно загруженный документ берется из кэша без разбора DOCX
+                cache_key = parse_cache.key(content)
+                json_data = parse_cache.get(cache_key)
+                if json_data is None:
+                    archive_path = job.docs_file_path if settings.keep_parse_artifacts else None
+                    # Пул запоминается: при BrokenProcessPool заменяется именно он
+                    executor = self._executor
+                    json_data = await loop.run_in_executor(
+                        executor, partial(extract_docx_data, content, archive_path, raise_errors=True)
+                    )
+                    parse_cache.put(cache_key, json_data)
+                else:
+                    logger.info(f"Заявка проекта {job.project_id} взята из кэша разбора ({parse_cache.stats()}).")
+                await self._complete(job, json_data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if isinstance(e, BrokenProcessPool):
+                    await self._replace_executor(executor)
+                await self._fail(job, e)
+
+    async def _complete(self, job: ClaimedJob, json_data: dict):
+        async def store(db: AsyncSession):
+            await update_project_data(db, job.project_id, json_data)
+            await db.execute(
+                update(IngestionJob)
+                .where(IngestionJob.id_job == job.id_job)
+                .values(status=JOB_DONE, last_error=None, updated_at=datetime.utcnow())
+            )
+
+        # Данные заявки и статус задания фиксируются вместе с другими записями через очередь записи
+        await write_queue.run(store)
+        logger.info(f"Заявка проекта {job.project_id} обработана.")
+
+    async def _fail(self, job: ClaimedJob, error: Exception):
+        now = datetime.utcnow()
+        if job.attempts >= self.max_attempts:
+            values = dict(status=JOB_FAILED)
+            logger.error(f"Заявка проекта {job.project_id} не обработана после {job.attempts} попыток: {error}")
+        else:
+            delay = self.retry_backoff_seconds * 2 ** (job.attempts - 1)
+            values = dict(status=JOB_PENDING, next_attempt_at=now + timedelta(seconds=delay))
+            logger.warning(f"Ошибка обработки заявки проекта {job.project_id} (попытка {job.attempts}), "
+                           f"повтор через {delay:.0f} с: {error}")
+
+        async def store(db: AsyncSession):
+            await db.execute(
+                update(IngestionJob)
+                .where(IngestionJob.id_job == job.id_job)
+                .values(last_error=str(error), updated_at=now, **values)
+            )
+
+        await write_queue.run(store)
+
+
+ingestion_worker = IngestionWorker(
+    max_workers=settings.ingest_max_workers,
+    queue_size=settings.ingest_queue_size,
+    max_attempts=settings.ingest_max_attempts,
+    retry_backoff_seconds=settings.ingest_retry_backoff_seconds,
+    poll_interval_seconds=settings.ingest_poll_interval_seconds
+)
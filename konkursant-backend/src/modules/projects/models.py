@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import Column, String, Integer, Text, Date, DateTime, Numeric, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from src.database import Base
 from sqlalchemy.sql import func
@@ -14,6 +14,10 @@ class Project(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     status = Column(String, default='Ожидает проверки', nullable=False)
+    # Регион из данных заявки (заполняется при разборе) — для фильтров и сводных запросов
+    region = Column(String, nullable=True, index=True)
+    # Запрашиваемая сумма — итог расходов заявки (NULL, пока заявка не разобрана); входит в сводку по регионам
+    budget = Column(Numeric(14, 2, asdecimal=False), nullable=True)
 
     docs_file_path = Column(String, nullable=True)
     json_file_path = Column(String, nullable=True)
@@ -22,6 +26,14 @@ class Project(Base):
     reviews = relationship("Review", back_populates="project")
 
     data = relationship("ProjectData", back_populates="project", uselist=False)
+    ingestion_job = relationship("IngestionJob", back_populates="project", uselist=False)
+
+    # Индексы для постраничного списка проектов: порядок (created_at, id_project) и фильтры по владельцу и статусу
+    __table_args__ = (
+        Index('ix_projects_created_at_id_project', 'created_at', 'id_project'),
+        Index('ix_projects_owner_id_created_at', 'owner_id', 'created_at', 'id_project'),
+        Index('ix_projects_status_created_at', 'status', 'created_at', 'id_project'),
+    )
 
 
 class ProjectData(Base):
@@ -30,6 +42,88 @@ class ProjectData(Base):
     id_data = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey('projects.id_project'), nullable=False)
     json_data = Column(JSON, nullable=False)
+    # SHA-256 сериализованных json_data (ETag ответа /json-data) и время последнего изменения данных
+    content_hash = Column(String(64), nullable=True)
+    updated_at = Column(DateTime(timezone=True), nullable=True)
+    # Версия данных для оптимистической блокировки: увеличивается при каждом изменении json_data
+    version = Column(Integer, default=1, server_default='1', nullable=False)
 
     project = relationship("Project", back_populates="data")
 
+
+class IngestionJob(Base):
+    __tablename__ = 'ingestion_jobs'
+
+    id_job = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey('projects.id_project'), nullable=False, unique=True)
+    # pending -> processing -> done; после исчерпания попыток — failed
+    status = Column(String, default='pending', nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    project = relationship("Project", back_populates="ingestion_job")
+
+    __table_args__ = (
+        Index('ix_ingestion_jobs_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+
+
+# Нормализованные данные заявки: строки разделов json_data, пригодные для SQL-запросов.
+# Заполняются при разборе заявки вместе с ProjectData (см. normalized.py)
+
+class ProjectExpense(Base):
+    __tablename__ = 'project_expenses'
+
+    id_expense = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey('projects.id_project'), nullable=False, index=True)
+    category = Column(String, nullable=True)
+    type = Column(String, nullable=True)
+    record = Column(String, nullable=True)  # «Запись № N»
+    title = Column(String, nullable=True)
+    description = Column(Text, nullable=True)
+    quantity = Column(Numeric(14, 2, asdecimal=False), nullable=True)
+    price = Column(Numeric(14, 2, asdecimal=False), nullable=True)
+    amount = Column(Numeric(14, 2, asdecimal=False), nullable=True)
+
+
+class ProjectCalendarEvent(Base):
+    __tablename__ = 'project_calendar_events'
+
+    id_event = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey('projects.id_project'), nullable=False, index=True)
+    task_number = Column(Integer, nullable=False)  # Порядковый номер задачи в календарном плане
+    task = Column(Text, nullable=True)
+    title = Column(String, nullable=True)
+    deadline = Column(Date, nullable=True)
+    description = Column(Text, nullable=True)
+    unique_participants = Column(Integer, nullable=True)
+    repeat_participants = Column(Integer, nullable=True)
+    publications = Column(Integer, nullable=True)
+    views = Column(Integer, nullable=True)
+    additional_info = Column(Text, nullable=True)
+
+
+class ProjectTeamMember(Base):
+    __tablename__ = 'project_team_members'
+
+    id_member = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey('projects.id_project'), nullable=False, index=True)
+    full_name = Column(String, nullable=True)
+    email = Column(String, nullable=True)
+    role = Column(Text, nullable=True)
+    competencies = Column(Text, nullable=True)  # По одной компетенции в строке
+
+
+class ProjectCofinancing(Base):
+    __tablename__ = 'project_cofinancing'
+
+    id_cofinancing = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey('projects.id_project'), nullable=False, index=True)
+    source = Column(String, nullable=False)  # own — собственные средства, partner — партнер
+    partner_name = Column(String, nullable=True)
+    support_type = Column(String, nullable=True)
+    expenses = Column(Text, nullable=True)
+    amount = Column(Numeric(14, 2, asdecimal=False), nullable=True)
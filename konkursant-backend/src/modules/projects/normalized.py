@@ -0,0 +1,207 @@
+import argparse
+import asyncio
+import logging
+import re
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from src.database import async_session
+from src.modules.projects.models import (
+    Project, ProjectData, ProjectExpense, ProjectCalendarEvent, ProjectTeamMember, ProjectCofinancing
+)
+from src.modules.statistics.rollups import apply_region_budgets
+
+logger = logging.getLogger(__name__)
+
+NORMALIZED_MODELS = (ProjectExpense, ProjectCalendarEvent, ProjectTeamMember, ProjectCofinancing)
+
+NUMBER_PATTERN = re.compile(r'-?\d+(?:[.,]\d+)?')
+
+
+def parse_amount(value: Any) -> Optional[float]:
+    """Число из строки заявки: «16 000,00 руб.» -> 16000.0, «Сумма: 805884» -> 805884.0."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return None
+    match = NUMBER_PATTERN.search(re.sub(r'(?<=\d)\s+(?=\d)', '', value))
+    return float(match.group().replace(',', '.')) if match else None
+
+
+def parse_int(value: Any) -> Optional[int]:
+    amount = parse_amount(value)
+    return int(amount) if amount is not None else None
+
+
+def parse_date(value: Any) -> Optional[date]:
+    try:
+        return datetime.strptime(value.strip(), '%d.%m.%Y').date()
+    except (AttributeError, ValueError):
+        return None
+
+
+def _text(value: Any) -> Optional[str]:
+    if isinstance(value, list):
+        value = "\n".join(str(item) for item in value if item)
+    return value or None
+
+
+def normalize_project_data(project_id: int, json_data: Dict[str, Any]) -> Dict[type, List[dict]]:
+    """Строки нормализованных таблиц из данных заявки."""
+    expenses = []
+    for category in json_data.get("Вкладка Расходы", {}).get("Категории", []):
+        for record in category.get("Записи", []):
+            expenses.append({
+                "project_id": project_id,
+                "category": category.get("Название") or None,
+                "type": category.get("Тип") or None,
+                "record": record.get("Идентификатор") or None,
+                "title": record.get("Заголовок") or None,
+                "description": record.get("Описание") or None,
+                "quantity": parse_amount(record.get("Количество")),
+                "price": parse_amount(record.get("Цена")),
+                "amount": parse_amount(record.get("Сумма")),
+            })
+
+    events = []
+    tasks = json_data.get("Вкладка Календарный план", {}).get("Блок Задачи", [])
+    for task_number, task in enumerate(tasks, start=1):
+        for event in task.get("Мероприятия", []):
+            events.append({
+                "project_id": project_id,
+                "task_number": task_number,
+                "task": task.get("Поставленная задача") or None,
+                "title": event.get("Название") or None,
+                "deadline": parse_date(event.get("Крайняя дата")),
+                "description": event.get("Описание") or None,
+                "unique_participants": parse_int(event.get("Количество уникальных участников")),
+                "repeat_participants": parse_int(event.get("Количество повторяющихся участников")),
+                "publications": parse_int(event.get("Количество публикаций")),
+                "views": parse_int(event.get("Количество просмотров")),
+                "additional_info": event.get("Дополнительная информация") or None,
+            })
+
+    team = [
+        {
+            "project_id": project_id,
+            "full_name": member.get("ФИО") or None,
+            "email": member.get("E-mail") or None,
+            "role": member.get("Роль в проекте") or None,
+            "competencies": _text(member.get("Компетенции")),
+        }
+        for member in json_data.get("Вкладка Команда", {}).get("Блок Команда", {}).get("Наставники", [])
+    ]
+
+    cofinancing = []
+    cofinancing_tab = json_data.get("Вкладка Софинансирование", {})
+    # В пустой структуре данных блок собственных средств — список, а не словарь
+    own_funding = cofinancing_tab.get("Блок Собственные средства") or {}
+    if isinstance(own_funding, dict) and own_funding.get("Сумма расходов"):
+        cofinancing.append({
+            "project_id": project_id,
+            "source": "own",
+            "partner_name": None,
+            "support_type": None,
+            "expenses": _text(own_funding.get("Перечень расходов")),
+            "amount": sum(parse_amount(amount) or 0 for amount in own_funding["Сумма расходов"]),
+        })
+    for partner in cofinancing_tab.get("Блок Партнер", []):
+        cofinancing.append({
+            "project_id": project_id,
+            "source": "partner",
+            "partner_name": partner.get("Название партнера") or None,
+            "support_type": partner.get("Тип поддержки") or None,
+            "expenses": partner.get("Перечень расходов") or None,
+            "amount": parse_amount(partner.get("Сумма, руб.")),
+        })
+
+    return {
+        ProjectExpense: expenses,
+        ProjectCalendarEvent: events,
+        ProjectTeamMember: team,
+        ProjectCofinancing: cofinancing,
+    }
+
+
+async def store_normalized_data(db: AsyncSession, project_ids: List[int], json_data_list: List[Dict[str, Any]]):
+    """
+    Заменяет нормализованные данные проектов, их регион и запрашиваемую сумму массовыми INSERT
+    и переносит вклад проектов в сводке по регионам. Транзакцией управляет вызывающая сторона.
+    """
+    previous = (await db.execute(
+        select(Project.region, Project.budget)
+        .where(Project.id_project.in_(project_ids), Project.budget.is_not(None))
+    )).all()
+    for model in NORMALIZED_MODELS:
+        await db.execute(delete(model).where(model.project_id.in_(project_ids)))
+
+    rows: Dict[type, List[dict]] = {model: [] for model in NORMALIZED_MODELS}
+    summaries = []
+    for project_id, json_data in zip(project_ids, json_data_list):
+        normalized = normalize_project_data(project_id, json_data)
+        for model, model_rows in normalized.items():
+            rows[model].extend(model_rows)
+        summaries.append({
+            "id_project": project_id,
+            "region": json_data.get("Регион проекта") or None,
+            "budget": round(sum(row["amount"] or 0 for row in normalized[ProjectExpense]), 2),
+        })
+
+    for model, model_rows in rows.items():
+        if model_rows:
+            await db.execute(insert(model), model_rows)
+    # UPDATE по первичному ключу пакетом (executemany)
+    await db.execute(update(Project), summaries)
+    await apply_region_budgets(db, [(row.region, row.budget) for row in previous],
+                               [(row["region"], row["budget"]) for row in summaries])
+
+
+async def delete_normalized_data(db: AsyncSession, project_id: int):
+    previous = (await db.execute(
+        select(Project.region, Project.budget)
+        .where(Project.id_project == project_id, Project.budget.is_not(None))
+    )).all()
+    for model in NORMALIZED_MODELS:
+        await db.execute(delete(model).where(model.project_id == project_id))
+    await apply_region_budgets(db, [(row.region, row.budget) for row in previous], [])
+
+
+async def backfill(batch_size: int = 200):
+    """Заполняет нормализованные таблицы по уже сохраненным данным всех проектов."""
+    processed = 0
+    last_id = 0
+    async with async_session() as db:
+        while True:
+            batch = (await db.execute(
+                select(ProjectData.project_id, ProjectData.json_data)
+                .where(ProjectData.project_id > last_id)
+                .order_by(ProjectData.project_id)
+                .limit(batch_size)
+            )).all()
+            if not batch:
+                break
+
+            await store_normalized_data(db, [row.project_id for row in batch], [row.json_data for row in batch])
+            await db.commit()
+            processed += len(batch)
+            last_id = batch[-1].project_id
+            logger.info(f"Нормализовано проектов: {processed}")
+
+    return processed
+
+
+if __name__ == "__main__":
+    # python -m src.modules.projects.normalized --batch-size 200
+    # Модели связанных модулей нужны для настройки отношений Project вне приложения
+    from src.modules.auth.models import User  # noqa: F401
+    from src.modules.review.models import Review  # noqa: F401
+
+    parser = argparse.ArgumentParser(description="Заполнение нормализованных таблиц данных заявок")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    print(f"Готово, обработано проектов: {asyncio.run(backfill(args.batch_size))}")
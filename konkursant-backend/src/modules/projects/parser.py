@@ -0,0 +1,146 @@
+import bisect
+from itertools import accumulate
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+
+class Span(NamedTuple):
+    """Диапазон строк документа [start, end)."""
+    start: int
+    end: int
+
+
+class DocumentIndex:
+    """
+    Однократная токенизация текста заявки.
+
+    Документ хранится одним буфером (строки, склеенные через "\\n", — ровно тот текст,
+    по которому работают регулярные выражения извлекателей), для каждой строки известно
+    её смещение в буфере. Вхождения заголовка ищутся в буфере один раз и кэшируются
+    в виде списка номеров строк, поэтому чтение любой секции стоит O(длина секции),
+    а не O(длина документа).
+
+    Заголовки и маркеры не должны начинаться или заканчиваться пробельными символами
+    и не должны содержать перевод строки.
+    """
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self.stripped = [line.strip() for line in lines]
+        self.buffer = "\n".join(lines)
+        # Смещение начала каждой строки в буфере (+1 — разделитель при склейке)
+        self.offsets = [0] + list(accumulate(len(line) + 1 for line in lines))[:-1] if lines else []
+        self._contains: Dict[str, List[int]] = {}
+        self._starts: Dict[Tuple[str, bool], List[int]] = {}
+
+    def __len__(self):
+        return len(self.lines)
+
+    def contains(self, marker: str) -> List[int]:
+        """Номера строк, в которых встречается маркер (по возрастанию)."""
+        hits = self._contains.get(marker)
+        if hits is None:
+            hits = []
+            buffer, offsets = self.buffer, self.offsets
+            position = buffer.find(marker)
+            while position != -1:
+                line_number = bisect.bisect_right(offsets, position) - 1
+                hits.append(line_number)
+                # Остальные вхождения в этой строке нас не интересуют
+                next_line = line_number + 1
+                if next_line >= len(offsets):
+                    break
+                position = buffer.find(marker, offsets[next_line])
+            self._contains[marker] = hits
+        return hits
+
+    def classify(self, markers: Sequence[str]) -> Dict[int, str]:
+        """
+        Номер строки -> первый (в порядке markers) маркер, который в ней встречается,
+        для всех строк, содержащих хотя бы один маркер; строки идут по возрастанию.
+
+        Заменяет цепочку if "маркер" in line / elif ... по каждой строке: вхождения каждого
+        маркера берутся из кэша contains, маркеры раньше по порядку перезаписывают более поздние.
+        """
+        classified = {}
+        for marker in reversed(markers):
+            for line_number in self.contains(marker):
+                classified[line_number] = marker
+        return dict(sorted(classified.items()))
+
+    def starts(self, header: str, raw: bool = True) -> List[int]:
+        """
+        Номера строк, начинающихся с заголовка.
+
+        - raw: сравнивать с исходной строкой (True) или с очищенной от пробелов (False).
+        """
+        key = (header, raw)
+        hits = self._starts.get(key)
+        if hits is None:
+            if raw:
+                hits = [i for i in self.contains(header) if self.buffer.startswith(header, self.offsets[i])]
+            else:
+                hits = [i for i in self.contains(header) if self.stripped[i].startswith(header)]
+            self._starts[key] = hits
+        return hits
+
+    def first(self, header: str, raw: bool = True, after: int = 0) -> Optional[int]:
+        """Номер первой строки не раньше after, начинающейся с заголовка."""
+        hits = self.starts(header, raw)
+        position = bisect.bisect_left(hits, after)
+        return hits[position] if position < len(hits) else None
+
+    def hits(self, *markers: str) -> List[int]:
+        """Отсортированные номера строк, содержащих хотя бы один из маркеров."""
+        if len(markers) == 1:
+            return self.contains(markers[0])
+        return sorted(set().union(*(self.contains(marker) for marker in markers)))
+
+    def section(self, start_headers: Union[str, Sequence[str]], end_header: Optional[str] = None,
+                after: int = 0) -> Optional[Span]:
+        """
+        Диапазон строк после первого начального заголовка (не раньше строки after)
+        и до ближайшего конечного заголовка либо до конца документа.
+
+        Если конечный заголовок встречается раньше начального, секция считается пустой.
+        """
+        if isinstance(start_headers, str):
+            start_headers = [start_headers]
+
+        starts = [self.first(header, after=after) for header in start_headers]
+        starts = [line_number for line_number in starts if line_number is not None]
+        if not starts:
+            return None
+        start = min(starts) + 1
+
+        end = len(self.lines)
+        if end_header:
+            # Конечный заголовок, встреченный раньше начального, означает пустую секцию
+            preceding_end = self.first(end_header, after=after)
+            if preceding_end is not None and preceding_end < start - 1:
+                return None
+
+            end_hits = self.starts(end_header)
+            for line_number in end_hits[bisect.bisect_left(end_hits, start):]:
+                # Строка, повторно начинающаяся с начального заголовка, сбор не прерывает
+                if not any(self.buffer.startswith(header, self.offsets[line_number]) for header in start_headers):
+                    end = line_number
+                    break
+        return Span(start, end)
+
+    def between(self, start_headers: Union[str, Sequence[str]], end_header: Optional[str] = None,
+                after: int = 0) -> List[str]:
+        """Непустые очищенные строки секции без повторов начального заголовка."""
+        if isinstance(start_headers, str):
+            start_headers = [start_headers]
+
+        span = self.section(start_headers, end_header, after)
+        if span is None:
+            return []
+
+        skipped = set()
+        for header in start_headers:
+            hits = self.starts(header)
+            skipped.update(hits[bisect.bisect_left(hits, span.start):bisect.bisect_left(hits, span.end)])
+
+        stripped = self.stripped
+        return [stripped[i] for i in range(span.start, span.end) if stripped[i] and i not in skipped]
@@ -1,8 +1,172 @@
+import io
 import json
+import logging
 import re
 import os
-from docx import Document
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional, Tuple, Union, BinaryIO
+
+from src.modules.projects.docx_reader import Table, iter_blocks, iter_paragraphs
+from src.modules.projects.parser import DocumentIndex
+
+logger = logging.getLogger(__name__)
+
+# Версия формата извлекаемых данных: увеличивается при любом изменении результата разбора,
+# чтобы кэш разобранных заявок не отдавал данные, полученные прежней версией разборщика
+PARSER_VERSION = 3
+
+# Заголовки, значение которых записано в той же строке (порядок важен: проверяются как if/elif)
+INLINE_FIELDS = ("ФИО:", "Название проекта:", "Регион проекта:", "Логотип проекта:", "Контакты:")
+
+# Многострочные поля: (начальный заголовок, конечный заголовок, путь в структуре данных).
+# Внутри одной группы заголовки проверяются как if/elif
+BLOCK_FIELDS = (
+    (
+        ("Масштаб реализации проекта:", "Дата начала и окончания проекта:",
+         ("Вкладка Общее", "Блок Общая информация", "Масштаб реализации проекта")),
+        ("Дата начала и окончания проекта:", 'Блок "Дополнительная информация об авторе проекта"',
+         ("Вкладка Общее", "Блок Общая информация", "Дата начала и окончания проекта")),
+    ),
+    (
+        ("Опыт автора проекта:", "Описание функционала автора проекта:",
+         ("Вкладка Общее", "Блок Дополнительная информация об авторе проекта", "Опыт автора проекта")),
+        ("Описание функционала автора проекта:", "Адрес регистрации автора проекта:",
+         ("Вкладка Общее", "Блок Дополнительная информация об авторе проекта", "Описание функционала автора проекта")),
+        ("Адрес регистрации автора проекта:", "Добавить резюме:",
+         ("Вкладка Общее", "Блок Дополнительная информация об авторе проекта", "Адрес регистрации автора проекта")),
+        ("Видео-визитка (ссылка на ролик на любом видеохостинге):", 'Вкладка "О проекте"',
+         ("Вкладка Общее", "Блок Дополнительная информация об авторе проекта", "Видео-визитка")),
+    ),
+    (
+        ("Краткая информация о проекте:", "Описание проблемы, решению/снижению которой посвящен проект:",
+         ("Вкладка О проекте", "Блок Информация о проекте", "Краткая информация о проекте")),
+        ("Описание проблемы, решению/снижению которой посвящен проект:",
+         "Основные целевые группы, на которые направлен проект:",
+         ("Вкладка О проекте", "Блок Информация о проекте", "Описание проблемы")),
+        ("Основные целевые группы, на которые направлен проект:", "Основная цель проекта:",
+         ("Вкладка О проекте", "Блок Информация о проекте", "Основные целевые группы")),
+        ("Основная цель проекта:", "Опыт успешной реализации проекта:",
+         ("Вкладка О проекте", "Блок Информация о проекте", "Основная цель проекта")),
+        ("Опыт успешной реализации проекта:", "Перспектива развития и потенциал проекта:",
+         ("Вкладка О проекте", "Блок Информация о проекте", "Опыт успешной реализации проекта")),
+        ("Перспектива развития и потенциал проекта:", 'Блок "Задачи"',
+         ("Вкладка О проекте", "Блок Информация о проекте", "Перспектива развития и потенциал проекта")),
+    ),
+)
+
+CALENDAR_MARKERS = (
+    "Поставленная задача:",
+    "Название мероприятия:",
+    "Крайняя дата выполнения:",
+    "Описание мероприятия:",
+    "Количество уникальных участников:",
+    "Количество повторяющихся участников:",
+    "Количество публикаций:",
+    "Количество просмотров:",
+    "Дополнительная информация:",
+)
+
+# Поля мероприятия календарного плана: маркер -> ключ в данных мероприятия
+CALENDAR_EVENT_FIELDS = {
+    "Крайняя дата выполнения:": "Крайняя дата",
+    "Описание мероприятия:": "Описание",
+    "Количество уникальных участников:": "Количество уникальных участников",
+    "Количество повторяющихся участников:": "Количество повторяющихся участников",
+    "Количество публикаций:": "Количество публикаций",
+    "Количество просмотров:": "Количество просмотров",
+    "Дополнительная информация:": "Дополнительная информация",
+}
+
+# Поля наставника, следующие за строкой "ФИО наставника:" (порядок важен: проверяются как if/elif)
+TEAM_COMPETENCIES = "Компетенции, опыт, подтверждающие возможность участника выполнять роль в команде:"
+TEAM_FIELDS = {
+    "E-mail наставника:": "E-mail",
+    "Роль в проекте:": "Роль в проекте",
+    "Добавить резюме:": "Добавить резюме",
+    TEAM_COMPETENCIES: "Компетенции",
+}
+
+# Строки раздела расходов распознаются одним сопоставлением с началом строки; имя группы — обработчик
+EXPENSE_LINE_PATTERN = re.compile(
+    r'(?P<tab>Вкладка "Расходы")|(?P<total>Общая сумма расходов:)|Категория "(?P<category>.*)"'
+    r'|Тип "(?P<type>.*)"|(?P<record>Запись № \d+)'
+)
+# Поля записи расходов: заголовок -> ключ в данных записи
+RECORD_FIELD_PATTERN = re.compile(r'(?:Название|Описание|Количество|Цена|Сумма):')
+RECORD_FIELDS = {
+    "Название:": "Заголовок",
+    "Описание:": "Описание",
+    "Количество:": "Количество",
+    "Цена:": "Цена",
+    "Сумма:": "Сумма",
+}
+# Таблицы с записями расходов и наставниками распознаются по строке заголовков:
+# заголовок столбца (без двоеточия, в нижнем регистре) -> ключ в данных записи
+EXPENSE_TABLE_COLUMNS = {
+    "№": "Идентификатор",
+    "название": "Заголовок",
+    "наименование": "Заголовок",
+    "описание": "Описание",
+    "количество": "Количество",
+    "цена": "Цена",
+    "сумма": "Сумма",
+}
+TEAM_TABLE_COLUMNS = {
+    "фио": "ФИО",
+    "фио наставника": "ФИО",
+    "e-mail": "E-mail",
+    "e-mail наставника": "E-mail",
+    "email": "E-mail",
+    "роль": "Роль в проекте",
+    "роль в проекте": "Роль в проекте",
+    "резюме": "Добавить резюме",
+    "добавить резюме": "Добавить резюме",
+    "компетенции": "Компетенции",
+}
+NUMBER_PATTERN = re.compile(r'\d{1,2}\.\d{1,2}\.\d{4}|\d+')
+OWN_FUNDING_PATTERN = re.compile(
+    r'Блок "Собственные средства".*?Перечень расходов:(.*?)Сумма, руб.:\s*(\d+)', re.DOTALL
+)
+PARTNER_PATTERN = re.compile(
+    r'Название партнера:\s*(.+?)\nТип поддержки:\s*(.+?)\nПеречень расходов:\s*(.+?)\nСумма, руб\.: (\d+)',
+    re.DOTALL
+)
+ADDITIONAL_FILE_PATTERN = re.compile(r'Описание файла:\s*(.+?)\nВыберете файл:\s*(\S+)', re.DOTALL)
+
+
+def cell_text(value: str) -> str:
+    """Значение ячейки одной строкой: абзацы ячейки склеиваются через пробел."""
+    return " ".join(part.strip() for part in value.splitlines() if part.strip())
+
+
+def table_records(table: Table, columns: Dict[str, str], required: str) -> Optional[List[Dict[str, str]]]:
+    """
+    Строки таблицы как словари "ключ -> текст ячейки" по известным столбцам columns.
+
+    Первая строка таблицы — заголовки столбцов. Если среди них нет столбца required
+    или известных столбцов меньше двух, таблица считается не относящейся к разделу (None).
+    Пустые строки таблицы пропускаются.
+    """
+    if not table.rows:
+        return None
+
+    keys = []
+    for header in table.rows[0]:
+        name = cell_text(header).rstrip(":").strip().lower()
+        # Длинные заголовки с пояснением ("Компетенции, опыт, ...") сопоставляются по первой части
+        keys.append(columns.get(name) or columns.get(name.split(",")[0]))
+    known = [key for key in keys if key is not None]
+    if required not in known or len(known) < 2:
+        return None
+
+    records = []
+    for row in table.rows[1:]:
+        record = {key: value for key, value in zip(keys, row) if key is not None}
+        if any(value.strip() for value in record.values()):
+            records.append(record)
+    return records
+
+
 class DocxConverter:
     def __init__(self, docx_filepath, txt_filepath):
         self.docx_filepath = docx_filepath
@@ -12,19 +176,77 @@ class DocxConverter:
 
     def convert_to_txt(self):
         try:
-            document = Document(self.docx_filepath)
             with open(self.txt_filepath, 'w', encoding='utf-8') as txt_file:
-                for paragraph in document.paragraphs:
-                    txt_file.write(paragraph.text + '\n')
+                for text in iter_paragraphs(self.docx_filepath):
+                    txt_file.write(text + '\n')
             print(f"Файл '{self.txt_filepath}' успешно создан.")
         except Exception as e:
             print(f"Ошибка при конвертации DOCX в TXT: {e}")
 
+    @staticmethod
+    def read_lines(source: Union[str, bytes, BinaryIO]) -> List[str]:
+        """
+        Читает абзацы DOCX в память (потоково, без объектной модели python-docx).
+
+        Строки совпадают с теми, что DataExtractor прочитал бы из TXT-файла, созданного convert_to_txt
+        (включая перевод строк внутри абзаца и универсальные переводы строк).
+
+        - source: путь к файлу, содержимое файла (bytes) или файловый объект.
+        """
+        return DocxConverter.read_document(source)[0]
+
+    @staticmethod
+    def read_document(source: Union[str, bytes, BinaryIO]) -> Tuple[List[str], List[Table]]:
+        """
+        Строки абзацев (как read_lines) и таблицы документа.
+
+        Для каждой таблицы запоминается номер строки, перед которой она стоит в документе,
+        чтобы извлекатели могли отнести ее строки к нужному разделу.
+        """
+        lines = []
+        tables = []
+        for block in iter_blocks(source):
+            if isinstance(block, Table):
+                tables.append(block._replace(line=len(lines)))
+            elif "\n" in block or "\r" in block:
+                # Перевод строки внутри абзаца делит его на строки так же, как чтение TXT-файла
+                lines.extend(io.StringIO(block + '\n', newline=None).readlines())
+            else:
+                lines.append(block + '\n')
+        return lines, tables
+
 
 class DataExtractor:
-    def __init__(self, txt_filepath):
+    # Этапы разбора в порядке выполнения: (имя этапа, метод, вкладка с результатом метода).
+    # Вкладка None — метод сам заполняет поля self.data
+    STAGES = (
+        ("inline_fields", "extract_inline_fields", None),
+        ("block_fields", "extract_block_fields", None),
+        ("tasks_and_geography", "extract_tasks_and_geography", None),
+        ("results", "result_extraction", "Вкладка Результаты"),
+        ("calendar_plan", "extract_calendar_plan", "Вкладка Календарный план"),
+        ("media", "extract_media", "Вкладка Медиа"),
+        ("expenses", "extract_expenses", "Вкладка Расходы"),
+        ("cofinancing", "extract_cofinancing", "Вкладка Софинансирование"),
+        ("additional_files", "extraction_additional_files", "Вкладка Доп. Файлы"),
+        ("team", "extract_team_members", "Вкладка Команда"),
+    )
+
+    def __init__(self, txt_filepath=None, lines: Optional[List[str]] = None, tables: Optional[List[Table]] = None):
         self.txt_filepath = txt_filepath
+        self.lines = lines
+        # Таблицы документа (в TXT-файле их нет, поэтому только при разборе DOCX)
+        self.tables = tables or []
         self.data = self.initialize_data_structure()
+        # Время этапов разбора последнего документа, мс: этап -> время
+        self.timings: Dict[str, float] = {}
+
+    def _timed(self, stage: str, extractor, *args):
+        started = time.perf_counter()
+        try:
+            return extractor(*args)
+        finally:
+            self.timings[stage] = (time.perf_counter() - started) * 1000
 
     @staticmethod
     def initialize_data_structure():
@@ -120,129 +342,69 @@ class DataExtractor:
 
     def extract_data(self):
         try:
-            with open(self.txt_filepath, 'r', encoding='utf-8') as file:
-                lines = file.readlines()
-
-            for i, line in enumerate(lines):
-                line = line.strip()
-                if not line:
-                    continue
-
-                # Extracting values based on headers
-                if "ФИО:" in line:
-                    self.data["ФИО"] = line.split("ФИО:")[1].strip()
-                elif "Название проекта:" in line:
-                    self.data["Название проекта"] = line.split("Название проекта:")[1].strip()
-                elif "Регион проекта:" in line:
-                    self.data["Регион проекта"] = line.split("Регион проекта:")[1].strip()
-                elif "Логотип проекта:" in line:
-                    self.data["Логотип проекта"] = line.split("Логотип проекта:")[1].strip()
-                elif "Контакты:" in line:
-                    contacts = line.split("Контакты:")[1].strip().split(", ")
-                    if len(contacts) > 0:
-                        self.data["Контакты"]["Телефон"] = contacts[0]
-                    if len(contacts) > 1:
-                        self.data["Контакты"]["Email"] = contacts[1]
-
-                # Extracting data between headers
-                if "Масштаб реализации проекта:" in line:
-                    self.data["Вкладка Общее"]["Блок Общая информация"]["Масштаб реализации проекта"] = \
-                        self.extract_between_headers(lines[i:], "Масштаб реализации проекта:",
-                                                     "Дата начала и окончания проекта:")
-                elif "Дата начала и окончания проекта:" in line:
-
-                    self.data["Вкладка Общее"]["Блок Общая информация"]["Дата начала и окончания проекта"] = \
-                        self.extract_between_headers(lines[i:], "Дата начала и окончания проекта:",
-                                                     'Блок "Дополнительная информация об авторе проекта"')
-                print(line)
-                if "Опыт автора проекта:" in line:
-                    self.data["Вкладка Общее"]["Блок Дополнительная информация об авторе проекта"][
-                        "Опыт автора проекта"] = \
-                        self.extract_between_headers(lines[i:], 'Опыт автора проекта:',
-                                                     "Описание функционала автора проекта:")
-                elif "Описание функционала автора проекта:" in line:
-                    self.data["Вкладка Общее"]["Блок Дополнительная информация об авторе проекта"][
-                        "Описание функционала автора проекта"] = \
-                        self.extract_between_headers(lines[i:], "Описание функционала автора проекта:",
-                                                     "Адрес регистрации автора проекта:")
-                elif "Адрес регистрации автора проекта:" in line:
-                    self.data["Вкладка Общее"]["Блок Дополнительная информация об авторе проекта"][
-                        "Адрес регистрации автора проекта"] = \
-                        self.extract_between_headers(lines[i:], "Адрес регистрации автора проекта:", "Добавить резюме:")
-                elif "Видео-визитка (ссылка на ролик на любом видеохостинге):" in line:
-                    self.data["Вкладка Общее"]["Блок Дополнительная информация об авторе проекта"]["Видео-визитка"] = \
-                        self.extract_between_headers(lines[i:],
-                                                     "Видео-визитка (ссылка на ролик на любом видеохостинге):",
-                                                     'Вкладка "О проекте"')
-
-                if "Краткая информация о проекте:" in line:
-                    self.data["Вкладка О проекте"]["Блок Информация о проекте"]["Краткая информация о проекте"] = \
-                        self.extract_between_headers(lines[i:], "Краткая информация о проекте:",
-                                                     "Описание проблемы, решению/снижению которой посвящен проект:")
-                elif "Описание проблемы, решению/снижению которой посвящен проект:" in line:
-                    self.data["Вкладка О проекте"]["Блок Информация о проекте"]["Описание проблемы"] = \
-                        self.extract_between_headers(lines[i:],
-                                                     "Описание проблемы, решению/снижению которой посвящен проект:",
-                                                     "Основные целевые группы, на которые направлен проект:")
-                elif "Основные целевые группы, на которые направлен проект:" in line:
-                    self.data["Вкладка О проекте"]["Блок Информация о проекте"]["Основные целевые группы"] = \
-                        self.extract_between_headers(lines[i:], "Основные целевые группы, на которые направлен проект:",
-                                                     "Основная цель проекта:")
-                elif "Основная цель проекта:" in line:
-                    self.data["Вкладка О проекте"]["Блок Информация о проекте"]["Основная цель проекта"] = \
-                        self.extract_between_headers(lines[i:], "Основная цель проекта:",
-                                                     "Опыт успешной реализации проекта:")
-                elif "Опыт успешной реализации проекта:" in line:
-                    self.data["Вкладка О проекте"]["Блок Информация о проекте"]["Опыт успешной реализации проекта"] = \
-                        self.extract_between_headers(lines[i:], "Опыт успешной реализации проекта:",
-                                                     "Перспектива развития и потенциал проекта:")
-                elif "Перспектива развития и потенциал проекта:" in line:
-                    self.data["Вкладка О проекте"]["Блок Информация о проекте"][
-                        "Перспектива развития и потенциал проекта"] = \
-                        self.extract_between_headers(lines[i:], "Перспектива развития и потенциал проекта:",
-                                                     'Блок "Задачи"')
-
-                if "Поставленная задача:" in line:
-                    task = line.split("Поставленная задача:")[1].strip()
-                    if task not in self.data["Вкладка О проекте"]["Блок Задачи"]:
-                        self.data["Вкладка О проекте"]["Блок Задачи"].append(task)
-
-                if "Выберите регион или федеральный округ:" in line:
-                    region = line.split("Выберите регион или федеральный округ:")[1].strip()
-                    address_line = lines[i + 1].strip() if i + 1 < len(lines) else ""
-                    address = address_line.split("Адрес:")[1].strip() if "Адрес:" in address_line else ""
-                    self.data["Вкладка О проекте"]["Блок География проекта"].append({
-                        "Регион": region,
-                        "Адрес": address
-                    })
-
-
-
-                if "Социальный эффект:" in line:
-                    self.data["Вкладка Результаты"]["Социальный эффект"] = \
-                        self.extract_between_headers(lines[i:], "Социальный эффект:", 'Вкладка "Календарный план"')
-
-                if "Файл с подробным медиа-планом:" in line:
-                    self.data["Вкладка Медиа"]["Файл с подробным медиа-планом:"] = \
-                        self.extract_between_headers(lines[i:], "Файл с подробным медиа-планом:", 'Вкладка "Расходы"')
-
-            self.data["Вкладка Результаты"] = self.result_extraction(lines)
-            self.data["Вкладка Календарный план"] = self.extract_calendar_plan(lines)
-            self.data["Вкладка Медиа"] = self.extract_media(lines)
-            self.data["Вкладка Расходы"] = self.extract_expenses(lines)
-            self.data["Вкладка Софинансирование"] = self.extract_cofinancing(lines)
-            self.data["Вкладка Доп. Файлы"] = self.extraction_additional_files(lines)
-            self.data["Вкладка Команда"] = self.extract_team_members(lines)
-
+            if self.lines is not None:
+                lines = self.lines
+            else:
+                with open(self.txt_filepath, 'r', encoding='utf-8') as file:
+                    lines = file.readlines()
 
+            # Документ токенизируется один раз, дальше все извлекатели читают свои секции из индекса
+            index = self._timed("index", DocumentIndex, lines)
 
+            for stage, method, tab in self.STAGES:
+                result = self._timed(stage, getattr(self, method), index)
+                if tab is not None:
+                    self.data[tab] = result
 
         except Exception as e:
             print(f"Ошибка при извлечении данных: {e}")
 
         return self.data
 
-    def extract_team_members(self, lines):
+    def extract_inline_fields(self, index: DocumentIndex):
+        # Значения, записанные в той же строке, что и заголовок; порядок проверки как в цепочке if/elif
+        for i, header in index.classify(INLINE_FIELDS).items():
+            line = index.stripped[i]
+
+            if header == "Контакты:":
+                contacts = line.split("Контакты:")[1].strip().split(", ")
+                if len(contacts) > 0:
+                    self.data["Контакты"]["Телефон"] = contacts[0]
+                if len(contacts) > 1:
+                    self.data["Контакты"]["Email"] = contacts[1]
+            else:
+                self.data[header[:-1]] = line.split(header)[1].strip()
+
+    def extract_block_fields(self, index: DocumentIndex):
+        # Многострочные значения между заголовками. Побеждает последнее вхождение заголовка,
+        # поэтому секция вычисляется один раз — от последней строки, где сработал заголовок
+        for chain in BLOCK_FIELDS:
+            headers = [header for header, _, _ in chain]
+            last_match = {header: i for i, header in index.classify(headers).items()}
+
+            for header, end_header, (tab, block, field) in chain:
+                if header in last_match:
+                    self.data[tab][block][field] = index.between(header, end_header, after=last_match[header])
+
+    def extract_tasks_and_geography(self, index: DocumentIndex):
+        tasks = self.data["Вкладка О проекте"]["Блок Задачи"]
+        seen_tasks = set(tasks)
+        for i in index.contains("Поставленная задача:"):
+            task = index.stripped[i].split("Поставленная задача:")[1].strip()
+            if task not in seen_tasks:
+                seen_tasks.add(task)
+                tasks.append(task)
+
+        for i in index.contains("Выберите регион или федеральный округ:"):
+            region = index.stripped[i].split("Выберите регион или федеральный округ:")[1].strip()
+            address_line = index.stripped[i + 1] if i + 1 < len(index) else ""
+            address = address_line.split("Адрес:")[1].strip() if "Адрес:" in address_line else ""
+            self.data["Вкладка О проекте"]["Блок География проекта"].append({
+                "Регион": region,
+                "Адрес": address
+            })
+
+    def extract_team_members(self, index: DocumentIndex):
         # Инициализация данных команды
         team_data = {
                 "Блок Команда": {
@@ -250,55 +412,73 @@ class DataExtractor:
                 }
             }
 
-        # Перебор строк для поиска данных о наставниках
-        for i, line in enumerate(lines):
-            line = line.strip()  # Удаляем лишние пробелы
-            # Проверяем наличие строки о наставнике
-            if "ФИО наставника:" in line:
-                # Создаем словарь для хранения информации о наставнике
-                mentor_info = {
-                    "ФИО": line.split("ФИО наставника:")[1].strip(),  # Извлечение ФИО
-                    "E-mail": "",  # Изначально пусто
-                    "Роль в проекте": "",  # Изначально пусто
-                    "Добавить резюме": "",  # Изначально пусто
-                    "Компетенции": []  # Изменяем на список для хранения всех компетенций
-                }
+        lines = index.stripped
+        # Строки с полями наставника размечаются один раз для всего документа
+        team_fields = index.classify(tuple(TEAM_FIELDS))
+        # Наставники из текста и из таблиц в порядке документа: (номер строки, 0 — таблица перед строкой
+        # или 1 — сама строка, наставник)
+        mentors = []
+
+        # Перебор строк с данными о наставниках
+        for i in index.contains("ФИО наставника:"):
+            line = lines[i]
+            # Создаем словарь для хранения информации о наставнике
+            mentor_info = {
+                "ФИО": line.split("ФИО наставника:")[1].strip(),  # Извлечение ФИО
+                "E-mail": "",  # Изначально пусто
+                "Роль в проекте": "",  # Изначально пусто
+                "Добавить резюме": "",  # Изначально пусто
+                "Компетенции": []  # Изменяем на список для хранения всех компетенций
+            }
 
-                # Ищем следующую строку, чтобы получить дополнительные данные о наставнике
-                for j in range(i + 1, len(lines)):
-                    next_line = lines[j].strip()  # Следующая строка без лишних пробелов
-
-                    if "E-mail наставника:" in next_line:
-                        mentor_info["E-mail"] = next_line.split("E-mail наставника:")[1].strip()
-                    elif "Роль в проекте:" in next_line:
-                        mentor_info["Роль в проекте"] = next_line.split("Роль в проекте:")[1].strip()
-                    elif "Добавить резюме:" in next_line:
-                        mentor_info["Добавить резюме"] = next_line.split("Добавить резюме:")[1].strip()
-                    elif "Компетенции, опыт, подтверждающие возможность участника выполнять роль в команде:" in next_line:
-                        # Сбор всех компетенций, пока не встретим пустую строку
-                        competencies = next_line.split(
-                            "Компетенции, опыт, подтверждающие возможность участника выполнять роль в команде:")[
-                            1].strip()
-                        mentor_info["Компетенции"].append(competencies)
-
-                        # Собираем все последующие строки, которые также относятся к компетенциям
-                        for k in range(j + 1, len(lines)):
-                            next_competency_line = lines[k].strip()
-                            if next_competency_line == "":
-                                break
-                            mentor_info["Компетенции"].append(next_competency_line)
-                    # Если встретили пустую строку или не соответствующую строку, выходим из цикла
-                    elif next_line == "":
-                        break
-                    else:
-                        break
-
-                # Добавляем информацию о наставнике в структуру данных
-                team_data["Блок Команда"]["Наставники"].append(mentor_info)
+            # Ищем следующую строку, чтобы получить дополнительные данные о наставнике
+            for j in range(i + 1, len(lines)):
+                field = team_fields.get(j)
+                # Если встретили пустую строку или строку без поля наставника, выходим из цикла
+                if field is None:
+                    break
+
+                next_line = lines[j]  # Следующая строка без лишних пробелов
+                value = next_line.split(field)[1].strip()
+                if field != TEAM_COMPETENCIES:
+                    mentor_info[TEAM_FIELDS[field]] = value
+                else:
+                    # Сбор всех компетенций, пока не встретим пустую строку
+                    mentor_info["Компетенции"].append(value)
+
+                    # Собираем все последующие строки, которые также относятся к компетенциям
+                    for k in range(j + 1, len(lines)):
+                        next_competency_line = lines[k]
+                        if next_competency_line == "":
+                            break
+                        mentor_info["Компетенции"].append(next_competency_line)
+
+            mentors.append((i, 1, mentor_info))
+
+        # Таблица наставников: строка таблицы — наставник. Таблицы с ФИО есть и в других разделах
+        # (контакты, партнеры), поэтому учитываются только таблицы вкладки "Команда"
+        team_tables = []
+        team_start = index.first('Вкладка "Команда"', raw=False)
+        if team_start is not None:
+            team_end = index.first('Вкладка "', raw=False, after=team_start + 1) or len(lines)
+            team_tables = [table for table in self.tables if team_start < table.line <= team_end]
+        for table in team_tables:
+            for row in table_records(table, TEAM_TABLE_COLUMNS, required="ФИО") or []:
+                mentors.append((table.line, 0, {
+                    "ФИО": cell_text(row.get("ФИО", "")),
+                    "E-mail": cell_text(row.get("E-mail", "")),
+                    "Роль в проекте": cell_text(row.get("Роль в проекте", "")),
+                    "Добавить резюме": cell_text(row.get("Добавить резюме", "")),
+                    "Компетенции": [part.strip() for part in row.get("Компетенции", "").splitlines() if part.strip()]
+                }))
+
+        # Добавляем информацию о наставниках в структуру данных
+        mentors.sort(key=lambda mentor: mentor[:2])
+        team_data["Блок Команда"]["Наставники"] = [mentor_info for _, _, mentor_info in mentors]
 
         return team_data
 
-    def extract_expenses(self, lines: List[str]) -> Dict[str, Any]:
+    def extract_expenses(self, index: DocumentIndex) -> Dict[str, Any]:
         expenses_data = {
             "Общая сумма расходов:": "",
             "Категории": []
@@ -308,46 +488,63 @@ class DataExtractor:
         current_category = {}
         current_records = []
 
-        is_expense_section = False  # Флаг для отслеживания начала раздела расходов
+        lines = index.stripped
+
+        # Раздел расходов начинается с первого заголовка вкладки и идет до конца документа
+        section_start = index.first('Вкладка "Расходы"', raw=False)
+        if section_start is None:
+            section_start = len(lines)
+
+        # Таблицы записей раздела: номер строки, перед которой стоит таблица -> строки таблиц
+        record_tables: Dict[int, List[Dict[str, str]]] = {}
+        for table in self.tables:
+            if table.line > section_start:
+                rows = table_records(table, EXPENSE_TABLE_COLUMNS, required="Заголовок")
+                if rows:
+                    record_tables.setdefault(table.line, []).extend(rows)
+
+        match_line = EXPENSE_LINE_PATTERN.match
+        for i in range(section_start + 1, len(lines) + 1):
+            if i in record_tables:
+                # Записи из таблицы относятся к категории, начатой перед таблицей
+                current_records.extend(self.table_expense_records(record_tables[i], len(current_records)))
+            if i == len(lines):
+                break
 
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if line.startswith('Вкладка "Расходы"'):
-                is_expense_section = True
+            # Одно сопоставление вместо проверки каждого вида строки по очереди
+            line_match = match_line(lines[i])
+            if line_match is None:
                 continue
+            kind = line_match.lastgroup
 
-            if not is_expense_section:
+            if kind == "tab":
                 continue
 
-            if line.startswith('Общая сумма расходов:'):
+            if kind == "total":
                 if i + 1 < len(lines):
-                    expenses_data["Общая сумма расходов:"] = lines[i + 1].strip()
+                    expenses_data["Общая сумма расходов:"] = lines[i + 1]
                 continue
 
-            category_match = re.match(r'Категория "(.*)"', line)
-            if category_match:
+            if kind == "category":
                 # Если это новая категория, добавляем предыдущую в список
-                if current_category:
-                    current_category["Записи"] = current_records
-                    categories.append(current_category)
+                if current_category or current_records:
+                    categories.append(self.expense_category(current_category, current_records))
 
                 current_category = {
-                    "Название": category_match.group(1),
+                    "Название": line_match.group("category"),
                     "Тип": "",
                     "Записи": []
                 }
                 current_records = []
                 continue
 
-            type_match = re.match(r'Тип "(.*)"', line)
-            if type_match:
-                current_category["Тип"] = type_match.group(1)
+            if kind == "type":
+                current_category["Тип"] = line_match.group("type")
                 continue
 
-            record_match = re.match(r'Запись № \d+', line)
-            if record_match:
+            if kind == "record":
                 record = {
-                    "Идентификатор": record_match.group(0),
+                    "Идентификатор": line_match.group("record"),
                     "Заголовок": "",
                     "Описание": "",
                     "Количество": "",
@@ -358,31 +555,54 @@ class DataExtractor:
                 if i + 1 < len(lines):
                     for j in range(1, 6):
                         if i + j < len(lines):
-                            next_line = lines[i + j].strip()
-                            if next_line.startswith("Название:"):
-                                record["Заголовок"] = next_line.replace("Название:", "").strip()
-                            elif next_line.startswith("Описание:"):
-                                record["Описание"] = next_line.replace("Описание:", "").strip()
-                            elif next_line.startswith("Количество:"):
-                                record["Количество"] = next_line.replace("Количество:", "").strip()
-                            elif next_line.startswith("Цена:"):
-                                record["Цена"] = next_line.replace("Цена:", "").strip()
-                            elif next_line.startswith("Сумма:"):
-                                record["Сумма"] = next_line.replace("Сумма:", "").strip()
+                            next_line = lines[i + j]
+                            field_match = RECORD_FIELD_PATTERN.match(next_line)
+                            if field_match:
+                                field = field_match.group(0)
+                                record[RECORD_FIELDS[field]] = next_line.replace(field, "").strip()
                         else:
                             break
 
                 current_records.append(record)
 
         # Добавляем последнюю категорию
-        if current_category:
-            current_category["Записи"] = current_records
-            categories.append(current_category)
+        if current_category or current_records:
+            categories.append(self.expense_category(current_category, current_records))
 
         expenses_data["Категории"] = categories
         return expenses_data
 
-    def result_extraction(self, lines):
+    @staticmethod
+    def expense_category(category: Dict[str, Any], records: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Категория с собранными записями. Записи до первого заголовка категории (таблица сразу
+        после заголовка вкладки) попадают в категорию без названия, а не теряются.
+        """
+        category = category or {"Название": "", "Тип": ""}
+        category["Записи"] = records
+        return category
+
+    @staticmethod
+    def table_expense_records(rows: List[Dict[str, str]], numbered: int) -> List[Dict[str, str]]:
+        """Записи расходов из строк таблицы; без столбца "№" записи нумеруются после уже найденных."""
+        records = []
+        for number, row in enumerate(rows, start=numbered + 1):
+            identifier = cell_text(row.get("Идентификатор", ""))
+            if not identifier:
+                identifier = f"Запись № {number}"
+            elif identifier.isdigit():
+                identifier = f"Запись № {identifier}"
+            records.append({
+                "Идентификатор": identifier,
+                "Заголовок": cell_text(row.get("Заголовок", "")),
+                "Описание": cell_text(row.get("Описание", "")),
+                "Количество": cell_text(row.get("Количество", "")),
+                "Цена": cell_text(row.get("Цена", "")),
+                "Сумма": cell_text(row.get("Сумма", ""))
+            })
+        return records
+
+    def result_extraction(self, index: DocumentIndex):
         result_extraction = {
             "Вкладка Результаты": {
                 "Дата плановых значений результатов": "",
@@ -395,7 +615,7 @@ class DataExtractor:
             }
         }
 
-        combined_lines = self.extract_between_headers(lines, 'Вкладка "Результаты"', 'Вкладка "Календарный план"')
+        combined_lines = index.between('Вкладка "Результаты"', 'Вкладка "Календарный план"')
         # Удаление всех данных, оставляя только числа
         numbers_only = self.extract_numbers(combined_lines)
 
@@ -424,9 +644,9 @@ class DataExtractor:
         return result_extraction
 
 
-    def extract_media(self, lines):
+    def extract_media(self, index: DocumentIndex):
 
-        TEXT_lines = self.extract_between_headers(lines, 'Вкладка "Календарный план"', 'Файл с подробным медиа-планом:')
+        TEXT_lines = index.between('Вкладка "Календарный план"', 'Файл с подробным медиа-планом:')
 
         media_section = {
             "Ресурсы": [],
@@ -477,19 +697,20 @@ class DataExtractor:
         if current_resource is not None:
             media_section["Ресурсы"].append(current_resource)
 
-        media_plan_lines = self.extract_between_headers(lines, "Файл с подробным медиа-планом:", 'Вкладка "Расходы"')
+        media_plan_lines = index.between("Файл с подробным медиа-планом:", 'Вкладка "Расходы"')
         media_section["Файл с подробным медиа-планом"] = media_plan_lines
 
         return media_section
-    def extract_calendar_plan(self, lines):
+    def extract_calendar_plan(self, index: DocumentIndex):
         calendar_plan = {
             "Блок Задачи": []
         }
         task_info = {}
         current_events = []
 
-        for line in lines:
-            line = line.strip()
+        # Строки без маркеров календарного плана ни на что не влияют, поэтому перебираем только вхождения
+        for i, marker in index.classify(CALENDAR_MARKERS).items():
+            line = index.stripped[i]
 
             if line.startswith('Вкладка "Календарный план"'):
                 continue
@@ -497,7 +718,7 @@ class DataExtractor:
             if line.startswith('Добавить мероприятие:'):
                 continue
 
-            if "Поставленная задача:" in line:
+            if marker == "Поставленная задача:":
                 if task_info and current_events:
                     task_info["Мероприятия"] = current_events
                     calendar_plan["Блок Задачи"].append(task_info)
@@ -507,42 +728,14 @@ class DataExtractor:
                 }
                 current_events = []
 
-            elif "Название мероприятия:" in line:
+            elif marker == "Название мероприятия:":
                 event_info = {
                     "Название": line.split("Название мероприятия:")[1].strip()
                 }
                 current_events.append(event_info)
 
-            elif "Крайняя дата выполнения:" in line:
-                if current_events:
-                    current_events[-1]["Крайняя дата"] = line.split("Крайняя дата выполнения:")[1].strip()
-
-            elif "Описание мероприятия:" in line:
-                if current_events:
-                    current_events[-1]["Описание"] = line.split("Описание мероприятия:")[1].strip()
-
-            elif "Количество уникальных участников:" in line:
-                if current_events:
-                    current_events[-1]["Количество уникальных участников"] = \
-                    line.split("Количество уникальных участников:")[1].strip()
-
-            elif "Количество повторяющихся участников:" in line:
-                if current_events:
-                    current_events[-1]["Количество повторяющихся участников"] = \
-                    line.split("Количество повторяющихся участников:")[1].strip()
-
-            elif "Количество публикаций:" in line:
-                if current_events:
-                    current_events[-1]["Количество публикаций"] = line.split("Количество публикаций:")[1].strip()
-
-            elif "Количество просмотров:" in line:
-                if current_events:
-                    current_events[-1]["Количество просмотров"] = line.split("Количество просмотров:")[1].strip()
-
-            elif "Дополнительная информация:" in line:
-                if current_events:
-                    current_events[-1]["Дополнительная информация"] = line.split("Дополнительная информация:")[
-                        1].strip()
+            elif current_events:
+                current_events[-1][CALENDAR_EVENT_FIELDS[marker]] = line.split(marker)[1].strip()
 
         if task_info and current_events:
             task_info["Мероприятия"] = current_events
@@ -550,7 +743,7 @@ class DataExtractor:
 
         return calendar_plan
 
-    def extract_cofinancing(self, lines: List[str]) -> Dict[str, Any]:
+    def extract_cofinancing(self, index: DocumentIndex) -> Dict[str, Any]:
         json_structure = {
             "Блок Собственные средства": {
                 "Перечень расходов": [],
@@ -559,13 +752,10 @@ class DataExtractor:
             "Блок Партнер": []
         }
 
-        combined_lines = "\n".join(lines)
+        combined_lines = index.buffer
 
         # Extracting own funding expenses
-        own_funding_match = re.search(
-            r'Блок "Собственные средства".*?Перечень расходов:(.*?)Сумма, руб.:\s*(\d+)',
-            combined_lines, re.DOTALL
-        )
+        own_funding_match = OWN_FUNDING_PATTERN.search(combined_lines)
         if own_funding_match:
             expenses = [
                 line.strip() for line in own_funding_match.group(1).strip().split('\n')
@@ -576,10 +766,7 @@ class DataExtractor:
 
 
         # Extracting partner information
-        partner_matches = re.findall(
-            r'Название партнера:\s*(.+?)\nТип поддержки:\s*(.+?)\nПеречень расходов:\s*(.+?)\nСумма, руб\.: (\d+)',
-            combined_lines, re.DOTALL
-        )
+        partner_matches = PARTNER_PATTERN.findall(combined_lines)
 
         for match in partner_matches:
             partner_info = {
@@ -592,18 +779,15 @@ class DataExtractor:
 
         return json_structure
 
-    def extraction_additional_files(self, lines):
+    def extraction_additional_files(self, index: DocumentIndex):
         json_structure = {
                 "Файлы": []
             }
 
-        combined_lines = "\n".join(lines)
+        combined_lines = index.buffer
 
         # Извлечение дополнительных файлов
-        file_matches = re.findall(
-            r'Описание файла:\s*(.+?)\nВыберете файл:\s*(\S+)',
-            combined_lines, re.DOTALL
-        )
+        file_matches = ADDITIONAL_FILE_PATTERN.findall(combined_lines)
 
         for match in file_matches:
             file_info = {
@@ -621,7 +805,7 @@ class DataExtractor:
 
         for text in data:
             # Найти все числа и даты в каждой строке
-            found_items = re.findall(r'\d{1,2}\.\d{1,2}\.\d{4}|\d+', text)
+            found_items = NUMBER_PATTERN.findall(text)
             # Добавить найденные предметы в общий список
             results.extend(found_items)
 
@@ -637,7 +821,8 @@ class JSONWriter:
             print(f"Ошибка при записи JSON файла: {e}")
 
 
-def convert_docx_to_json(docx_filepath):
+def get_artifact_paths(docx_filepath):
+    """Пути TXT и JSON файлов, соответствующих загруженному DOCX."""
     # Получаем путь к родительской папке
     parent_folder = os.path.dirname(os.path.dirname(docx_filepath))
 
@@ -646,20 +831,55 @@ def convert_docx_to_json(docx_filepath):
 
     # Формируем полные пути для txt и json файлов
     txt_filepath = os.path.join(parent_folder, "projects_txt", f"{file_name}.txt")
-    json_filepath = os.path.join(parent_folder,  "projects_json", f"{file_name}.json")
-    # Конвертация DOCX в TXT
-    converter = DocxConverter(docx_filepath, txt_filepath)
-    converter.convert_to_txt()
-
-    # Извлечение данных из TXT
-    extractor = DataExtractor(txt_filepath)
-    data = extractor.extract_data()
+    json_filepath = os.path.join(parent_folder, "projects_json", f"{file_name}.json")
+    return txt_filepath, json_filepath
+
+
+def extract_docx_data(source: Union[str, bytes, BinaryIO], archive_path: Optional[str] = None,
+                      raise_errors: bool = False) -> Dict[str, Any]:
+    """
+    Извлекает данные заявки из DOCX целиком в памяти, без промежуточных TXT и JSON файлов.
+
+    - source: путь к файлу, содержимое файла (bytes) или файловый объект.
+    - archive_path: путь к DOCX, рядом с которым нужно сохранить TXT и JSON для отладки.
+      Если не задан, на диск ничего не пишется.
+    - raise_errors: пробрасывать ошибку чтения DOCX вместо возврата пустой структуры.
+    """
+    try:
+        started = time.perf_counter()
+        lines, tables = DocxConverter.read_document(source)
+        read_ms = (time.perf_counter() - started) * 1000
+
+        extractor = DataExtractor(lines=lines, tables=tables)
+        data = extractor.extract_data()
+        # Время по этапам помогает найти секцию, на которой медленно разбираются большие заявки
+        stages = ", ".join(f"{stage} {ms:.1f}" for stage, ms in extractor.timings.items())
+        logger.debug(f"Разбор заявки ({len(lines)} строк): чтение DOCX {read_ms:.1f} мс, "
+                     f"извлечение {sum(extractor.timings.values()):.1f} мс ({stages})")
+    except Exception:
+        if raise_errors:
+            raise
+        logger.exception("Ошибка при чтении DOCX заявки")
+        lines = None
+        data = DataExtractor.initialize_data_structure()
+
+    if archive_path:
+        txt_filepath, json_filepath = get_artifact_paths(archive_path)
+        if lines is not None:
+            try:
+                with open(txt_filepath, 'w', encoding='utf-8') as txt_file:
+                    txt_file.writelines(lines)
+            except OSError as e:
+                logger.warning(f"Ошибка при записи TXT файла {txt_filepath}: {e}")
+        JSONWriter.write_to_json(data, json_filepath)
+
+    return data
 
-    # Запись данных в JSON файл
-    writer = JSONWriter()
-    writer.write_to_json(data, json_filepath)
 
-    return json_filepath
+def convert_docx_to_json(docx_filepath):
+    """Конвертирует DOCX в JSON файл (с сохранением TXT) и возвращает путь к JSON."""
+    extract_docx_data(docx_filepath, archive_path=docx_filepath)
+    return get_artifact_paths(docx_filepath)[1]
 
 
 def main():
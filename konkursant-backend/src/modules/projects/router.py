@@ -1,27 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Response, status, Form, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Response, status, Query
+from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from typing import List, Optional
+from sqlalchemy import delete, exists, insert, update
+from starlette.concurrency import run_in_threadpool
+from typing import Dict, List, Optional, Tuple
 
 from src.modules.auth.auth import get_current_user
 from src.modules.auth.models import User
 
-from src.modules.projects.models import Project, ProjectData
+from src.modules.projects.models import Project, ProjectData, IngestionJob
 from src.modules.projects import schemas
-from src.modules.projects.projects import convert_docx_to_json
-from src.modules.review.models import Review
+from src.modules.projects.cache import json_data_cache, serialize_json_data
+from src.modules.projects.normalized import delete_normalized_data
+from src.modules.projects.upload import StoredUpload, discard_upload, receive_upload, store_file
+from src.modules.projects.ingestion import ingestion_worker, JOB_PENDING, JOB_DONE
+from src.modules.review.models import Review, ReviewAssignment
+from src.modules.statistics.rollups import add_project_status, add_review_scores
+from src.write_queue import write_queue
 
 
 from src.database import async_session
+from src.pagination import after_cursor, cursor_key, encode_cursor
+from src.config import settings
 from sqlalchemy import or_
-from datetime import datetime
-import json
+from datetime import datetime, timezone
+from email.utils import format_datetime
+import contextlib
 import os
-import shutil
 import logging
+import tempfile
+import zipfile
+
+import orjson
 
 
 # Создание экземпляра маршрутизатора
@@ -36,65 +50,131 @@ async def get_db():
         yield session
 
 
-# Асинхронная функция для обработки загруженного файла и обновления базы данных
-async def read_json_file(filepath: str):
-    """Функция для чтения данных из JSON файла."""
+# Каталог загруженных DOCX файлов
+DOCX_UPLOAD_DIR = f"{os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))}/_resources/upload_files/projects_docx"
+
+
+def get_upload_locations(filename: str, digest: str) -> Tuple[str, str]:
+    """
+    Пути сохранения загруженного DOCX и JSON-экспорта его данных.
+    Имя файла дополняется префиксом хэша содержимого (digest — SHA-256), чтобы разные файлы
+    с одинаковым именем (например, «Заявка.docx» от разных пользователей) не перезаписывали друг друга.
+    """
+    script_path = os.path.abspath(__file__)
+    three_levels_up = os.path.dirname(os.path.dirname(os.path.dirname(script_path)))
+    filename = f"{digest[:16]}_{os.path.basename(filename)}"
+    file_location = f"{DOCX_UPLOAD_DIR}/{filename}"
+    file_name = os.path.splitext(os.path.basename(file_location))[0]
+
+    json_file_location = os.path.join(
+        f"{three_levels_up}/_resources/upload_files/projects_json",
+        f"{file_name}.json"
+    )
+
+    # Нормализуем путь
+    return file_location, os.path.normpath(json_file_location)
+
+
+def etag_matches(if_none_match: Optional[str], content_hash: str) -> bool:
+    """Совпадает ли заголовок If-None-Match с ETag данных (допускаются списки, W/ и *)."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/").strip('"') == content_hash for tag in tags)
+
+
+async def discard_unreferenced_file(file_location: str):
+    """
+    Удаляет загруженный файл, если на него не ссылается ни один проект.
+    Файлы адресуются содержимым, поэтому тот же файл мог быть одновременно загружен в другой проект.
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as json_file:
-            return json.load(json_file)
+        async with async_session() as db:
+            referenced = (await db.execute(
+                select(exists().where(Project.docs_file_path == file_location))
+            )).scalar()
     except Exception as e:
-        logger.error(f"Ошибка чтения JSON файла: {e}")
-        raise HTTPException(status_code=500, detail="Ошибка чтения JSON файла.")
+        logger.error(f"Не удалось проверить ссылки на файл {file_location}, файл оставлен: {e}")
+        return
+    if not referenced:
+        with contextlib.suppress(FileNotFoundError):
+            await run_in_threadpool(os.remove, file_location)
 
 
-async def update_project_data(db: AsyncSession, project_id: int, json_data: dict):
-    """Функция для обновления или создания данных проекта в базе данных."""
-    async with db.begin():
-        # Получаем проект по ID
-        project = (await db.execute(
-            select(Project).filter(Project.id_project == project_id)
-        )).scalar_one_or_none()
+def place_uploaded_files(moves: List[Tuple[str, str]]) -> List[str]:
+    """
+    Переносит временные файлы на место os.replace (выполняется в пуле потоков): файл, на который
+    уже ссылаются другие проекты, заменяется атомарно и никогда не виден недописанным.
+    Возвращает пути, которых до переноса не было.
+    """
+    created = []
+    for temp_path, file_location in moves:
+        if not os.path.exists(file_location):
+            created.append(file_location)
+        os.replace(temp_path, file_location)
+    return created
 
-        if project is None:
-            logger.warning(f"Проект с ID {project_id} не найден.")
-            return
 
-        # Получаем или создаем проектные данные
-        project_data = (await db.execute(
-            select(ProjectData).filter(ProjectData.project_id == project_id)
-        )).scalar_one_or_none()
+def discard_uploads(uploads: List[StoredUpload]):
+    for upload in uploads:
+        discard_upload(upload)
 
-        if project_data is None:
-            project_data = ProjectData(project_id=project_id, json_data=json_data)
-            db.add(project_data)
-            logger.info("Новые данные проекта добавлены.")
-        else:
-            project_data.json_data = json_data
-            logger.info("Данные проекта обновлены.")
 
-        await db.commit()
-        logger.info("Изменения успешно сохранены.")
+# Дополнительные файлы заявки: раздел данных и поля записи файла
+ADDITIONAL_FILES_SECTION = "Вкладка Доп. Файлы"
+FILE_ID_FIELD = "ID файла"
+FILE_LINK_FIELD = "Ссылка на файл:"
+# Попытки записи ссылок, если данные изменились между чтением и записью (клиент не указал версию)
+FILE_LINKS_MAX_ATTEMPTS = 3
 
-async def process_file_and_update_db(file_path: str, project_id: int, db: AsyncSession):
-    # Конвертируем DOCX файл в JSON формат
-    json_filepath = convert_docx_to_json(file_path)
 
-    # Читаем данные из JSON файла
-    json_data = await read_json_file(json_filepath)
-    if json_data is None:
-        return
+def apply_file_links(json_data: dict, links: Dict[str, str]) -> List[str]:
+    """
+    Записывает ссылки в дополнительные файлы заявки (json_data изменяется на месте).
+    Файлы индексируются по ID один раз, поэтому обновление занимает O(файлов + ссылок).
+    Если хотя бы один ID не найден, данные не изменяются; возвращаются ненайденные ID.
+    """
+    files_by_id = {}
+    for file in json_data.get(ADDITIONAL_FILES_SECTION, {}).get("Файлы", []):
+        files_by_id.setdefault(file.get(FILE_ID_FIELD), file)
 
-    # Обновляем данные проекта в базе данных
-    await update_project_data(db, project_id, json_data)
+    missing = [file_id for file_id in links if file_id not in files_by_id]
+    if not missing:
+        for file_id, link in links.items():
+            files_by_id[file_id][FILE_LINK_FIELD] = link
+    return missing
 
-async def process_file_and_update_db_local(json_filepath: str, project_id: int, db: AsyncSession):
-    # Читаем данные из JSON файла
-    json_data = await read_json_file(json_filepath)
-    if json_data is None:
-        return
 
-    # Обновляем данные проекта в базе данных
-    await update_project_data(db, project_id, json_data)
+def export_is_current(path: str, updated_at: Optional[datetime]) -> bool:
+    """Актуален ли JSON-экспорт: файл записан с данными не старше последнего изменения данных."""
+    if not os.path.isfile(path):
+        return False
+    return updated_at is None or os.path.getmtime(path) >= _timestamp(updated_at)
+
+
+def write_json_export(path: str, json_data: dict, updated_at: Optional[datetime]):
+    """
+    Атомарно записывает JSON-экспорт данных заявки (временный файл и переименование, выполняется
+    в пуле потоков). Времени изменения файла присваивается время изменения данных, по которому
+    проверяется актуальность экспорта.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
+        if updated_at is not None:
+            os.utime(temp_path, (_timestamp(updated_at), _timestamp(updated_at)))
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def _timestamp(value: datetime) -> float:
+    # SQLite возвращает время без часового пояса; оно записывается в UTC
+    return (value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)).timestamp()
 
 
 # Получение списка проектов
@@ -135,13 +215,108 @@ async def get_list_available_project_info(current_user: User = Depends(get_curre
     return projects_with_full_name
 
 
+# Поля списка проектов, которые можно запросить параметром fields
+PROJECT_LIST_FIELDS = {
+    "id_project": Project.id_project,
+    "title": Project.title,
+    "description": Project.description,
+    "owner_id": Project.owner_id,
+    "owner_full_name": User.full_name,
+    "created_at": Project.created_at,
+    "updated_at": Project.updated_at,
+    "status": Project.status,
+    "docs_file_path": Project.docs_file_path,
+}
+
+
+# Постраничный список проектов
+@project_router.get("/list/", response_model=schemas.ProjectPage, tags=["Проекты"])
+async def get_project_page(
+        cursor: Optional[str] = None,
+        limit: int = Query(50, ge=1, le=500),
+        project_status: Optional[str] = Query(None, alias="status"),
+        owner_id: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        fields: Optional[str] = None,
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Возвращает страницу доступных текущему пользователю проектов, от новых к старым.
+    Пагинация по ключу (created_at, id_project), поэтому время ответа не зависит от номера страницы.
+
+    - **cursor**: Курсор из next_cursor предыдущей страницы.
+    - **limit**: Размер страницы.
+    - **status**, **owner_id**: Фильтры по статусу и владельцу проекта.
+    - **created_from**, **created_to**: Диапазон даты создания (включительно).
+    - **fields**: Список полей через запятую (по умолчанию все поля схемы Project).
+    """
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in selected if field not in PROJECT_LIST_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=422, detail=f"Неизвестные поля: {', '.join(unknown)}.")
+    else:
+        selected = list(PROJECT_LIST_FIELDS)
+
+    # id_project и created_at нужны для курсора, даже если не запрошены
+    columns = [PROJECT_LIST_FIELDS[field].label(field) for field in selected if field != "id_project"]
+    query = select(Project.id_project, cursor_key(Project.created_at), *columns)
+    if "owner_full_name" in selected:
+        query = query.outerjoin(User, User.id_user == Project.owner_id)
+
+    # Обычные пользователи видят только свои проекты
+    if current_user.role not in ['admin', 'reviewer']:
+        owner_id = current_user.id_user
+    if owner_id is not None:
+        query = query.where(Project.owner_id == owner_id)
+    if project_status is not None:
+        query = query.where(Project.status == project_status)
+    if created_from is not None:
+        query = query.where(Project.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Project.created_at <= created_to)
+
+    if cursor is not None:
+        query = query.where(after_cursor(Project.created_at, Project.id_project, cursor))
+
+    rows = (await db.execute(
+        query.order_by(Project.created_at.desc(), Project.id_project.desc()).limit(limit + 1)
+    )).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(rows[limit - 1].cursor_created_at, rows[limit - 1].id_project)
+    items = [{field: row._mapping[field] for field in selected} for row in rows[:limit]]
+    return schemas.ProjectPage(items=items, next_cursor=next_cursor)
+
+
+# Схема формы создания проекта для OpenAPI: тело запроса разбирается потоково, не FastAPI
+CREATE_PROJECT_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["title", "docs_file"],
+                    "properties": {
+                        "title": {"type": "string"},
+                        "description": {"type": "string"},
+                        "docs_file": {"type": "string", "format": "binary"},
+                    },
+                }
+            }
+        },
+    }
+}
+
+
 # Создание нового проекта
-@project_router.post("/create/", response_model=schemas.Project, tags=["Проекты"])
+@project_router.post("/create/", response_model=schemas.Project, tags=["Проекты"], openapi_extra=CREATE_PROJECT_FORM)
 async def create_project(
-        background_tasks: BackgroundTasks,
-        title: str = Form(...),  # Обязательное поле для названия
-        description: Optional[str] = Form(None),  # Описание проекта (необязательное)
-        docs_file: UploadFile = File(...),  # Загружаемый файл (обязательное поле)
+        request: Request,
         current_user: User = Depends(get_current_user),
         db: AsyncSession = Depends(get_db)
 ):
@@ -149,36 +324,38 @@ async def create_project(
     Создает новый проект и сохраняет загруженный файл.
     Проверяет наличие обязательных данных для создания проекта.
 
+    Форма принимается потоково: файл пишется на диск по мере получения, с подсчетом хэша,
+    и переносится на место после полного получения. Файл больше upload_max_bytes (413)
+    и файл не-DOCX (415) отклоняются, не дожидаясь конца передачи.
+
     - **title**: Название проекта.
     - **description**: Описание проекта (необязательное).
     - **docs_file**: Загружаемый файл для проекта.
     - **current_user**: Текущий аутентифицированный пользователь.
     - **db**: Сессия базы данных.
     """
-    if not title or not docs_file:
-        raise HTTPException(status_code=422, detail="Необходимые поля: title и docs_file.")
+    if not await ingestion_worker.has_capacity(db):
+        raise HTTPException(status_code=503, detail="Очередь обработки заявок переполнена, повторите попытку позже.")
+    # Соединение с базой не удерживается, пока принимается файл
+    await db.rollback()
 
-    logger.info(f"Создание проекта: Title: {title}, Description: {description}, Filename: {docs_file.filename}")
+    fields, upload = await receive_upload(request, "docs_file", DOCX_UPLOAD_DIR, settings.upload_max_bytes)
+    title = fields.get("title")
+    description = fields.get("description") or None
 
-    # Определяем путь для сохранения файла
-    script_path = os.path.abspath(__file__)
-    three_levels_up = os.path.dirname(os.path.dirname(os.path.dirname(script_path)))
-    file_location = f"{three_levels_up}/_resources/upload_files/projects_docx/{docs_file.filename}"
-    file_name = os.path.splitext(os.path.basename(file_location))[0]
-
-    json_file_location = os.path.join(
-        f"{three_levels_up}/_resources/upload_files/projects_json",
-        f"{file_name}.json"
-    )
+    if not title or upload is None:
+        await run_in_threadpool(discard_upload, upload)
+        raise HTTPException(status_code=422, detail="Необходимые поля: title и docs_file.")
 
-    # Нормализуем путь
-    json_file_location = os.path.normpath(json_file_location)
+    logger.info(f"Создание проекта: Title: {title}, Description: {description}, Filename: {upload.filename}, "
+                f"Size: {upload.size}")
 
-    # Сохранение загруженного файла на сервере
-    with open(file_location, "wb") as buffer:
-        shutil.copyfileobj(docs_file.file, buffer)
+    # Полностью полученный файл переносится на место атомарно
+    file_location, json_file_location = get_upload_locations(upload.filename, upload.digest)
+    created_file = not await run_in_threadpool(os.path.exists, file_location)
+    await run_in_threadpool(os.replace, upload.temp_path, file_location)
 
-    # Создание объекта нового проекта
+    # Создание объекта нового проекта вместе с заданием на разбор файла (одной транзакцией)
     new_project = Project(
         title=title,
         description=description,
@@ -187,52 +364,309 @@ async def create_project(
         owner_id=current_user.id_user,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow(),
-        status='Ожидает проверки'  # Пример статуса проекта
+        status='Ожидает проверки',  # Пример статуса проекта
+        ingestion_job=IngestionJob(status=JOB_PENDING, next_attempt_at=datetime.utcnow())
     )
 
-    db.add(new_project)
-    await db.commit()
+    try:
+        db.add(new_project)
+        await add_project_status(db, new_project.status)
+        await db.commit()
+    except Exception:
+        # Проект не создан: перенесенный файл не должен остаться на диске без записи о нем
+        await db.rollback()
+        if created_file:
+            await discard_unreferenced_file(file_location)
+        raise
     await db.refresh(new_project)
 
-    # Добавление фоновой задачи для обработки файла и обновления данных проекта
-    background_tasks.add_task(process_file_and_update_db, file_location, new_project.id_project, db)
+    # Данные проекта появятся после разбора (файл читается с диска); статус — /{project_id}/ingest-status
+    ingestion_worker.submit(new_project.id_project)
 
     return new_project
 
 
+# Пакетная загрузка проектов
+@project_router.post("/bulk-create/", response_model=List[schemas.BulkUploadItem], tags=["Проекты"])
+async def bulk_create_projects(
+        docs_files: List[UploadFile] = File(...),  # DOCX файлы и/или ZIP-архивы с ними
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Создает проекты из множества заявок за один запрос. Доступно только администраторам.
+    Все проекты и задания на разбор создаются одной транзакцией, разбор выполняется
+    параллельно в пуле обработчиков. Название проекта — имя файла без расширения.
+    Каждый файл (и каждый файл ZIP-архива после распаковки) не больше UPLOAD_MAX_BYTES и должен
+    быть DOCX, а все файлы пакета вместе — не больше BULK_UPLOAD_MAX_BYTES. Файлы сверх свободного
+    места в очереди разбора (INGEST_QUEUE_SIZE) отклоняются.
+
+    - **docs_files**: DOCX файлы и/или ZIP-архивы, содержащие DOCX файлы.
+    - **current_user**: Текущий аутентифицированный пользователь.
+    - **db**: Сессия базы данных.
+
+    Возвращает результат по каждому файлу: queued (с ID проекта) или rejected (с причиной).
+    """
+    if current_user.role != 'admin':
+        raise HTTPException(status_code=403, detail="Пакетная загрузка доступна только администраторам.")
+
+    capacity = await ingestion_worker.remaining_capacity(db)
+    if not capacity:
+        raise HTTPException(status_code=503, detail="Очередь обработки заявок переполнена, повторите попытку позже.")
+
+    manifest: List[schemas.BulkUploadItem] = []
+    accepted: List[StoredUpload] = []
+    seen_files = set()
+    batch_bytes = 0
+    batch_too_large = f"Превышен общий размер пакета ({settings.bulk_upload_max_bytes // (1024 * 1024)} МБ)."
+
+    def reject(filename: str, detail: str):
+        manifest.append(schemas.BulkUploadItem(filename=os.path.basename(filename), status="rejected", detail=detail))
+
+    def accept(filename: str, source, size: Optional[int]):
+        """Копирует файл пакета во временный файл, если он проходит ограничения."""
+        nonlocal batch_bytes
+        if not filename.lower().endswith(".docx"):
+            return reject(filename, "Поддерживаются только файлы DOCX.")
+        if len(accepted) >= capacity:
+            return reject(filename, "Очередь обработки заявок заполнена, файл не принят.")
+        if size is not None and size > settings.upload_max_bytes:
+            return reject(filename, f"Размер файла превышает {settings.upload_max_bytes // (1024 * 1024)} МБ.")
+
+        batch_left = settings.bulk_upload_max_bytes - batch_bytes
+        if size is not None and size > batch_left:
+            return reject(filename, batch_too_large)
+
+        # Размер из заголовка ZIP может не совпадать с распакованным: копирование останавливается на пределе
+        try:
+            upload = store_file(source, filename, DOCX_UPLOAD_DIR, min(settings.upload_max_bytes, batch_left))
+        except HTTPException as e:
+            if e.status_code == 413 and batch_left < settings.upload_max_bytes:
+                return reject(filename, batch_too_large)
+            return reject(filename, e.detail)
+
+        file_key = (upload.filename, upload.digest)
+        if file_key in seen_files:
+            discard_upload(upload)
+            return reject(filename, "Этот файл уже есть в пакете.")
+        seen_files.add(file_key)
+        batch_bytes += upload.size
+        manifest.append(schemas.BulkUploadItem(filename=upload.filename, status="queued"))
+        accepted.append(upload)
+
+    def collect():
+        # Файлы формы уже лежат во временных файлах Starlette: копируются и распаковываются
+        # порциями в пуле потоков, в память целиком не читаются
+        for docs_file in docs_files:
+            if not docs_file.filename.lower().endswith(".zip"):
+                accept(docs_file.filename, docs_file.file, docs_file.size)
+                continue
+
+            try:
+                with zipfile.ZipFile(docs_file.file) as archive:
+                    for member in archive.infolist():
+                        if not member.is_dir():
+                            with archive.open(member) as member_file:
+                                accept(member.filename, member_file, member.file_size)
+            except zipfile.BadZipFile:
+                reject(docs_file.filename, "Не удалось прочитать ZIP-архив.")
+
+    try:
+        await run_in_threadpool(collect)
+    except BaseException:
+        await run_in_threadpool(discard_uploads, accepted)
+        raise
+
+    if not accepted:
+        return manifest
+
+    logger.info(f"Пакетная загрузка: {len(accepted)} файлов от пользователя {current_user.email}.")
+
+    # Полностью скопированные файлы переносятся на место атомарно, вне цикла событий
+    locations = [get_upload_locations(upload.filename, upload.digest) for upload in accepted]
+    created_files = await run_in_threadpool(place_uploaded_files, [
+        (upload.temp_path, file_location) for upload, (file_location, _) in zip(accepted, locations)
+    ])
+
+    # Все проекты и задания на разбор — одной транзакцией, массовыми INSERT
+    now = datetime.utcnow()
+    try:
+        project_ids = (await db.execute(
+            insert(Project).returning(Project.id_project, sort_by_parameter_order=True),
+            [
+                {
+                    "title": os.path.splitext(upload.filename)[0],
+                    "description": None,
+                    "docs_file_path": file_location,
+                    "json_file_path": json_file_location,
+                    "owner_id": current_user.id_user,
+                    "created_at": now,
+                    "updated_at": now,
+                    "status": 'Ожидает проверки'
+                }
+                for upload, (file_location, json_file_location) in zip(accepted, locations)
+            ]
+        )).scalars().all()
+        await db.execute(insert(IngestionJob), [
+            {"project_id": project_id, "status": JOB_PENDING, "attempts": 0, "next_attempt_at": now}
+            for project_id in project_ids
+        ])
+        await add_project_status(db, 'Ожидает проверки', len(project_ids))
+        await db.commit()
+    except Exception:
+        # Проекты не созданы: перенесенные файлы не должны остаться на диске без записей о них
+        await db.rollback()
+        for file_location in created_files:
+            await discard_unreferenced_file(file_location)
+        raise
+
+    # Разбор расходится по всем обработчикам пула
+    queued = iter(project_ids)
+    for item in manifest:
+        if item.status == "queued":
+            item.id_project = next(queued)
+            ingestion_worker.submit(item.id_project)
+
+    return manifest
+
+
 # Получение данных JSON проекта
 @project_router.get("/{project_id}/json-data", response_model=dict, tags=["Проекты"])
-async def get_json_data(project_id: int, current_user: User = Depends(get_current_user),
+async def get_json_data(project_id: int, request: Request, current_user: User = Depends(get_current_user),
                         db: AsyncSession = Depends(get_db)):
     """
     Получает данные JSON для указанного проекта по его ID.
     Проверяет права доступа к проекту.
 
+    Ответ содержит ETag (хэш данных) и Last-Modified: на запрос с совпадающим If-None-Match
+    возвращается 304 без чтения самих данных. Повторные чтения отдаются из кэша
+    уже сериализованных ответов. Заголовок X-Data-Version — версия данных для
+    PATCH /{project_id}/additional-files/.
+
     - **project_id**: Идентификатор проекта.
     - **current_user**: Текущий аутентифицированный пользователь.
     - **db**: Сессия базы данных.
     """
-    query = select(Project).where(
-        Project.id_project == project_id,
-        or_(
-            Project.owner_id == current_user.id_user,
-            current_user.role in ["admin", "reviewer"]
-        )
-    )
-    result = await db.execute(query)
+    project = (await db.execute(
+        select(Project.owner_id, ProjectData.id_data, ProjectData.content_hash, ProjectData.updated_at,
+               ProjectData.version)
+        .outerjoin(ProjectData, ProjectData.project_id == Project.id_project)
+        .where(Project.id_project == project_id)
+    )).first()
+
+    if not project or (project.owner_id != current_user.id_user and current_user.role not in ["admin", "reviewer"]):
+        raise HTTPException(status_code=404, detail="Проект не найден.")
+
+    if project.id_data is None:
+        raise HTTPException(status_code=404, detail="Данные JSON проекта не найдены.")
+
+    headers = {"Cache-Control": "private, no-cache", "X-Data-Version": str(project.version)}
+    if project.updated_at is not None:
+        headers["Last-Modified"] = format_datetime(project.updated_at.replace(tzinfo=timezone.utc), usegmt=True)
+
+    content_hash = project.content_hash
+    if content_hash is not None:
+        headers["ETag"] = f'"{content_hash}"'
+        if etag_matches(request.headers.get("if-none-match"), content_hash):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        payload = json_data_cache.get(project_id, content_hash)
+        if payload is not None:
+            return Response(content=payload, media_type="application/json", headers=headers)
+
+    json_data = (await db.execute(
+        select(ProjectData.json_data).where(ProjectData.id_data == project.id_data)
+    )).scalar_one()
+    payload, actual_hash = serialize_json_data(json_data)
+
+    if content_hash is None:
+        # Данные записаны без хэша: отдаем с ETag по содержимому, но не кэшируем
+        headers["ETag"] = f'"{actual_hash}"'
+    else:
+        json_data_cache.put(project_id, content_hash, payload)
+
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+# Получение JSON файла проекта
+@project_router.get("/{project_id}/json-file", response_class=FileResponse, tags=["Проекты"])
+async def get_json_file(project_id: int, current_user: User = Depends(get_current_user),
+                        db: AsyncSession = Depends(get_db)):
+    """
+    Отдает JSON файл данных проекта.
+
+    Источник данных — база; файл на диске — экспорт, который создается заново при первом
+    запросе после изменения данных (разбора заявки или правки ссылок на файлы).
+
+    - **project_id**: Идентификатор проекта.
+    - **current_user**: Текущий аутентифицированный пользователь.
+    - **db**: Сессия базы данных.
+    """
+    project = (await db.execute(
+        select(Project.owner_id, Project.json_file_path, ProjectData.id_data, ProjectData.updated_at)
+        .outerjoin(ProjectData, ProjectData.project_id == Project.id_project)
+        .where(Project.id_project == project_id)
+    )).first()
+
+    if not project or (project.owner_id != current_user.id_user and current_user.role not in ["admin", "reviewer"]):
+        raise HTTPException(status_code=404, detail="Проект не найден.")
+
+    if project.id_data is None or not project.json_file_path:
+        raise HTTPException(status_code=404, detail="Данные JSON проекта не найдены.")
+
+    if not await run_in_threadpool(export_is_current, project.json_file_path, project.updated_at):
+        # Данные и время их изменения читаются вместе, чтобы файл не был помечен более новым, чем его данные
+        project_data = (await db.execute(
+            select(ProjectData.json_data, ProjectData.updated_at).where(ProjectData.id_data == project.id_data)
+        )).one()
+        await run_in_threadpool(write_json_export, project.json_file_path,
+                                project_data.json_data, project_data.updated_at)
+
+    return FileResponse(project.json_file_path, media_type="application/json",
+                        filename=os.path.basename(project.json_file_path))
+
+
+# Получение статуса разбора загруженного файла
+@project_router.get("/{project_id}/ingest-status", response_model=schemas.IngestStatus, tags=["Проекты"])
+async def get_ingest_status(project_id: int, current_user: User = Depends(get_current_user),
+                            db: AsyncSession = Depends(get_db)):
+    """
+    Возвращает статус разбора файла проекта: pending, processing, done или failed.
+    Легкая альтернатива опросу /json-data — сами данные проекта не загружаются.
+
+    - **project_id**: Идентификатор проекта.
+    - **current_user**: Текущий аутентифицированный пользователь.
+    - **db**: Сессия базы данных.
+    """
+    project = (await db.execute(
+        select(Project.owner_id).where(Project.id_project == project_id)
+    )).first()
 
-    project = result.scalars().first()
     if not project:
         raise HTTPException(status_code=404, detail="Проект не найден.")
 
-    json_data_query = select(ProjectData).where(ProjectData.project_id == project_id)
-    json_data_result = await db.execute(json_data_query)
-    project_data = json_data_result.scalar_one_or_none()
+    if project.owner_id != current_user.id_user and current_user.role not in ['admin', 'reviewer']:
+        raise HTTPException(status_code=403, detail="У вас нет доступа к этому проекту.")
 
-    if not project_data:
-        raise HTTPException(status_code=404, detail="Данные JSON проекта не найдены.")
+    ingestion_job = (await db.execute(
+        select(IngestionJob).where(IngestionJob.project_id == project_id)
+    )).scalar_one_or_none()
+
+    if ingestion_job is not None:
+        return schemas.IngestStatus(
+            project_id=project_id,
+            status=ingestion_job.status,
+            attempts=ingestion_job.attempts,
+            last_error=ingestion_job.last_error,
+            updated_at=ingestion_job.updated_at
+        )
+
+    # Проекты, загруженные до появления очереди заданий, считаются обработанными, если у них есть данные
+    has_data = (await db.execute(
+        select(ProjectData.id_data).where(ProjectData.project_id == project_id).limit(1)
+    )).first() is not None
 
-    return project_data.json_data
+    return schemas.IngestStatus(project_id=project_id, status=JOB_DONE if has_data else JOB_PENDING)
 
 
 # Удаление проекта
@@ -271,6 +705,16 @@ async def delete_project(
         for project_data in project_data_list:
             await db.delete(project_data)
             logger.info(f"Данные проекта с ID {project_data.id_data} успешно удалены.")
+        json_data_cache.invalidate(project_id)
+        await delete_normalized_data(db, project_id)
+
+        # Удаление задания на разбор файла
+        ingestion_job = (await db.execute(
+            select(IngestionJob).filter(IngestionJob.project_id == project_id)
+        )).scalar_one_or_none()
+
+        if ingestion_job is not None:
+            await db.delete(ingestion_job)
 
         # Удаление связанных данных из Reviews
         review_results = await db.execute(
@@ -282,6 +726,13 @@ async def delete_project(
             await db.delete(review)
             logger.info(f"Отзыв с ID {review.id_review} успешно удален.")
 
+        # Назначения проекта рецензентам
+        await db.execute(delete(ReviewAssignment).where(ReviewAssignment.project_id == project_id))
+
+        # Проект и его отзывы убираются из сводной статистики
+        await add_review_scores(db, review_list, sign=-1)
+        await add_project_status(db, project.status, -1)
+
         # Удаление основного проекта
         await db.delete(project)
         await db.commit()
@@ -322,9 +773,91 @@ async def get_project(
     return project
 
 
+async def update_file_links(project_id: int, links: Dict[str, str], expected_version: Optional[int],
+                            current_user: User, db: AsyncSession) -> schemas.FileLinksUpdated:
+    """
+    Записывает ссылки на дополнительные файлы в данные проекта.
+
+    Данные изменяются условным UPDATE ... WHERE version = прочитанная версия (оптимистическая
+    блокировка): если данные успели измениться, запись не выполняется и данные перечитываются.
+    Если клиент указал версию, изменение данных после ее получения клиентом — конфликт (409).
+    """
+    project = (await db.execute(
+        select(Project.owner_id).where(Project.id_project == project_id)
+    )).first()
+
+    if not project:
+        raise HTTPException(status_code=404, detail="Проект не найден.")
+
+    # Проверка прав доступа
+    if project.owner_id != current_user.id_user and current_user.role not in ['admin', 'reviewer']:
+        raise HTTPException(status_code=403, detail="У вас нет доступа к этому проекту.")
+
+    async def store(write_db: AsyncSession) -> Optional[int]:
+        project_data = (await write_db.execute(
+            select(ProjectData.id_data, ProjectData.version, ProjectData.json_data)
+            .where(ProjectData.project_id == project_id)
+        )).first()
+
+        if project_data is None:
+            raise HTTPException(status_code=404, detail="Данные JSON проекта не найдены.")
+
+        if expected_version is not None and project_data.version != expected_version:
+            raise HTTPException(status_code=409, detail="Данные проекта были изменены. Обновите данные и повторите запрос.")
+
+        json_data = project_data.json_data
+        missing = apply_file_links(json_data, links)
+        if missing:
+            logger.warning(f"Дополнительный файл с ID {missing[0]} не найден.")
+            raise HTTPException(status_code=404, detail=f"Дополнительный файл с ID {missing[0]} не найден.")
+
+        _, content_hash = serialize_json_data(json_data)
+        updated = await write_db.execute(
+            update(ProjectData)
+            .where(ProjectData.id_data == project_data.id_data, ProjectData.version == project_data.version)
+            .values(json_data=json_data, content_hash=content_hash, updated_at=datetime.utcnow(),
+                    version=project_data.version + 1)
+        )
+        return project_data.version + 1 if updated.rowcount == 1 else None
+
+    # В очереди записи чтение и запись выполняются под блокировкой базы, и условие на версию
+    # выполняется сразу; без очереди (PostgreSQL) при параллельном изменении данные перечитываются
+    for _ in range(FILE_LINKS_MAX_ATTEMPTS):
+        version = await write_queue.run(store)
+        if version is not None:
+            json_data_cache.invalidate(project_id)
+            logger.info(f"Ссылки на файлы добавлены к проекту с ID {project_id}.")
+            return schemas.FileLinksUpdated(project_id=project_id, version=version, updated=len(links))
+        if expected_version is not None:
+            break
+
+    raise HTTPException(status_code=409, detail="Данные проекта были изменены. Обновите данные и повторите запрос.")
+
+
+# Изменение ссылок на дополнительные файлы
+@project_router.patch("/{project_id}/additional-files/", response_model=schemas.FileLinksUpdated,
+                      tags=["Дополнительные файлы"])
+async def patch_additional_files(
+        project_id: int,
+        patch: schemas.FileLinksPatch,
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Изменяет ссылки на дополнительные файлы проекта одной транзакцией.
+
+    - **project_id**: ID проекта.
+    - **links**: ID дополнительного файла -> ссылка на файл.
+    - **version**: Версия данных (заголовок X-Data-Version ответа /json-data). Если данные с тех пор
+      изменились, возвращается 409. Без версии изменение применяется к текущим данным.
+    - **current_user**: Текущий аутентифицированный пользователь.
+    - **db**: Сессия базы данных.
+    """
+    return await update_file_links(project_id, patch.links, patch.version, current_user, db)
+
+
 @project_router.post("/{project_id}/add-file-link/", tags=["Дополнительные файлы"])
 async def add_file_link(
-        background_tasks: BackgroundTasks,
         project_id: int,
         file_ids: List[str],
         file_links: List[str],
@@ -332,7 +865,8 @@ async def add_file_link(
         db: AsyncSession = Depends(get_db)
 ):
     """
-    Добавляет ссылки на дополнительные файлы к проекту.
+    Добавляет ссылки на дополнительные файлы к проекту
+    (прежний вариант PATCH /{project_id}/additional-files/ без проверки версии).
 
     - **project_id**: ID проекта, к которому добавляются ссылки.
     - **file_ids**: Список ID дополнительных файлов.
@@ -340,50 +874,9 @@ async def add_file_link(
     - **current_user**: Текущий аутентифицированный пользователь.
     - **db**: Сессия базы данных.
     """
-    # Проверка прав доступа
-    project_result = await db.execute(select(Project).filter(Project.id_project == project_id))
-    project = project_result.scalar_one_or_none()
-
-    if not project:
-        raise HTTPException(status_code=404, detail="Проект не найден.")
-
     # Проверка на совпадение длины списков
     if len(file_ids) != len(file_links):
         raise HTTPException(status_code=400, detail="Количество ID файлов не соответствует количеству ссылок.")
 
-    # Загрузка JSON данных
-    json_file_path = project.json_file_path  # Предполагаем, что JSON файл хранится по пути проекта
-    try:
-        with open(json_file_path, 'r', encoding='utf-8') as json_file:
-            json_data = json.load(json_file)
-    except Exception as e:
-        logger.error(f"Ошибка чтения JSON файла: {e}")
-        raise HTTPException(status_code=500, detail="Не удалось прочитать файл данных проекта.")
-
-    # Добавление ссылок в структуру JSON
-    additional_files = json_data.get("Вкладка Доп. Файлы", {}).get("Файлы", [])
-
-    # Обновление ссылок в структуре JSON
-    for file_id, file_link in zip(file_ids, file_links):
-        # Проверяем, что файл с данным ID интересует нас
-        for file in additional_files:
-            if file["ID файла"] == file_id:
-                # Обновление ссылки на файл
-                file["Ссылка на файл:"] = file_link  # Здесь обновляем поле
-                break
-        else:
-            logger.warning(f"Дополнительный файл с ID {file_id} не найден.")
-            raise HTTPException(status_code=404, detail=f"Дополнительный файл с ID {file_id} не найден.")
-
-    # Запись обратно в JSON файл
-    try:
-        with open(json_file_path, 'w', encoding='utf-8') as json_file:
-            json.dump(json_data, json_file, ensure_ascii=False, indent=4)
-    except Exception as e:
-        logger.error(f"Ошибка записи в JSON файл: {e}")
-        raise HTTPException(status_code=500, detail="Не удалось обновить файл данных проекта.")
-    # Обновление данных проекта в базе данных
-    background_tasks.add_task(process_file_and_update_db_local, json_file_path, project_id, db)
-
-    logger.info(f"Ссылки на файлы добавлены к проекту с ID {project_id}.")
-    return {"detail": "Ссылки на файлы успешно добавлены."}
\ No newline at end of file
+    await update_file_links(project_id, dict(zip(file_ids, file_links)), None, current_user, db)
+    return {"detail": "Ссылки на файлы успешно добавлены."}
@@ -22,3 +22,34 @@ class Project(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ProjectPage(BaseModel):
+    items: List[Dict[str, Any]]  # Проекты с запрошенными полями схемы Project
+    next_cursor: Optional[str] = None  # Курсор следующей страницы (None — страница последняя)
+
+
+class IngestStatus(BaseModel):
+    project_id: int
+    status: str  # pending, processing, done, failed
+    attempts: int = 0
+    last_error: Optional[str] = None
+    updated_at: Optional[datetime] = None
+
+
+class BulkUploadItem(BaseModel):
+    filename: str
+    status: str  # queued — проект создан и поставлен в очередь разбора, rejected — файл пропущен
+    id_project: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class FileLinksPatch(BaseModel):
+    links: Dict[str, str]  # ID дополнительного файла -> ссылка на файл
+    version: Optional[int] = None  # Версия данных, которую видел клиент (None — без проверки)
+
+
+class FileLinksUpdated(BaseModel):
+    project_id: int
+    version: int  # Новая версия данных проекта
+    updated: int  # Число обновленных файлов
@@ -0,0 +1,248 @@
+import hashlib
+import logging
+import os
+import tempfile
+from typing import BinaryIO, Dict, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from multipart.multipart import parse_options_header
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Сигнатура локального заголовка ZIP: DOCX — ZIP-архив
+ZIP_MAGIC = b"PK\x03\x04"
+# Данные файла пишутся на диск (в пуле потоков) порциями не меньше этого размера
+WRITE_BUFFER_SIZE = 1024 * 1024
+# Наибольший размер текстового поля формы и заголовков одной части формы
+MAX_FIELD_SIZE = 64 * 1024
+MAX_HEADERS_SIZE = 16 * 1024
+
+# События разбора формы
+PART_BEGIN, PART_DATA, PART_END = "begin", "data", "end"
+
+
+class MultipartReader:
+    """
+    Потоковый разбор тела multipart/form-data.
+
+    Разделитель частей ищется bytes.find по каждой полученной порции, а не побайтовым
+    автоматом, поэтому разбор многомегабайтного файла почти не занимает цикл событий.
+    В буфере между порциями остается не больше длины разделителя (и заголовков части).
+    """
+
+    def __init__(self, boundary: bytes):
+        self.delimiter = b"\r\n--" + boundary
+        # Первый разделитель тела не предваряется переводом строки
+        self._buffer = b"\r\n"
+        self._state = "preamble"
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, object]]:
+        """Возвращает события (PART_BEGIN, заголовки), (PART_DATA, байты), (PART_END, None)."""
+        events = []
+        buffer = self._buffer + chunk if self._buffer else chunk
+        keep = len(self.delimiter) - 1
+        while True:
+            if self._state in ("preamble", "body"):
+                index = buffer.find(self.delimiter)
+                if index < 0:
+                    safe = max(len(buffer) - keep, 0)
+                    if self._state == "body" and safe:
+                        events.append((PART_DATA, buffer[:safe]))
+                    buffer = buffer[safe:]
+                    break
+                if self._state == "body":
+                    if index:
+                        events.append((PART_DATA, buffer[:index]))
+                    events.append((PART_END, None))
+                buffer = buffer[index + len(self.delimiter):]
+                self._state = "delimiter"
+            elif self._state == "delimiter":
+                if len(buffer) < 2:
+                    break
+                if buffer.startswith(b"--"):
+                    self._state, buffer = "end", b""
+                    break
+                if not buffer.startswith(b"\r\n"):
+                    raise self._malformed()
+                buffer = buffer[2:]
+                self._state = "headers"
+            elif self._state == "headers":
+                index = buffer.find(b"\r\n\r\n")
+                if index < 0:
+                    if len(buffer) > MAX_HEADERS_SIZE:
+                        raise self._malformed()
+                    break
+                headers = {}
+                for line in buffer[:index].split(b"\r\n"):
+                    name, _, value = line.partition(b":")
+                    headers[name.strip().lower()] = value.strip()
+                events.append((PART_BEGIN, headers))
+                buffer = buffer[index + 4:]
+                self._state = "body"
+            else:
+                # Эпилог после последнего разделителя игнорируется
+                buffer = b""
+                break
+        self._buffer = buffer
+        return events
+
+    def finalize(self):
+        if self._state != "end":
+            raise self._malformed()
+
+    @staticmethod
+    def _malformed() -> HTTPException:
+        return HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                             detail="Форма multipart/form-data повреждена или передана не полностью.")
+
+
+class StoredUpload(NamedTuple):
+    filename: str
+    temp_path: str  # Временный файл в каталоге назначения; переносится на место os.replace
+    digest: str  # SHA-256 содержимого
+    size: int
+
+
+def discard_upload(upload: Optional[StoredUpload]):
+    if upload is not None and os.path.exists(upload.temp_path):
+        os.unlink(upload.temp_path)
+
+
+def _decode(value: bytes, charset: str) -> str:
+    try:
+        return value.decode(charset)
+    except UnicodeDecodeError:
+        return value.decode("latin-1")
+
+
+def _write_chunk(file, hasher, data: bytes):
+    """Хэширование и запись порции файла (выполняется в пуле потоков)."""
+    hasher.update(data)
+    file.write(data)
+
+
+def _unsupported() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail="Поддерживаются только файлы DOCX.")
+
+
+async def receive_upload(request: Request, file_field: str, directory: str,
+                         max_bytes: int) -> Tuple[Dict[str, str], Optional[StoredUpload]]:
+    """
+    Потоковый прием формы multipart/form-data с одним файлом в поле file_field.
+
+    Тело запроса разбирается по мере поступления. Данные файла хэшируются и пишутся во временный
+    файл каталога directory порциями в пуле потоков, поэтому ни файл целиком, ни запись на диск
+    не занимают память и цикл событий. Размер и сигнатура ZIP проверяются по мере получения:
+    файл больше max_bytes (413) или файл не-DOCX (415) отклоняется, не дожидаясь конца передачи.
+
+    Возвращает текстовые поля формы и файл (None, если его нет). Временный файл переносит
+    на место или удаляет (discard_upload) вызывающая сторона.
+    """
+    content_type, options = parse_options_header(request.headers.get("content-type", ""))
+    if content_type != b"multipart/form-data" or not options.get(b"boundary"):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                            detail="Ожидается форма multipart/form-data.")
+    charset = options.get(b"charset", b"utf-8").decode("latin-1")
+
+    # Заведомо слишком большой запрос отклоняется по заголовку, до чтения тела
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes + MAX_FIELD_SIZE:
+        raise _too_large(max_bytes)
+
+    reader = MultipartReader(options[b"boundary"])
+    fields: Dict[str, str] = {}
+    upload: Optional[StoredUpload] = None
+    file = None
+    hasher = hashlib.sha256()
+    buffer = bytearray()
+    head = b""  # Первые байты файла для проверки сигнатуры
+    size = 0
+    field_name = ""
+    field_value = bytearray()
+    in_file = False
+    try:
+        async for chunk in request.stream():
+            for event, data in reader.feed(chunk):
+                if event == PART_BEGIN:
+                    _, part_options = parse_options_header(data.get(b"content-disposition", b""))
+                    field_name = _decode(part_options.get(b"name", b""), charset)
+                    in_file = b"filename" in part_options
+                    if in_file:
+                        if field_name != file_field or upload is not None:
+                            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                                                detail=f"Ожидается один файл в поле {file_field}.")
+                        filename = os.path.basename(_decode(part_options[b"filename"], charset))
+                        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+                        file = os.fdopen(descriptor, "wb")
+                        upload = StoredUpload(filename, temp_path, "", 0)
+                elif event == PART_DATA and in_file:
+                    size += len(data)
+                    if size > max_bytes:
+                        raise _too_large(max_bytes)
+                    if len(head) < len(ZIP_MAGIC):
+                        head += data[:len(ZIP_MAGIC) - len(head)]
+                        if not ZIP_MAGIC.startswith(head):
+                            raise _unsupported()
+                    buffer += data
+                    if len(buffer) >= WRITE_BUFFER_SIZE:
+                        await run_in_threadpool(_write_chunk, file, hasher, bytes(buffer))
+                        buffer.clear()
+                elif event == PART_DATA:
+                    field_value += data
+                    if len(field_value) > MAX_FIELD_SIZE:
+                        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                                            detail=f"Поле {field_name} слишком длинное.")
+                elif in_file:
+                    if len(head) < len(ZIP_MAGIC):
+                        raise _unsupported()
+                    await run_in_threadpool(_write_chunk, file, hasher, bytes(buffer))
+                    buffer.clear()
+                    await run_in_threadpool(file.close)
+                    upload = upload._replace(digest=hasher.hexdigest(), size=size)
+                    in_file = False
+                else:
+                    fields[field_name] = _decode(bytes(field_value), charset)
+                    field_value.clear()
+        reader.finalize()
+    except BaseException:
+        if file is not None:
+            file.close()
+        discard_upload(upload)
+        raise
+
+    return fields, upload
+
+
+def store_file(source: BinaryIO, filename: str, directory: str, max_bytes: int) -> StoredUpload:
+    """
+    Копирует файл (файл формы, уже сохраненный Starlette, или файл ZIP-архива) во временный файл
+    каталога directory порциями по WRITE_BUFFER_SIZE, с подсчетом хэша (выполняется в пуле потоков).
+
+    Файл больше max_bytes (413) и файл не-DOCX (415) отклоняются HTTPException, не дочитываясь
+    до конца. Временный файл переносит на место или удаляет (discard_upload) вызывающая сторона.
+    """
+    descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    hasher = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            while data := source.read(WRITE_BUFFER_SIZE):
+                if size == 0 and not data.startswith(ZIP_MAGIC):
+                    raise _unsupported()
+                size += len(data)
+                if size > max_bytes:
+                    raise _too_large(max_bytes)
+                _write_chunk(file, hasher, data)
+        if size == 0:
+            raise _unsupported()
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return StoredUpload(os.path.basename(filename), temp_path, hasher.hexdigest(), size)
+
+
+def _too_large(max_bytes: int) -> HTTPException:
+    logger.warning(f"Загрузка отклонена: файл больше {max_bytes} байт.")
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                         detail=f"Размер файла превышает {max_bytes // (1024 * 1024)} МБ.")
@@ -0,0 +1,135 @@
+import heapq
+import logging
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import and_, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from starlette.concurrency import run_in_threadpool
+
+from src.modules.auth.models import User
+from src.modules.projects.models import Project, ProjectTeamMember
+from src.modules.review.models import Review, ReviewAssignment
+
+logger = logging.getLogger(__name__)
+
+# Максимальное число отзывов на один проект
+MAX_REVIEWS_PER_PROJECT = 5
+
+
+def compute_assignments(project_counts: Dict[int, int], reviewer_loads: Dict[int, int],
+                        excluded: Dict[int, Set[int]], capacity: int,
+                        target: int = MAX_REVIEWS_PER_PROJECT) -> List[Tuple[int, int]]:
+    """
+    Жадное распределение проектов между рецензентами.
+
+    - **project_counts**: Проект -> число его отзывов и незавершенных назначений.
+    - **reviewer_loads**: Рецензент -> число его незавершенных назначений.
+    - **excluded**: Проект -> рецензенты, которым его назначать нельзя (конфликт интересов,
+      отзыв уже оставлен или проект уже назначен); дополняется сделанными назначениями.
+    - **capacity**: Наибольшая нагрузка рецензента; **target**: нужное число отзывов на проект.
+
+    Каждое место рецензента достается проекту с наименьшим числом отзывов (куча проектов),
+    а сам рецензент — наименее загруженный из допустимых (куча рецензентов). Поэтому второй
+    рецензент назначается проекту только после того, как первый получили все остальные,
+    а нагрузка рецензентов отличается не больше чем на единицу, если не мешают исключения.
+    Сложность — O(S · log(P + R)) для S назначенных мест.
+
+    Возвращает список пар (project_id, reviewer_id).
+    """
+    projects = [(count, project_id) for project_id, count in project_counts.items() if count < target]
+    heapq.heapify(projects)
+    reviewers = [(load, reviewer_id) for reviewer_id, load in reviewer_loads.items() if load < capacity]
+    heapq.heapify(reviewers)
+
+    assignments = []
+    while projects and reviewers:
+        count, project_id = heapq.heappop(projects)
+        blocked = excluded.get(project_id, set())
+
+        # Недопустимые для проекта рецензенты откладываются и возвращаются в кучу после выбора
+        skipped = []
+        while reviewers and reviewers[0][1] in blocked:
+            skipped.append(heapq.heappop(reviewers))
+
+        if reviewers:
+            load, reviewer_id = heapq.heappop(reviewers)
+            assignments.append((project_id, reviewer_id))
+            excluded.setdefault(project_id, blocked).add(reviewer_id)
+            if load + 1 < capacity:
+                heapq.heappush(reviewers, (load + 1, reviewer_id))
+            if count + 1 < target:
+                heapq.heappush(projects, (count + 1, project_id))
+        # Если допустимых рецензентов не осталось, проект выбывает из распределения
+
+        for item in skipped:
+            heapq.heappush(reviewers, item)
+
+    return assignments
+
+
+def pending_assignments_query():
+    """Незавершенные назначения: рецензент еще не оставил отзыв на проект."""
+    return select(ReviewAssignment).outerjoin(Review, and_(
+        Review.project_id == ReviewAssignment.project_id,
+        Review.reviewer_id == ReviewAssignment.reviewer_id
+    )).where(Review.id_review.is_(None))
+
+
+async def schedule_assignments(db: AsyncSession, capacity: int) -> dict:
+    """
+    Назначает рецензентов проектам, которым не хватает отзывов, и сохраняет назначения.
+    Транзакцией управляет вызывающая сторона.
+    """
+    reviewers = (await db.execute(
+        select(User.id_user, func.lower(User.email).label("email"))
+        .where(User.role == 'reviewer', User.is_active == True)  # noqa: E712
+    )).all()
+    reviewer_ids = {reviewer.id_user for reviewer in reviewers}
+    reviewer_by_email = {reviewer.email: reviewer.id_user for reviewer in reviewers}
+
+    project_counts: Dict[int, int] = {}
+    excluded: Dict[int, Set[int]] = defaultdict(set)
+    for project_id, owner_id in (await db.execute(select(Project.id_project, Project.owner_id))).all():
+        project_counts[project_id] = 0
+        if owner_id in reviewer_ids:
+            excluded[project_id].add(owner_id)
+
+    # Конфликт интересов: рецензент указан в команде проекта
+    team = (await db.execute(
+        select(ProjectTeamMember.project_id, func.lower(ProjectTeamMember.email))
+        .where(ProjectTeamMember.email.is_not(None))
+    )).all()
+    for project_id, email in team:
+        if email in reviewer_by_email:
+            excluded[project_id].add(reviewer_by_email[email])
+
+    for project_id, reviewer_id in (await db.execute(select(Review.project_id, Review.reviewer_id))).all():
+        project_counts[project_id] = project_counts.get(project_id, 0) + 1
+        excluded[project_id].add(reviewer_id)
+
+    reviewer_loads = {reviewer_id: 0 for reviewer_id in reviewer_ids}
+    pending = pending_assignments_query().with_only_columns(ReviewAssignment.project_id, ReviewAssignment.reviewer_id)
+    for project_id, reviewer_id in (await db.execute(pending)).all():
+        project_counts[project_id] = project_counts.get(project_id, 0) + 1
+        excluded[project_id].add(reviewer_id)
+        if reviewer_id in reviewer_loads:
+            reviewer_loads[reviewer_id] += 1
+
+    assignments = await run_in_threadpool(
+        compute_assignments, project_counts, reviewer_loads, excluded, capacity
+    )
+    if assignments:
+        await db.execute(insert(ReviewAssignment), [
+            {"project_id": project_id, "reviewer_id": reviewer_id} for project_id, reviewer_id in assignments
+        ])
+
+    needed = sum(max(MAX_REVIEWS_PER_PROJECT - count, 0) for count in project_counts.values())
+    logger.info(f"Назначено проверок: {len(assignments)} из {needed} недостающих, рецензентов: {len(reviewer_ids)}.")
+    return {
+        "assigned": len(assignments),
+        "unassigned_slots": needed - len(assignments),
+        "projects": len({project_id for project_id, _ in assignments}),
+        "reviewers": len(reviewer_ids),
+    }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Float, Text, DateTime, func, SmallInteger
+from sqlalchemy import Column, Integer, ForeignKey, Float, Text, DateTime, func, SmallInteger, Index
 from sqlalchemy.orm import relationship
 
 
@@ -31,3 +31,27 @@ class Review(Base):
 
     project = relationship("Project", back_populates="reviews")
     reviewer = relationship("User", back_populates="reviews")
+
+    # Индексы постраничного списка отзывов (порядок (created_at, id_review), фильтр по рецензенту).
+    # Уникальный индекс (project_id, reviewer_id) — один отзыв рецензента на проект; он же служит
+    # для выборки отзывов проекта
+    __table_args__ = (
+        Index('ix_reviews_created_at_id_review', 'created_at', 'id_review'),
+        Index('ix_reviews_reviewer_id_created_at', 'reviewer_id', 'created_at', 'id_review'),
+        Index('uq_reviews_project_id_reviewer_id', 'project_id', 'reviewer_id', unique=True),
+    )
+
+
+class ReviewAssignment(Base):
+    __tablename__ = 'review_assignments'
+
+    id_assignment = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey('projects.id_project'), nullable=False)
+    reviewer_id = Column(Integer, ForeignKey('users.id_user'), nullable=False)
+    # Назначение считается выполненным, когда рецензент оставил отзыв на проект
+    assigned_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index('uq_review_assignments_project_id_reviewer_id', 'project_id', 'reviewer_id', unique=True),
+        Index('ix_review_assignments_reviewer_id', 'reviewer_id', 'assigned_at'),
+    )
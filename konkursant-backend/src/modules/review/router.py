@@ -1,17 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import joinedload
-from sqlalchemy import func
+from sqlalchemy import func, insert, update, literal
+from sqlalchemy.exc import IntegrityError
 
 
 from src.modules.auth.auth import get_current_user
 from src.modules.auth.models import User
 from src.modules.projects.models import Project
-from src.modules.review.models import Review
+from src.modules.review.models import Review, ReviewAssignment
+from src.modules.review.assignment import MAX_REVIEWS_PER_PROJECT, pending_assignments_query, schedule_assignments
+from src.modules.review import schemas
 from src.modules.review.schemas import ReviewBase
+from src.modules.statistics.rollups import REVIEW_CRITERIA, add_review_scores, move_project_status
 
 from src.database import async_session
+from src.pagination import after_cursor, cursor_key, encode_cursor
+from src.config import settings
+from src.write_queue import write_queue
 
 # Создание экземпляра маршрутизатора для обработки отзывов
 review_router = APIRouter()
@@ -61,8 +71,7 @@ async def get_project_by_id(project_id: int, db: AsyncSession) -> Project:
 async def create_review_for_project(
         project_id: int,
         review: ReviewBase,
-        current_user: User = Depends(get_current_user),
-        db: AsyncSession = Depends(get_db)
+        current_user: User = Depends(get_current_user)
 ):
     # Устанавливаем reviewer_id из current_user
     review.reviewer_id = current_user.id_user
@@ -72,31 +81,7 @@ async def create_review_for_project(
     if current_user.role != 'reviewer':
         raise HTTPException(status_code=403, detail="У Вас нет прав для оценки проекта")
 
-    # Получаем проект
-    project = await get_project_by_id(project_id, db)
-    if not project:
-        raise HTTPException(status_code=404, detail="Проект не найден")
-
-    # Получаем количество существующих отзывов для проекта
-    existing_reviews_count = await db.execute(
-        select(func.count()).where(Review.project_id == project_id)
-    )
-    existing_reviews_count = existing_reviews_count.scalar()
-
-    # Проверяем, не превышает ли количество отзывов лимит
-    if existing_reviews_count >= 5:
-        raise HTTPException(status_code=400, detail="Не удается оставить отзыв: Возможно, вы оставили его ранее, или проект уже собрал 5 отзывов.")
-
-    # Проверяем, оставлял ли рецензент уже отзыв для этого проекта
-    existing_review = await db.execute(
-        select(Review).where(Review.reviewer_id == current_user.id_user, Review.project_id == project_id)
-    )
-    existing_review = existing_review.scalars().first()
-
-    if existing_review:
-        raise HTTPException(status_code=400, detail="Не удается оставить отзыв: Возможно, вы оставили его ранее, или проект уже собрал  5 отзывов.")
-
-    # Подготовка и создание нового отзыва
+    # Подготовка данных нового отзыва
     new_review_data = review.dict()
     new_review_data.pop('status', None)  # Удаляем статус, если он есть
     new_review_data.update({
@@ -104,21 +89,99 @@ async def create_review_for_project(
         "project_id": project_id
     })
 
-    # Создаем новый объект отзыва
-    new_review = Review(**new_review_data)
-    project.reviews.append(new_review)
-    project.status = 'Оценено'
+    async def store_review(db: AsyncSession):
+        # Строка проекта блокируется до конца транзакции (SELECT ... FOR UPDATE; в SQLite запись и так
+        # выполняется одним писателем), поэтому параллельные отзывы на проект проверяют лимит по очереди
+        previous_status = (await db.execute(
+            select(Project.status).where(Project.id_project == project_id).with_for_update()
+        )).scalar_one_or_none()
+        if previous_status is None:
+            raise HTTPException(status_code=404, detail="Проект не найден")
 
+        # Отзыв вставляется одним условным INSERT ... SELECT: лимит в 5 отзывов проверяется тем же запросом,
+        # а повторный отзыв рецензента отклоняет уникальный индекс (project_id, reviewer_id)
+        reviews_count = select(func.count()).where(Review.project_id == project_id).scalar_subquery()
+        names = list(new_review_data)
+        values = select(*(literal(new_review_data[name], Review.__table__.c[name].type) for name in names))
+        try:
+            inserted = (await db.execute(
+                insert(Review)
+                .from_select(names, values.where(reviews_count < MAX_REVIEWS_PER_PROJECT))
+                .returning(Review.id_review)
+            )).scalar_one_or_none()
+        except IntegrityError:
+            inserted = None
+        if inserted is None:
+            raise HTTPException(status_code=400, detail="Не удается оставить отзыв: Возможно, вы оставили его ранее, или проект уже собрал 5 отзывов.")
+
+        await db.execute(update(Project).where(Project.id_project == project_id).values(status='Оценено'))
+        # Сводная статистика обновляется в той же транзакции, что и отзыв
+        await add_review_scores(db, [new_review_data])
+        await move_project_status(db, previous_status, 'Оценено')
+
+    # Отзывы записываются через очередь записи: параллельные отзывы фиксируются одной транзакцией,
+    # а при ошибке откатывается только запись этого отзыва
     try:
-        db.add(new_review)
-        await db.commit()
-        await db.refresh(new_review)
+        await write_queue.run(store_review)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка при создании отзыва: {str(e)}")
 
-    return transform_review_to_base(new_review, project.status)
+    return ReviewBase(**new_review_data, status='Оценено')
+
+
+
+
+# Эндпоинт для распределения проектов между рецензентами
+@review_router.post("/assignments/", response_model=schemas.AssignmentSummary, tags=["Проверка"])
+async def assign_reviewers(
+        capacity: Optional[int] = Query(None, ge=1),
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Назначает рецензентов проектам, которым не хватает отзывов (до 5 на проект).
+    Проекты с меньшим числом отзывов получают рецензентов первыми, нагрузка распределяется поровну.
+    Рецензенту не назначается его собственный проект и проект, в команде которого указан его e-mail.
+
+    - **capacity**: Наибольшее число незавершенных назначений на рецензента (по умолчанию из настроек).
+    """
+    if current_user.role != 'admin':
+        raise HTTPException(status_code=403, detail="Распределять проекты может только администратор")
+
+    try:
+        summary = await schedule_assignments(db, capacity or settings.reviewer_assignment_capacity)
+        await db.commit()
+    except IntegrityError:
+        # Параллельное распределение уже назначило часть тех же пар
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Распределение уже выполняется, повторите запрос позже")
+
+    return schemas.AssignmentSummary(**summary)
 
 
+# Эндпоинт для получения очереди проектов рецензента
+@review_router.get("/my-queue", response_model=list[schemas.QueueItem], tags=["Проверка"])
+async def get_my_queue(
+        limit: int = Query(50, ge=1, le=500),
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """Назначенные текущему рецензенту проекты, по которым он еще не оставил отзыв, в порядке назначения."""
+    if current_user.role != 'reviewer':
+        raise HTTPException(status_code=403, detail="Очередь проверки доступна только рецензентам")
+
+    query = (
+        pending_assignments_query()
+        .with_only_columns(Project.id_project, Project.title, Project.status, ReviewAssignment.assigned_at)
+        .join(Project, Project.id_project == ReviewAssignment.project_id)
+        .where(ReviewAssignment.reviewer_id == current_user.id_user)
+        .order_by(ReviewAssignment.assigned_at, ReviewAssignment.id_assignment)
+        .limit(limit)
+    )
+    rows = (await db.execute(query)).all()
+    return [schemas.QueueItem(**row._mapping) for row in rows]
 
 
 # Эндпоинт для получения отзывов по проекту
@@ -137,6 +200,14 @@ async def get_project_reviews(
     # Формируем список отзывов
     return [transform_review_to_base(review, project.status) for review in project.reviews]
 
+# Столбцы отзыва для списков: только поля ReviewBase и статус проекта, без загрузки объектов Project
+REVIEW_LIST_COLUMNS = (
+    Review.reviewer_id, Review.project_id, Review.project_title, Review.author_name,
+    *(getattr(Review, criterion) for criterion in REVIEW_CRITERIA),
+    Review.feedback, Project.status.label("status"),
+)
+
+
 # Эндпоинт для получения всех проверенных проектов
 @review_router.get("/verified_projects/", response_model=list[ReviewBase], tags=["Проверка"])
 async def get_verified_projects(
@@ -146,16 +217,89 @@ async def get_verified_projects(
     if current_user.role not in ['reviewer', 'admin']:
         raise HTTPException(status_code=403, detail="У вас нет доступа к этой информации")
 
-    # Получение всех проектов с отзывами
-    query = select(Project).options(joinedload(Project.reviews))
-    result = await db.execute(query)
-    projects = result.unique().scalars().all()
+    # Отзывы со статусом проекта одним запросом (для больших объемов — постраничный /list/)
+    query = select(*REVIEW_LIST_COLUMNS).join(Project, Project.id_project == Review.project_id)
+    rows = (await db.execute(query.order_by(Review.project_id, Review.id_review))).all()
+
+    return [ReviewBase(**row._mapping) for row in rows]
+
+
+# Постраничный список отзывов
+@review_router.get("/list/", response_model=schemas.ReviewPage, tags=["Проверка"])
+async def get_review_page(
+        cursor: Optional[str] = None,
+        limit: int = Query(50, ge=1, le=500),
+        reviewer_id: Optional[int] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        with_averages: bool = False,
+        current_user: User = Depends(get_current_user),
+        db: AsyncSession = Depends(get_db)
+):
+    """
+    Возвращает страницу отзывов со статусами проектов, от новых к старым.
+    Пагинация по ключу (created_at, id_review), поэтому время ответа не зависит от номера страницы.
+
+    - **cursor**: Курсор из next_cursor предыдущей страницы.
+    - **limit**: Размер страницы.
+    - **reviewer_id**: Фильтр по рецензенту.
+    - **created_from**, **created_to**: Диапазон даты создания отзыва (включительно).
+    - **with_averages**: Добавить средние оценки проектов страницы (считаются в базе данных по всем их отзывам).
+    """
+    if current_user.role not in ['reviewer', 'admin']:
+        raise HTTPException(status_code=403, detail="У вас нет доступа к этой информации")
+
+    query = select(Review.id_review, Review.created_at, cursor_key(Review.created_at), *REVIEW_LIST_COLUMNS).join(
+        Project, Project.id_project == Review.project_id
+    )
+    if reviewer_id is not None:
+        query = query.where(Review.reviewer_id == reviewer_id)
+    if created_from is not None:
+        query = query.where(Review.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Review.created_at <= created_to)
+
+    if cursor is not None:
+        query = query.where(after_cursor(Review.created_at, Review.id_review, cursor))
+
+    rows = (await db.execute(
+        query.order_by(Review.created_at.desc(), Review.id_review.desc()).limit(limit + 1)
+    )).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(rows[limit - 1].cursor_created_at, rows[limit - 1].id_review)
+    items = [schemas.ReviewListItem(**row._mapping) for row in rows[:limit]]
+
+    project_scores = None
+    if with_averages:
+        project_scores = await get_project_scores(db, {item.project_id for item in items})
+
+    return schemas.ReviewPage(items=items, next_cursor=next_cursor, project_scores=project_scores)
+
+
+async def get_project_scores(db: AsyncSession, project_ids) -> dict:
+    """Средние оценки проектов по всем их отзывам — одним GROUP BY в базе данных."""
+    if not project_ids:
+        return {}
 
-    # Формирование списка проверенных отзывов
-    verified_reviews = [
-        transform_review_to_base(review, project.status)
-        for project in projects
-        for review in project.reviews
-    ]
+    criteria = [getattr(Review, criterion) for criterion in REVIEW_CRITERIA]
+    rows = (await db.execute(
+        select(
+            Review.project_id,
+            func.count().label("review_count"),
+            func.avg(sum(criteria[1:], criteria[0])).label("mean_total"),
+            *(func.avg(column).label(column.key) for column in criteria)
+        )
+        .where(Review.project_id.in_(project_ids))
+        .group_by(Review.project_id)
+    )).all()
 
-    return verified_reviews
+    return {
+        row.project_id: schemas.ProjectScores(
+            review_count=row.review_count,
+            mean_total=round(row.mean_total, 2),
+            criteria={criterion: round(row._mapping[criterion], 2) for criterion in REVIEW_CRITERIA}
+        )
+        for row in rows
+    }
@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Dict, List
+from datetime import datetime
 
 class ReviewBase(BaseModel):
     reviewer_id: int
@@ -20,4 +21,36 @@ class ReviewBase(BaseModel):
     status: str
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class ReviewListItem(ReviewBase):
+    id_review: int
+    created_at: datetime
+
+
+class ProjectScores(BaseModel):
+    review_count: int
+    mean_total: float  # Средняя сумма баллов по всем критериям
+    criteria: Dict[str, float]  # Средний балл по каждому критерию
+
+
+class ReviewPage(BaseModel):
+    items: List[ReviewListItem]
+    next_cursor: Optional[str] = None  # Курсор следующей страницы (None — страница последняя)
+    # Средние оценки проектов страницы (по всем их отзывам), если запрошены параметром with_averages
+    project_scores: Optional[Dict[int, ProjectScores]] = None
+
+
+class AssignmentSummary(BaseModel):
+    assigned: int  # Создано назначений
+    unassigned_slots: int  # Недостающие отзывы, для которых не нашлось допустимого рецензента
+    projects: int  # Проектов получили новые назначения
+    reviewers: int  # Активных рецензентов
+
+
+class QueueItem(BaseModel):
+    id_project: int
+    title: str
+    status: str
+    assigned_at: datetime
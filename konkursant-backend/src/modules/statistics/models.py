@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, Integer, Numeric
+
+from src.database import Base
+
+
+# Сводные таблицы статистики конкурса. Обновляются приращениями при создании и удалении
+# проектов, создании отзывов и разборе заявок (см. rollups.py), поэтому чтение сводки
+# не зависит от числа проектов и отзывов.
+
+class ProjectStatusCount(Base):
+    __tablename__ = 'stats_project_status'
+
+    status = Column(String, primary_key=True)
+    project_count = Column(Integer, default=0, nullable=False)
+
+
+class ReviewCriterionTotal(Base):
+    __tablename__ = 'stats_review_criteria'
+
+    criterion = Column(String, primary_key=True)  # Имя столбца оценки в Review
+    score_sum = Column(Integer, default=0, nullable=False)
+    review_count = Column(Integer, default=0, nullable=False)
+
+
+class RegionBudget(Base):
+    __tablename__ = 'stats_region_budget'
+
+    region = Column(String, primary_key=True)  # Пустая строка — регион не указан
+    project_count = Column(Integer, default=0, nullable=False)
+    total_budget = Column(Numeric(16, 2, asdecimal=False), default=0, nullable=False)
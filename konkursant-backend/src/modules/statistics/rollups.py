@@ -0,0 +1,87 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.modules.statistics.models import ProjectStatusCount, ReviewCriterionTotal, RegionBudget
+
+# Столбцы оценок Review, по которым считаются средние
+REVIEW_CRITERIA = (
+    "team_experience",
+    "project_relevance",
+    "solution_uniqueness",
+    "implementation_scale",
+    "development_potential",
+    "project_transparency",
+    "feasibility_and_effectiveness",
+    "additional_resources",
+    "planned_expenses",
+    "budget_realism",
+)
+
+# Вклад проекта в сводку по регионам: (регион, запрашиваемая сумма)
+RegionContribution = Tuple[Optional[str], float]
+
+
+async def _increment(db: AsyncSession, model, key: Sequence[str], rows: List[Dict[str, Any]]):
+    """
+    Атомарно прибавляет приращения к счетчикам строк сводной таблицы (INSERT ... ON CONFLICT DO UPDATE),
+    все строки — одним пакетом. Параллельные транзакции не теряют приращения друг друга.
+    Ключи строк в пакете должны различаться.
+    """
+    if not rows:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(model)
+    statement = statement.on_conflict_do_update(
+        index_elements=list(key),
+        set_={name: getattr(model, name) + getattr(statement.excluded, name) for name in rows[0] if name not in key}
+    )
+    await db.execute(statement, rows)
+
+
+async def add_project_status(db: AsyncSession, status: str, delta: int = 1):
+    await _increment(db, ProjectStatusCount, ["status"], [{"status": status, "project_count": delta}])
+
+
+async def move_project_status(db: AsyncSession, old_status: str, new_status: str):
+    if old_status != new_status:
+        await _increment(db, ProjectStatusCount, ["status"], [
+            {"status": old_status, "project_count": -1},
+            {"status": new_status, "project_count": 1},
+        ])
+
+
+async def add_review_scores(db: AsyncSession, reviews: Iterable[Any], sign: int = 1):
+    """Добавляет (sign=1) или вычитает (sign=-1) оценки отзывов. Отзыв — объект Review или словарь полей."""
+    totals = defaultdict(int)
+    count = 0
+    for review in reviews:
+        values = review if isinstance(review, dict) else {name: getattr(review, name) for name in REVIEW_CRITERIA}
+        for name in REVIEW_CRITERIA:
+            totals[name] += values[name]
+        count += 1
+
+    if count:
+        await _increment(db, ReviewCriterionTotal, ["criterion"], [
+            {"criterion": name, "score_sum": sign * totals[name], "review_count": sign * count}
+            for name in REVIEW_CRITERIA
+        ])
+
+
+async def apply_region_budgets(db: AsyncSession, removed: Iterable[RegionContribution],
+                               added: Iterable[RegionContribution]):
+    """Переносит вклад проектов в сводке по регионам: старые значения вычитаются, новые прибавляются."""
+    deltas = defaultdict(lambda: [0, 0.0])
+    for sign, contributions in ((-1, removed), (1, added)):
+        for region, budget in contributions:
+            delta = deltas[region or ""]
+            delta[0] += sign
+            delta[1] += sign * budget
+
+    await _increment(db, RegionBudget, ["region"], [
+        {"region": region, "project_count": project_count, "total_budget": round(total_budget, 2)}
+        for region, (project_count, total_budget) in deltas.items()
+        if project_count or total_budget
+    ])
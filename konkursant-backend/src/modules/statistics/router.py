@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from src.database import async_session
+from src.modules.auth.auth import get_current_user
+from src.modules.auth.models import User
+from src.modules.statistics import schemas
+from src.modules.statistics.models import ProjectStatusCount, ReviewCriterionTotal, RegionBudget
+from src.modules.statistics.rollups import REVIEW_CRITERIA
+
+statistics_router = APIRouter()
+
+
+# Асинхронная функция для получения соединения с базой данных
+async def get_db():
+    async with async_session() as session:
+        yield session
+
+
+# Сводная статистика конкурса
+@statistics_router.get("/", response_model=schemas.ContestStatistics, tags=["Статистика"])
+async def get_contest_statistics(current_user: User = Depends(get_current_user),
+                                 db: AsyncSession = Depends(get_db)):
+    """
+    Сводка для панели конкурса: проекты по статусам, средние оценки по критериям
+    и запрашиваемые суммы по регионам.
+
+    Данные читаются из сводных таблиц, которые обновляются при изменении проектов и отзывов,
+    поэтому время ответа не зависит от числа проектов и отзывов.
+    """
+    if current_user.role not in ['reviewer', 'admin']:
+        raise HTTPException(status_code=403, detail="У вас нет доступа к этой информации")
+
+    statuses = (await db.execute(
+        select(ProjectStatusCount.status, ProjectStatusCount.project_count)
+        .where(ProjectStatusCount.project_count > 0)
+        .order_by(ProjectStatusCount.status)
+    )).all()
+    criteria = {
+        row.criterion: row for row in (await db.execute(select(ReviewCriterionTotal))).scalars()
+    }
+    regions = (await db.execute(
+        select(RegionBudget)
+        .where(RegionBudget.project_count > 0)
+        .order_by(RegionBudget.total_budget.desc(), RegionBudget.region)
+    )).scalars().all()
+
+    criteria_stats = []
+    for name in REVIEW_CRITERIA:
+        total = criteria.get(name)
+        review_count = total.review_count if total is not None else 0
+        criteria_stats.append(schemas.CriterionStats(
+            criterion=name,
+            mean_score=round(total.score_sum / review_count, 2) if review_count else None,
+            review_count=review_count
+        ))
+
+    return schemas.ContestStatistics(
+        total_projects=sum(row.project_count for row in statuses),
+        projects_by_status={row.status: row.project_count for row in statuses},
+        review_count=criteria_stats[0].review_count,
+        criteria=criteria_stats,
+        total_budget=round(sum(region.total_budget for region in regions), 2),
+        budget_by_region=[
+            schemas.RegionStats(region=region.region or None, project_count=region.project_count,
+                                total_budget=region.total_budget)
+            for region in regions
+        ]
+    )
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+
+class CriterionStats(BaseModel):
+    criterion: str
+    mean_score: Optional[float] = None  # None — отзывов еще нет
+    review_count: int
+
+
+class RegionStats(BaseModel):
+    region: Optional[str] = None  # None — регион в заявке не указан
+    project_count: int
+    total_budget: float
+
+
+class ContestStatistics(BaseModel):
+    total_projects: int
+    projects_by_status: Dict[str, int]
+    review_count: int
+    criteria: List[CriterionStats]
+    total_budget: float
+    budget_by_region: List[RegionStats]
@@ -0,0 +1,69 @@
+import base64
+import binascii
+from datetime import datetime
+from typing import Tuple
+
+import orjson
+from fastapi import HTTPException
+from sqlalchemy import DateTime, String, literal, tuple_, type_coerce
+from sqlalchemy.sql.elements import ColumnElement, Label
+from sqlalchemy.types import TypeDecorator
+
+
+class CursorTimestamp(TypeDecorator):
+    """
+    Значение created_at в курсоре — строкой, в том виде, в каком его сравнивает база.
+
+    SQLite хранит даты текстом и сравнивает их как строки, причем значения по умолчанию
+    (CURRENT_TIMESTAMP) записаны без долей секунды, а значения из приложения — с микросекундами.
+    Поэтому для SQLite в курсор попадает сохраненный текст как есть, а для других СУБД — ISO 8601.
+    """
+    impl = String
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(String())
+        return dialect.type_descriptor(DateTime(timezone=True))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or dialect.name == "sqlite":
+            return value
+        return datetime.fromisoformat(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None or dialect.name == "sqlite":
+            return value
+        return value.isoformat()
+
+
+def cursor_key(created_at: ColumnElement) -> Label:
+    """Столбец запроса страницы, из которого берется created_at для курсора следующей страницы."""
+    return type_coerce(created_at, CursorTimestamp()).label("cursor_created_at")
+
+
+def encode_cursor(created_at: str, row_id: int) -> str:
+    """Непрозрачный курсор: ключ (created_at, id) последней записи страницы."""
+    return base64.urlsafe_b64encode(orjson.dumps([created_at, row_id])).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        created_at, row_id = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(row_id, int):
+            raise ValueError
+        datetime.fromisoformat(created_at)
+    except (binascii.Error, orjson.JSONDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="Некорректный курсор.")
+    return created_at, row_id
+
+
+def after_cursor(created_at: ColumnElement, row_id: ColumnElement, cursor: str) -> ColumnElement:
+    """
+    Условие «после курсора» для порядка (created_at DESC, id DESC).
+
+    Ключ берется из самого курсора, а не из записи с его ID: удаление этой записи
+    не обрывает пагинацию.
+    """
+    cursor_created_at, cursor_id = decode_cursor(cursor)
+    return tuple_(created_at, row_id) < tuple_(literal(cursor_created_at, CursorTimestamp()), cursor_id)
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.database import async_engine, async_session
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Операция записи: получает сессию и выполняет запросы, не фиксируя транзакцию сама
+WriteOperation = Callable[[AsyncSession], Awaitable[T]]
+
+
+class WriteQueue:
+    """
+    Единственный писатель SQLite с групповой фиксацией.
+
+    SQLite допускает одну пишущую транзакцию, и параллельные короткие записи (отзывы, статусы
+    проектов, данные разобранных заявок) конкурируют за блокировку базы. Здесь операции записи
+    ставятся в очередь, а одна задача выполняет накопившиеся операции одной транзакцией
+    (BEGIN IMMEDIATE ... COMMIT): блокировка берется один раз на пакет, а фиксация на диск —
+    одна на все операции пакета. Каждая операция выполняется в своей точке сохранения (SAVEPOINT),
+    поэтому ошибка одной операции откатывает только ее и передается вызывающей стороне.
+
+    Если очередь не запущена (другая СУБД, скрипты, тесты без запуска приложения),
+    операция выполняется сразу в отдельной сессии.
+    """
+
+    def __init__(self, max_batch_size: int, batch_window_seconds: float):
+        self.max_batch_size = max_batch_size
+        self.batch_window_seconds = batch_window_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.operations = 0
+
+    @property
+    def started(self) -> bool:
+        return self._writer is not None
+
+    def start(self):
+        """Запускает задачу писателя (только для SQLite; вызывается внутри работающего цикла событий)."""
+        if self.started or async_engine.dialect.name != "sqlite" or not settings.sqlite_write_queue:
+            return
+        self._queue = asyncio.Queue()
+        self._writer = asyncio.create_task(self._run())
+        logger.info(f"Очередь записи запущена: пакет до {self.max_batch_size} операций.")
+
+    async def stop(self):
+        """Выполняет уже поставленные операции и останавливает писателя."""
+        if not self.started:
+            return
+        await self._queue.put(None)
+        await self._writer
+        self._queue, self._writer = None, None
+
+    async def run(self, operation: WriteOperation) -> T:
+        """Выполняет операцию записи и возвращает ее результат после фиксации транзакции."""
+        if not self.started:
+            async with async_session() as db:
+                try:
+                    result = await operation(db)
+                    await db.commit()
+                except BaseException:
+                    await db.rollback()
+                    raise
+                return result
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, future))
+        return await future
+
+    def stats(self) -> str:
+        average = self.operations / self.batches if self.batches else 0
+        return f"пакетов {self.batches}, операций {self.operations}, в среднем {average:.1f} на пакет"
+
+    async def _next_batch(self) -> Tuple[List[tuple], bool]:
+        """Ждет первую операцию и добирает к ней уже ожидающие (и пришедшие за batch_window_seconds)."""
+        loop = asyncio.get_running_loop()
+        first = await self._queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        deadline = loop.time() + self.batch_window_seconds
+        while len(batch) < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _run(self):
+        while True:
+            batch, stopping = await self._next_batch()
+            if batch:
+                try:
+                    await self._commit(batch)
+                except Exception as e:
+                    logger.error(f"Ошибка групповой записи: {e}")
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+            if stopping:
+                return
+
+    async def _commit(self, batch: List[tuple]):
+        outcomes = []
+        async with async_session() as db:
+            try:
+                # Блокировка на запись берется сразу: операции пакета читают и пишут под ней
+                await db.execute(text("BEGIN IMMEDIATE"))
+                for operation, future in batch:
+                    try:
+                        async with db.begin_nested():
+                            outcomes.append((future, await operation(db), None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+                await db.commit()
+            except BaseException:
+                await db.rollback()
+                raise
+
+        self.batches += 1
+        self.operations += len(batch)
+        for future, result, error in outcomes:
+            if future.done():
+                continue  # Вызывающая сторона уже отменила ожидание
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
+write_queue = WriteQueue(
+    max_batch_size=settings.write_batch_max_size,
+    batch_window_seconds=settings.write_batch_window_ms / 1000
+)